@@ -2,30 +2,48 @@ import numpy as np
 import pandas as pd
 import os
 import streamlit as st
+import RankHistory
 
 def prediction_counts_analysis(predictions):
+    if not isinstance(predictions, dict):
+        counts_df = pd.DataFrame(predictions.team_counts(), index=predictions.participants, columns=predictions.teams)
+        return counts_df.loc[:, counts_df.sum() > 0].sort_index(axis=1)
     counts_df = pd.DataFrame(predictions)
     counts_df = counts_df.apply(pd.Series.value_counts).T.fillna(0).astype(int)
     return counts_df
 
+def predictor_counts(matchwise_predictions_df):
+    """Home and away predictor counts per match, from the count columns or, failing that, the name lists."""
+    if "Home Count" in matchwise_predictions_df.columns:
+        return matchwise_predictions_df["Home Count"], matchwise_predictions_df["Away Count"]
+    def count_names(names):
+        return names.str.count(",") + (names.str.len() > 0)
+    return count_names(matchwise_predictions_df["Home Predictors"]), count_names(matchwise_predictions_df["Away Predictors"])
+
 def get_prediction_ratios(matchwise_predictions_df):
-    prediction_difference_map = {11:'11:0',9: '1:10', 7: '2:9', 5: '3:8', 3: '4:7', 1: '5:6'}
-    home_away_ratio_map = {-9:'1:10', -7:'2:9', -5:'3:8', (-3):'4:7', (-1):'5:6',1:'6:5', 3:'7:4', 5:'8:3', 7:'9:2', 9:'10:1'}
-    matchwise_predictions_df["Absolute Prediction Difference"] = abs(matchwise_predictions_df['Home Predictors'].str.split(',').apply(len) - matchwise_predictions_df['Away Predictors'].str.split(',').apply(len))
-    matchwise_predictions_df["Prediction Difference"] = (matchwise_predictions_df['Home Predictors'].str.split(',').apply(len) - matchwise_predictions_df['Away Predictors'].str.split(',').apply(len))
-    matchwise_predictions_df["Prediction Ratio"] = matchwise_predictions_df["Absolute Prediction Difference"].map(prediction_difference_map)
-    matchwise_predictions_df["Home-Away Ratio"] = matchwise_predictions_df["Prediction Difference"].map(home_away_ratio_map)
+    home_counts, away_counts = predictor_counts(matchwise_predictions_df)
+    minority = np.minimum(home_counts, away_counts)
+    majority = np.maximum(home_counts, away_counts)
+    matchwise_predictions_df["Absolute Prediction Difference"] = abs(home_counts - away_counts)
+    matchwise_predictions_df["Prediction Difference"] = home_counts - away_counts
+    # Ratio labels are minority:majority (or n:0 when unanimous) and home:away, for any number of participants
+    matchwise_predictions_df["Prediction Ratio"] = np.where(minority > 0, minority.astype(str) + ":" + majority.astype(str), majority.astype(str) + ":0")
+    matchwise_predictions_df["Home-Away Ratio"] = home_counts.astype(str) + ":" + away_counts.astype(str)
     # major_gen_predictions = matchwise_predictions_df.apply(lambda row: row["Home Team"] if row["Prediction Difference"] > 0 else row["Away Team"], axis=1)
     prediction_ratio_counts = matchwise_predictions_df["Prediction Ratio"].value_counts().reset_index()
     prediction_ratio_counts.columns = ["Prediction Ratio", "Count"]
     prediction_ratio_counts = prediction_ratio_counts.sort_values(by="Count", ascending=False)
     home_away_ratio_counts = matchwise_predictions_df["Home-Away Ratio"].value_counts().reset_index()
     home_away_ratio_counts.columns = ["Home-Away Ratio", "Count"]
-    home_away_ratio_counts.sort_values(by="Home-Away Ratio", ascending=True, inplace=True)
+    home_away_ratio_counts["Home"] = home_away_ratio_counts["Home-Away Ratio"].str.split(":").str[0].astype(int)
+    home_away_ratio_counts = home_away_ratio_counts.sort_values(by="Home", ascending=True).drop(columns="Home").reset_index(drop=True)
     return prediction_ratio_counts, home_away_ratio_counts
 
 
 def home_away_percentage(schedule_df, predictions_df):
+    if not isinstance(predictions_df, pd.DataFrame):
+        home_percentage = (predictions_df.sides()[:, :len(schedule_df)] == 0).sum(axis=1) / len(schedule_df) * 100
+        return pd.DataFrame({"Away": 100 - home_percentage, "Home": home_percentage}, index=predictions_df.participants)
     matchwise_predictions_df = pd.concat([schedule_df, predictions_df], axis=1)
     for participant in predictions_df.columns:
         matchwise_predictions_df[participant] = np.where( matchwise_predictions_df[participant] == matchwise_predictions_df[" Home Team"], "Home", "Away")
@@ -35,15 +53,4 @@ def home_away_percentage(schedule_df, predictions_df):
 
 def get_points_progression_df(points_progression) :
     """Plot for bar chart race showing points progression."""
-    data = []
-    for participant, scores in points_progression.items():
-        for match, points in enumerate(scores):
-            data.append({"Participant": participant, "Match": match, "Points": points})
-    points_progression_df = pd.DataFrame(data)
-    points_progression_df["Rank"] = points_progression_df.groupby("Match")["Points"].rank(method="first", ascending=False)
-    points_progression_df.sort_values(by=["Match", "Rank"], inplace=True)
-    return points_progression_df
-
-def get_time_spent_position(points_progression_df):
-    time_spent_position_df = points_progression_df.groupby(by=['Participant','Rank']).size().reset_index(name="Count")
-    return time_spent_position_df
\ No newline at end of file
+    return RankHistory.long_form(RankHistory.build_rank_history(points_progression))
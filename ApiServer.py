@@ -0,0 +1,267 @@
+"""JSON API over the scored leagues, for bots and widgets that poll the standings.
+
+    python ApiServer.py --port 8502
+    curl "http://127.0.0.1:8502/leaderboard?league=ipl-prediction-gamble&page=1&per_page=20"
+
+Routes: /leagues, /leaderboard, /progression, /matchwise, /team-predictions. All but /leagues take
+`league` (default: the first one), `page` and `per_page`; /progression also takes `participant`.
+"""
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+import Analysis
+import DataCache
+import LeagueRegistry
+import LiveUpdates
+import RankHistory
+
+DEFAULT_PER_PAGE = 100
+MAX_PER_PAGE = 1000
+GZIP_MIN_BYTES = 1024
+MAX_RESPONSES = 1024
+KEEP_ALIVE_TIMEOUT = 30.0
+MAX_HEADER_LINES = 100
+STATUS_TEXT = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+               405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def league_paths(league):
+    """The inputs a league's responses are computed from; their fingerprints are its data version."""
+    return [os.path.join(league.results_path, "Results.csv"), league.predictions_path, league.schedule_path]
+
+def leaderboard_items(cache, league):
+    leaderboard_df, _ = DataCache.calculate_scores(cache, league.results_path, league.predictions_path)
+    leaderboard_df = leaderboard_df.copy()
+    leaderboard_df.insert(0, "Rank", leaderboard_df["Points"].rank(method="dense", ascending=False).astype(int))
+    return json.loads(leaderboard_df.sort_values(by="Rank", kind="stable").to_json(orient="records", force_ascii=False))
+
+def progression_items(cache, league):
+    _, points_progression = DataCache.calculate_scores(cache, league.results_path, league.predictions_path)
+    history = RankHistory.build_rank_history(points_progression)
+    return [{"Participant": participant, "Points": points.tolist(), "Ranks": ranks.tolist()}
+            for participant, points, ranks in zip(history.participants, history.points, history.ranks)]
+
+def matchwise_items(cache, league):
+    matchwise_df = DataCache.matchwise_predictions(cache, league.schedule_path, league.predictions_path).copy()
+    matchwise_df.insert(0, "Match", range(1, len(matchwise_df) + 1))
+    for column in ["Home Predictors", "Away Predictors"]:
+        matchwise_df[column] = [names.split(", ") if names else [] for names in matchwise_df[column]]
+    return json.loads(matchwise_df.to_json(orient="records", force_ascii=False))
+
+def team_prediction_items(cache, league):
+    store = DataCache.load_prediction_store(cache, league.predictions_path, league.schedule_path)
+    counts_df = Analysis.prediction_counts_analysis(store)
+    return [{"Participant": participant, "Counts": {team: int(count) for team, count in counts.items()}}
+            for participant, counts in counts_df.iterrows()]
+
+DATASETS = {
+    "/leaderboard": leaderboard_items,
+    "/progression": progression_items,
+    "/matchwise": matchwise_items,
+    "/team-predictions": team_prediction_items,
+}
+
+def page_arguments(query):
+    try:
+        page = int(query.get("page", ["1"])[0])
+        per_page = int(query.get("per_page", [str(DEFAULT_PER_PAGE)])[0])
+    except ValueError:
+        raise HttpError(400, "page and per_page must be integers")
+    if page < 1 or not 1 <= per_page <= MAX_PER_PAGE:
+        raise HttpError(400, f"page must be >= 1 and per_page between 1 and {MAX_PER_PAGE}")
+    return page, per_page
+
+def paginate(items, page, per_page):
+    start = (page - 1) * per_page
+    return {"page": page, "per_page": per_page, "total": len(items),
+            "pages": -(-len(items) // per_page), "items": items[start:start + per_page]}
+
+
+class Response:
+    """A rendered JSON body with its gzipped form and ETag, valid for one data version."""
+
+    def __init__(self, version, payload):
+        self.version = version
+        self.body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode()
+        self.gzipped = gzip.compress(self.body, compresslevel=6) if len(self.body) >= GZIP_MIN_BYTES else None
+        self.etag = '"' + hashlib.sha1(self.body).hexdigest()[:20] + '"'
+
+
+class ApiServer:
+    """Serves league data as JSON from one event loop.
+
+    Responses are rendered once per (route, league, query) and data version, the version being the
+    fingerprints of the league's input files. Once serving, a LeagueWatcher per league polls those every
+    `poll_interval` seconds and the cache keeps them in between, so most requests stat nothing. Computing a response runs on a single worker thread so the loop keeps answering; concurrent
+    requests for the same missing response wait on one computation instead of each starting their own.
+    Checking the version touches the disk too, so it runs on threads of its own and never queues behind
+    a computation.
+    """
+
+    def __init__(self, root_paths, poll_interval=2.0):
+        self.registry = LeagueRegistry.LeagueRegistry(root_paths)
+        self.cache = DataCache.FingerprintCache(DataCache.cache_size(len(self.registry.leagues)))
+        self.poll_interval = poll_interval
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.fingerprint_executor = ThreadPoolExecutor(max_workers=4)
+        self.responses = OrderedDict()
+        self.pending = {}
+
+    def league(self, query):
+        if not self.registry.leagues:
+            raise HttpError(404, "no leagues found")
+        name = query.get("league", [self.registry.names()[0]])[0]
+        if name not in self.registry.leagues:
+            raise HttpError(404, f"unknown league: {name}")
+        return self.registry.get(name)
+
+    def data_version(self, league):
+        return tuple(self.cache.fingerprint(path) for path in league_paths(league))
+
+    def render(self, route, league, query, version):
+        page, per_page = page_arguments(query)
+        items = self.cache.get("api" + route, league_paths(league), lambda: DATASETS[route](self.cache, league))
+        if "participant" in query:
+            wanted = set(query["participant"])
+            items = [item for item in items if item["Participant"] in wanted]
+        return Response(version, dict(league=league.name, **paginate(items, page, per_page)))
+
+    async def response(self, route, query):
+        if route == "/leagues":
+            return Response(None, {"leagues": self.registry.names()})
+        if route not in DATASETS:
+            raise HttpError(404, f"unknown route: {route}")
+        league = self.league(query)
+        page_arguments(query)
+        key = (route, league.name, tuple(sorted((name, tuple(values)) for name, values in query.items())))
+        loop = asyncio.get_running_loop()
+        version = await loop.run_in_executor(self.fingerprint_executor, self.data_version, league)
+        cached = self.responses.get(key)
+        if cached is not None and cached.version == version:
+            self.responses.move_to_end(key)
+            return cached
+        future = self.pending.get((key, version))
+        if future is None:
+            future = loop.run_in_executor(self.executor, self.render, route, league, query, version)
+            self.pending[(key, version)] = future
+            future.add_done_callback(lambda _: self.pending.pop((key, version), None))
+        rendered = await future
+        self.responses[key] = rendered
+        self.responses.move_to_end(key)
+        while len(self.responses) > MAX_RESPONSES:
+            self.responses.popitem(last=False)
+        return rendered
+
+    async def handle_request(self, method, target, headers):
+        """(status, headers, body) for one request."""
+        if method not in ("GET", "HEAD"):
+            raise HttpError(405, f"{method} is not supported")
+        url = urlsplit(target)
+        rendered = await self.response(url.path.rstrip("/") or "/", parse_qs(url.query))
+        response_headers = {"Content-Type": "application/json; charset=utf-8", "ETag": rendered.etag,
+                            "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+        if_none_match = headers.get("if-none-match", "")
+        if if_none_match == "*" or rendered.etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]:
+            return 304, response_headers, b""
+        body = rendered.body
+        if rendered.gzipped is not None and "gzip" in headers.get("accept-encoding", ""):
+            response_headers["Content-Encoding"] = "gzip"
+            body = rendered.gzipped
+        return 200, response_headers, body
+
+    async def handle_connection(self, reader, writer):
+        """Serve HTTP/1.1 requests on one connection until the client closes it or goes quiet."""
+        try:
+            while True:
+                request_line = await asyncio.wait_for(reader.readline(), KEEP_ALIVE_TIMEOUT)
+                if not request_line:
+                    break
+                headers = {}
+                for _ in range(MAX_HEADER_LINES):
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                try:
+                    method, target, http_version, content_length = parse_request(request_line, headers)
+                except HttpError as error:
+                    # Where this request ends is unknown, so it is answered and the connection closed
+                    method, target, http_version = "GET", None, "HTTP/1.0"
+                    status, response_headers, body = error_response(error.status, str(error))
+                if target is not None:
+                    if content_length:
+                        await reader.readexactly(content_length)
+                    try:
+                        status, response_headers, body = await self.handle_request(method, target, headers)
+                    except HttpError as error:
+                        status, response_headers, body = error_response(error.status, str(error))
+                    except Exception as error:
+                        status, response_headers, body = error_response(500, f"{type(error).__name__}: {error}")
+                keep_alive = (target is not None and headers.get("connection", "").lower() != "close"
+                              and (http_version == "HTTP/1.1" or headers.get("connection", "").lower() == "keep-alive"))
+                response_headers["Content-Length"] = str(len(body))
+                response_headers["Connection"] = "keep-alive" if keep_alive else "close"
+                head = f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n" + "".join(
+                    f"{name}: {value}\r\n" for name, value in response_headers.items()) + "\r\n"
+                writer.write(head.encode("latin-1") + (b"" if method == "HEAD" else body))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host, port):
+        for league in self.registry.leagues.values():
+            LiveUpdates.LeagueWatcher(self.cache, league, self.poll_interval).start()
+        server = await asyncio.start_server(self.handle_connection, host, port, backlog=4096)
+        print(f"Serving {len(self.registry.leagues)} league(s) on http://{host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+
+def parse_request(request_line, headers):
+    """(method, target, HTTP version, body length) of a request; HttpError 400 when it cannot be read."""
+    try:
+        method, target, http_version = request_line.decode("latin-1").split()
+    except ValueError:
+        raise HttpError(400, "malformed request line")
+    content_length = headers.get("content-length", "0") or "0"
+    if not (content_length.isascii() and content_length.isdigit()):
+        raise HttpError(400, "bad Content-Length")
+    return method, target, http_version, int(content_length)
+
+def error_response(status, message):
+    body = json.dumps({"error": message}).encode()
+    return status, {"Content-Type": "application/json; charset=utf-8", "Cache-Control": "no-cache"}, body
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve leaderboard, progression and prediction data as JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    # Like the dashboard: IPL_LEAGUES_ROOT lists folders (separated like PATH) holding league directories
+    default_roots = os.environ.get("IPL_LEAGUES_ROOT", os.environ.get("IPL_BASE_PATH", os.path.dirname(os.path.abspath(__file__))))
+    parser.add_argument("--leagues-root", nargs="+", default=default_roots.split(os.pathsep))
+    parser.add_argument("--poll-interval", type=float, default=2.0, help="seconds between checks of the input files")
+    args = parser.parse_args()
+    try:
+        asyncio.run(ApiServer(args.leagues_root, args.poll_interval).serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+from collections import namedtuple
+import numpy as np
+import pandas as pd
+import IncrementalScoring
+import RankHistory
+
+AsOfIndex = namedtuple("AsOfIndex", ["participants", "match_numbers", "dates", "points", "ranks", "correct", "streaks",
+                                     "longest_winning", "longest_losing", "first_day", "day_positions", "match_positions"])
+
+def compact(values):
+    """The array in the smallest integer type that holds all of its values (points read as floats included)."""
+    values = np.asarray(values)
+    if values.size == 0:
+        return values.astype(np.int8)
+    if values.dtype.kind == "f":
+        if not np.array_equal(values, np.round(values)):
+            return values.astype(np.float32)
+        values = values.astype(np.int64)
+    return values.astype(np.result_type(np.min_scalar_type(values.min()), np.min_scalar_type(values.max())))
+
+def streak_history(correct, no_result):
+    """Current streak after every match (+n for n correct in a row, -n for n wrong) and the longest of each so far.
+
+    Washed-out matches leave the streaks as they were, as they do in the scoring state.
+    """
+    num_participants, num_matches = correct.shape
+    streaks = np.zeros((num_participants, num_matches + 1), dtype=np.int64)
+    for match in range(num_matches):
+        current = streaks[:, match]
+        if no_result[match]:
+            streaks[:, match + 1] = current
+            continue
+        streaks[:, match + 1] = np.where(correct[:, match], np.maximum(current, 0) + 1, np.minimum(current, 0) - 1)
+    longest_winning = np.maximum.accumulate(np.maximum(streaks, 0), axis=1)
+    longest_losing = np.maximum.accumulate(np.maximum(-streaks, 0), axis=1)
+    return streaks, longest_winning, longest_losing
+
+def build_index(points_progression, state, schedule_df):
+    """Everything the leaderboard shows after each completed match, as participants x (matches + 1) arrays.
+
+    Column 0 is the start of the season, as in points_progression; column k is the table after the k-th
+    completed match. Points and ranks come from the progression calculate_scores returns, correct picks
+    and streaks from the scoring state it was built from. Each array is stored in the narrowest integer
+    type its values fit, so a season of a few thousand participants takes a few megabytes. Lookup tables
+    from match number and from calendar day (by the schedule's dates) to column make any query one slice.
+    """
+    history = RankHistory.build_rank_history(points_progression)
+    filled = IncrementalScoring.num_matches(state)
+    labels = np.asarray(state["match_index"][:filled], dtype=int)
+    _, correct, _ = IncrementalScoring.participant_matrices(state)
+    no_result = np.asarray(state["no_result"][:filled], dtype=bool)
+    streaks, longest_winning, longest_losing = streak_history(correct, no_result)
+
+    match_numbers = pd.to_numeric(schedule_df.iloc[labels, 0]).to_numpy(dtype=int)
+    dates = pd.to_datetime(schedule_df.iloc[labels, 1].astype(str).str.strip(), format="mixed").to_numpy().astype("datetime64[D]")
+    match_positions = np.searchsorted(np.maximum.accumulate(match_numbers), np.arange(int(match_numbers.max(initial=0)) + 1), side="right")
+    if len(dates):
+        first_day = dates.min()
+        days = np.arange(first_day, dates.max() + 1)
+        day_positions = np.searchsorted(np.maximum.accumulate(dates), days, side="right")
+    else:
+        first_day, day_positions = np.datetime64("NaT", "D"), np.zeros(0, dtype=int)
+
+    return AsOfIndex(
+        participants=history.participants,
+        match_numbers=compact(np.concatenate([[0], match_numbers])),
+        dates=np.concatenate([[np.datetime64("NaT", "D")], dates]),
+        points=compact(history.points),
+        ranks=compact(history.ranks),
+        correct=compact(np.concatenate([np.zeros((len(history.participants), 1), dtype=int), correct.cumsum(axis=1)], axis=1)),
+        streaks=compact(streaks),
+        longest_winning=compact(longest_winning),
+        longest_losing=compact(longest_losing),
+        first_day=first_day,
+        day_positions=compact(day_positions),
+        match_positions=compact(match_positions),
+    )
+
+def position_for_match(index, match_number):
+    """Column of the table once every completed match up to `match_number` is in."""
+    if match_number < 0:
+        return 0
+    return int(index.match_positions[min(match_number, len(index.match_positions) - 1)])
+
+def position_for_date(index, date):
+    """Column of the table at the end of `date`: every completed match scheduled on or before it is in."""
+    if len(index.day_positions) == 0:
+        return 0
+    day = (np.datetime64(pd.Timestamp(date).date(), "D") - index.first_day).astype(int)
+    if day < 0:
+        return 0
+    return int(index.day_positions[min(day, len(index.day_positions) - 1)])
+
+def leaderboard_at(index, position):
+    """The leaderboard as it stood at one column of the index, best first; a slice of each array."""
+    leaderboard_df = pd.DataFrame({
+        "Rank": index.ranks[:, position],
+        "Participant": index.participants,
+        "Points": index.points[:, position],
+        "Accuracy (%)": (index.correct[:, position] * 100.0 / position).round(2) if position else 0.0,
+        "Correct Predictions": index.correct[:, position],
+        "Current Streak": index.streaks[:, position],
+        "Longest Winning Streak": index.longest_winning[:, position],
+        "Longest Losing Streak": index.longest_losing[:, position],
+    })
+    return leaderboard_df.sort_values(by=["Rank", "Participant"], kind="stable").reset_index(drop=True)
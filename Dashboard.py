@@ -1,113 +1,376 @@
 import streamlit as st
 import pandas as pd
 import os
+import time
 import Plotting
+import RankHistory
+import Similarity
+import Leverage
+import Standings
 import ExtractAndTransform
 import Analysis
+import AsOfIndex
+import Simulation
+import RankSolver
+import DataCache
+import VisualExport
+import Instrumentation
+import LeagueRegistry
+import LiveUpdates
+
+VIEWS = ["Leaderboard", "Time Travel", "All Predictions", "Matchwise Predictions", "Analysis", "What If"]
+HEATMAP_MAX_PARTICIPANTS = 60
+HEAD_TO_HEAD_MAX_PARTICIPANTS = 25
+LIVE_POLL_SECONDS = 5
+LIVE_UPDATES_SHOWN = 5
 
 def format_matchwise_points(points_list):
     return "".join(f'<span style="background-color:#444; color:white; padding:5px 8px; border-radius:5px; margin:2px;">{p}</span>' for p in points_list)
 
+@st.cache_resource
+def get_data_cache():
+    return DataCache.FingerprintCache()
+
+@st.cache_resource
+def get_league_registry(root_paths):
+    return LeagueRegistry.LeagueRegistry(root_paths)
+
+@st.cache_resource
+def get_figure_exporter(visuals_path):
+    return VisualExport.FigureExporter(visuals_path)
+
+@st.cache_resource
+def get_league_watcher(league):
+    # One watcher per league for the whole server: a change is rescored once, however many sessions are open
+    return LiveUpdates.LeagueWatcher(get_data_cache(), league).start()
+
+@st.fragment(run_every=LIVE_POLL_SECONDS)
+def show_live_updates(watcher):
+    """Rerun the page when the watcher has published a change, and list the latest changes."""
+    version_key, updates_key = f"live_version_{watcher.league.name}", f"live_updates_{watcher.league.name}"
+    seen = st.session_state.setdefault(version_key, watcher.version)
+    if watcher.version > seen:
+        st.session_state[version_key] = watcher.version
+        st.session_state[updates_key] = (st.session_state.get(updates_key, []) + watcher.updates_since(seen))[-LIVE_UPDATES_SHOWN:]
+        st.rerun()
+    if watcher.error:
+        st.caption(f"Live updates could not rescore the latest change and will retry: {watcher.error}")
+    updates = st.session_state.get(updates_key, [])
+    if not updates:
+        return
+    with st.expander(f"Live updates ({len(updates)})", expanded=True):
+        for update in reversed(updates):
+            matches = sorted(update.progression_df["Match"].unique())
+            played = f" after match {', '.join(map(str, matches))}" if matches else ""
+            st.caption(f"{time.strftime('%H:%M:%S', time.localtime(update.time))}: "
+                       f"{len(update.changed_df)} leaderboard row(s) changed{played}")
+            st.dataframe(update.changed_df, hide_index=True, use_container_width=True)
+
+def input_paths(league):
+    return [os.path.join(league.results_path, "Results.csv"), league.predictions_path, league.old_predictions_path or league.predictions_path]
+
+def snapshot(cache, league, predictions_path=None):
+    # Scored tables come from the columnar snapshot, which is only recomputed when an input file's content changes
+    return DataCache.season_snapshot(cache, league.results_path, predictions_path or league.predictions_path, league.schedule_path)
+
+def rank_bounds(cache, league):
+    return cache.get("rank_bounds", input_paths(league)[:2], lambda: RankSolver.rank_bounds(
+        DataCache.load_results(cache, league.results_path), DataCache.load_predictions(cache, league.predictions_path),
+        DataCache.standings(cache, league.results_path)))
+
+def leaderboard_tables(cache, league):
+    """The ranked leaderboard (with change arrows and title race) and the old-vs-new points table, once per data version."""
+    def compute():
+        old_leaderboard_df = snapshot(cache, league, league.old_predictions_path).read("leaderboard", ["Participant", "Points"])
+        leaderboard_df = snapshot(cache, league).read("leaderboard")
+        total_leaderboard = pd.merge(old_leaderboard_df, leaderboard_df, on="Participant")[["Participant","Points_x","Points_y"]]
+        total_leaderboard['Points Difference'] = total_leaderboard["Points_y"] - total_leaderboard["Points_x"]
+        total_leaderboard["Change"] = total_leaderboard["Points Difference"].apply(ExtractAndTransform.format_arrow)
+        leaderboard_df = pd.merge(total_leaderboard[['Participant','Change']], leaderboard_df, on="Participant")
+        rank_bounds_df = rank_bounds(cache, league).copy()
+        rank_bounds_df["Title Race"] = RankSolver.title_race_status(rank_bounds_df)
+        leaderboard_df = pd.merge(leaderboard_df, rank_bounds_df[["Participant", "Title Race"]], on="Participant")
+        # leaderboard_df = leaderboard_df[~leaderboard_df["Participant"].isin(["Wanderers","Homies"])]
+        leaderboard_df["Rank"] = leaderboard_df["Points"].rank(method="dense", ascending=False).astype(int)
+        leaderboard_df = leaderboard_df.sort_values(by="Rank").reset_index(drop=True)
+        leaderboard_df["Matchwise Points (Last 5)"] = leaderboard_df["Matchwise Points (Last 5)"].apply(format_matchwise_points)
+        return leaderboard_df, total_leaderboard
+    return cache.get("leaderboard_tables", input_paths(league) + [league.schedule_path], compute)
+
+@st.fragment
+def show_leaderboard(cache, league, registry):
+    if len(registry.leagues) > 1 and st.toggle(f"Compare all {len(registry.leagues)} leagues"):
+        league_summary_df, league_errors = cache.get("score_leagues", registry.input_paths(),
+                                                     lambda: registry.score_all(workers=os.cpu_count()))
+        st.dataframe(league_summary_df, hide_index=True, use_container_width=True)
+        for league_name, error in league_errors:
+            st.caption(f"{league_name} could not be scored: {error}")
+    leaderboard_df, total_leaderboard = leaderboard_tables(cache, league)
+    results_df = DataCache.load_results(cache, league.results_path)
+    results_file, predictions_path = input_paths(league)[:2]
+    st.subheader("Leaderboard")
+    st.write(leaderboard_df[["Rank","Participant","Points",'Change',"Title Race",'Accuracy (%)','Matchwise Points (Last 5)','Last 5 Matches', "Predicted Points","Bonus Points","Correct Predictions"]].to_html(escape=False, index=False), unsafe_allow_html=True)
+    number_of_outcomes, outcomes_string = ExtractAndTransform.format_outcomes(results_df)
+    st.markdown(f'##### Total Possible Outcomes for Remaining League Matches : **{outcomes_string}** ({number_of_outcomes:,}) outcomes')
+    if number_of_outcomes > 1:
+        st.subheader("Finishing Position Probabilities")
+        rank_probabilities = cache.get("simulate_rank_probabilities", [results_file, predictions_path], lambda: Simulation.simulate_rank_probabilities(
+            results_df, DataCache.load_predictions(cache, predictions_path), seed=0, standings=DataCache.standings(cache, league.results_path)))
+        st.dataframe(rank_probabilities.style.format("{:.1%}"), use_container_width=True)
+        # One exact solve per pair, so it is only run on request and for the top of the table
+        if st.toggle(f"Head-to-Head: chance the row participant finishes above the column participant (top {HEAD_TO_HEAD_MAX_PARTICIPANTS})"):
+            top_participants = leaderboard_df["Participant"].head(HEAD_TO_HEAD_MAX_PARTICIPANTS).tolist()
+            pairwise_df = cache.get("pairwise_above_probabilities", [results_file, predictions_path], lambda: RankSolver.pairwise_above_probabilities(
+                results_df, DataCache.load_predictions(cache, predictions_path), participants=top_participants))
+            st.dataframe(pairwise_df.style.format("{:.1%}", na_rep="-"), use_container_width=True)
+
+        st.subheader("Matches to Watch")
+        fixture_points = DataCache.fixture_points(cache, league.results_path, predictions_path)
+        st.caption("Remaining fixtures ranked by how many places the leaderboard moves between a home and an away win.")
+        matches_to_watch_df = cache.get("matches_to_watch", [results_file, predictions_path], lambda: Leverage.matches_to_watch(fixture_points))
+        st.dataframe(matches_to_watch_df, hide_index=True, use_container_width=True)
+        participant = st.selectbox("Matches to watch for", leaderboard_df["Participant"].tolist(), key=f"leverage_{league.name}")
+        st.caption("Leverage is the expected final rank after an away win minus after a home win: positive means a home win helps.")
+        st.dataframe(Leverage.participant_leverage(fixture_points, participant), hide_index=True, use_container_width=True)
+
+    with st.expander("IPL Points Table"):
+        st.dataframe(DataCache.standings(cache, league.results_path).table(), hide_index=True, use_container_width=True)
+
+    st.write('\n\n')
+    st.subheader("Points Progression Worm")
+    # st.plotly_chart(Plotting.plot_worm_graph(points_progression), use_container_width=True)
+    # st.write(leaderboard_df, use_container_width=True)
+
+    st.plotly_chart(Plotting.plot_animated_worm_graph(snapshot(cache, league).points_progression()), use_container_width=True, theme=None)
+    st.write(total_leaderboard, use_container_width=True)
+
+@st.fragment
+def show_time_travel(cache, league):
+    st.subheader("Leaderboard Through the Season")
+    # Built once per data version; moving the slider only slices the precomputed arrays
+    index = DataCache.as_of_index(cache, league.results_path, league.predictions_path, league.schedule_path)
+    if len(index.match_numbers) == 1:
+        st.info("No match has a result yet.")
+        return
+    if st.radio("Go to", ["Match", "Date"], horizontal=True, key="time_travel_by") == "Match":
+        last_match = int(index.match_numbers[-1])
+        match_number = st.slider("After match", 0, last_match, last_match, key=f"time_travel_match_{league.name}")
+        position = AsOfIndex.position_for_match(index, match_number)
+    else:
+        first_day, last_day = pd.Timestamp(index.dates[1]).date(), pd.Timestamp(index.dates[-1]).date()
+        date = st.slider("As of", first_day, last_day, last_day, format="MMM D, YYYY", key=f"time_travel_date_{league.name}")
+        position = AsOfIndex.position_for_date(index, date)
+    if position:
+        st.caption(f"{position} completed match(es), up to match {index.match_numbers[position]} "
+                   f"on {pd.Timestamp(index.dates[position]):%B %d, %Y}")
+    else:
+        st.caption("Before the first match")
+    st.dataframe(AsOfIndex.leaderboard_at(index, position), hide_index=True, use_container_width=True)
+
+def show_all_predictions(cache, league):
+    st.subheader("All Predictions")
+    issues_df = DataCache.gamble_issues(cache, league.predictions_path, league.schedule_path)
+    if len(issues_df):
+        st.warning(f"{len(issues_df)} problems found in {issues_df['Participant'].nunique()} gamble files; "
+                   "those picks are scored as wrong.")
+        with st.expander("Gamble file problems"):
+            st.dataframe(issues_df, use_container_width=True, hide_index=True)
+    st.dataframe(DataCache.load_predictions(cache, league.predictions_path), use_container_width=True)
+
+def show_matchwise_predictions(cache, league):
+    st.subheader("Matchwise Predictions")
+    st.dataframe(snapshot(cache, league).read("matchwise"), use_container_width=True)
+
+@st.fragment
+def show_analysis(cache, league, exporter):
+    schedule_path, predictions_path = league.schedule_path, league.predictions_path
+    st.subheader("Participant-wise Team Win Predictions")
+    prediction_store = DataCache.load_prediction_store(cache, predictions_path, schedule_path)
+    participant_wise_team_predictions = ExtractAndTransform.get_participant_wise_team_predictions(prediction_store)
+    participants = participant_wise_team_predictions["Participant"].unique()
+    num_participants = len(participants)
+    cols_per_row = 6
+    for i in range(0, num_participants, cols_per_row):
+        cols = st.columns(cols_per_row)  # Create 6 columns in the row
+
+        for j, col in enumerate(cols):
+            if i + j < num_participants:
+                participant = participants[i + j]
+                with col:  # Place chart in the respective column
+                    st.write(f"###### {participant}")
+                    fig = Plotting.plot_participant_wise_team_predictions(
+                        participant_wise_team_predictions[participant_wise_team_predictions["Participant"] == participant]
+                    )
+                    fig.update_layout(showlegend=False)
+                    st.plotly_chart(fig, use_container_width=True)
+
+    st.write('\n\n')
+    counts_df = Analysis.prediction_counts_analysis(prediction_store)
+    counts_df_mean = counts_df.mean().sort_values(ascending=False)
+    avg_wins_fig = Plotting.avg_wins_plot(counts_df_mean)
+    exporter.submit(avg_wins_fig, "Average Win Prediction.png")
+    st.plotly_chart(avg_wins_fig, use_container_width=True)
+
+    st.write('\n\n')
+    st.subheader("Prediction Ratio Analysis")
+    prediction_ratio_counts, home_away_ratio_counts = DataCache.get_prediction_ratios(cache, schedule_path, predictions_path)
+    st.plotly_chart(Plotting.plot_prediction_ratio(prediction_ratio_counts), use_container_width=True)
+    st.plotly_chart(Plotting.plot_home_away_ratio(home_away_ratio_counts), use_container_width=True)
+    st.write('\n\n')
+
+    percentage_df = DataCache.home_away_percentage(cache, schedule_path, predictions_path)
+    percentage_df = percentage_df.sort_values(by="Home", ascending=False)
+    percentage_df = percentage_df.rename(columns={"Home": "Home %", "Away": "Away %"})
+    st.plotly_chart(Plotting.plot_home_away_percentage(percentage_df), use_container_width=True)
+
+    st.subheader("Prediction Agreement")
+    agreement_df = DataCache.prediction_agreement(cache, schedule_path, predictions_path)
+    contrarian_df = Similarity.contrarian_scores(prediction_store, agreement_df)
+    if len(agreement_df) > HEATMAP_MAX_PARTICIPANTS:
+        leaders = snapshot(cache, league).read("leaderboard", ["Participant"])["Participant"][:HEATMAP_MAX_PARTICIPANTS]
+        st.caption(f"Showing the top {HEATMAP_MAX_PARTICIPANTS} of {len(agreement_df)} participants.")
+        st.plotly_chart(Plotting.plot_agreement_heatmap(agreement_df.loc[leaders, leaders]), use_container_width=True)
+    else:
+        st.plotly_chart(Plotting.plot_agreement_heatmap(agreement_df), use_container_width=True)
+    contrarian_col, consensus_col = st.columns(2)
+    with contrarian_col:
+        st.dataframe(contrarian_df, use_container_width=True, hide_index=True)
+    with consensus_col:
+        consensus_df = Similarity.match_consensus(prediction_store, DataCache.load_schedule(cache, schedule_path))
+        st.dataframe(consensus_df.sort_values(by="Entropy", ascending=False), use_container_width=True, hide_index=True)
+
+    points_progression = snapshot(cache, league).points_progression()
+    # st.plotly_chart(Plotting.plot_bar_chart_race(points_progression), use_container_width=True)
+    position_fig = Plotting.plot_position_graph(points_progression)
+    exporter.submit(position_fig, "position_graph.png")
+    st.plotly_chart(position_fig, use_container_width=True)
+    st.subheader("Rank History")
+    rank_history = RankHistory.build_rank_history(points_progression)
+    rank_summary_df = RankHistory.rank_summary(rank_history)
+    st.dataframe(rank_summary_df, use_container_width=True, hide_index=True)
+    participant = st.selectbox("Matches spent at each rank by", rank_summary_df["Participant"].tolist(), key=f"time_spent_{league.name}")
+    time_spent_df = snapshot(cache, league).read("time_spent")
+    Plotting.plot_time_spent_position(time_spent_df[time_spent_df["Participant"] == participant])
+    points_progression_df = pd.DataFrame(points_progression)[1:]
+    points_progression_df = points_progression_df.reset_index().rename(columns={'index': 'Match Number'})
+    st.dataframe(points_progression_df, use_container_width=True, hide_index=True)
+
+def clear_what_if_picks(labels):
+    for label in labels:
+        st.session_state[f"what_if_{label}"] = None
+
+@st.fragment
+def show_what_if(cache, league):
+    st.subheader("What If")
+    results_path, predictions_path = league.results_path, league.predictions_path
+    scorer = DataCache.what_if_scorer(cache, results_path, predictions_path)
+    results_df = scorer.results_df
+    if not scorer.fixtures:
+        st.info("Every fixture has a result, so there is nothing left to play out.")
+        return
+    st.caption("Click a team to make it the winner of a fixture (click it again to clear); league bonuses follow the points table, "
+               f"and a playoff win earns its entered bonus, or {Standings.PLAYOFF_BONUS:g} until one is entered.")
+    overlay = {}
+    cols = st.columns(2)
+    for i, label in enumerate(scorer.fixtures):
+        row = results_df.loc[label]
+        with cols[i % 2]:
+            winner = st.segmented_control(f"Match {row['Match #']} · {row['Date']}", [row["Home Team"], "NR", row["Away Team"]],
+                                          key=f"what_if_{label}")
+        if winner is not None:
+            overlay[label] = winner
+    st.button("Clear picks", on_click=clear_what_if_picks, args=(scorer.fixtures,))
+    if not overlay:
+        return
+
+    what_if_df, what_if_progression = scorer.rescore(overlay)
+    old_what_if_df, _ = DataCache.what_if_scorer(cache, results_path, league.old_predictions_path or predictions_path).rescore(overlay)
+    what_if_df = pd.merge(old_what_if_df[["Participant", "Points"]], what_if_df, on="Participant", suffixes=("_old", ""))
+    what_if_df["Change"] = (what_if_df["Points"] - what_if_df["Points_old"]).apply(ExtractAndTransform.format_arrow)
+    what_if_df["Rank"] = what_if_df["Points"].rank(method="dense", ascending=False).astype(int)
+    current_ranks = leaderboard_tables(cache, league)[0].set_index("Participant")["Rank"]
+    what_if_df["Move"] = (what_if_df["Participant"].map(current_ranks) - what_if_df["Rank"]).apply(ExtractAndTransform.format_arrow)
+    what_if_df = what_if_df.sort_values(by="Rank").reset_index(drop=True)
+    st.write(f"##### Leaderboard with {len(overlay)} hypothetical result(s)")
+    st.dataframe(what_if_df[["Rank", "Move", "Participant", "Points", "Change", "Accuracy (%)", "Predicted Points", "Bonus Points", "Correct Predictions"]],
+                 hide_index=True, use_container_width=True)
+    st.plotly_chart(Plotting.plot_worm_graph(what_if_progression), use_container_width=True)
+
+def show_performance(last_profile):
+    st.subheader("Performance")
+    if last_profile is None:
+        st.info("Open another view with profiling on to record its stages.")
+        return
+    view, recorder = last_profile
+    st.caption(f"Stages of the last {view} load; self time excludes nested stages. Peak allocation needs memory tracking on.")
+    st.dataframe(recorder.summary().style.format(precision=1), hide_index=True, use_container_width=True)
+    col1, col2 = st.columns(2)
+    col1.download_button("Download JSON", recorder.to_json(), file_name="dashboard_profile.json", mime="application/json")
+    col2.download_button("Download Chrome trace", recorder.to_chrome_trace(), file_name="dashboard_trace.json", mime="application/json")
+
 def main():
     st.set_page_config(layout="wide")
+    profile = st.sidebar.toggle("Profile this page", value=bool(os.environ.get("IPL_PROFILE")))
+    if not profile:
+        render_dashboard()
+        return
+    trace_memory = st.sidebar.checkbox("Track peak memory (slower)")
+    Instrumentation.instrument(ExtractAndTransform, Analysis, Plotting, DataCache, RankSolver, Simulation)
+    with Instrumentation.recording(trace_memory=trace_memory) as recorder:
+        with Instrumentation.stage("Dashboard.main"):
+            view = render_dashboard(profile=True)
+    if view == "Performance":
+        show_performance(st.session_state.get("last_profile"))
+    elif view is not None:
+        st.session_state["last_profile"] = (view, recorder)
+
+def render_dashboard(profile=False):
+    """Render the sidebar and the selected view only; returns the name of that view."""
     st.title("IPL Match Prediction Leaderboard")
 
     with open("styles.css") as f:
         st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
 
-    
-    base_path = "/home/sushanth/Github/ipl-prediction-gamble"  # Change this to your actual folder path
-    schedule_path = os.path.join(base_path, "The Schedule/ipl_2025_schedule.csv")
-    predictions_path = os.path.join(base_path, "The Calculated Gambles")
-    old_predictions_path = os.path.join(base_path, "The Gambles")
-    results_path = os.path.join(base_path, "The Results")
-
-    schedule_df = pd.read_csv(schedule_path)
-    
-    results_df = ExtractAndTransform.load_results(results_path)
-    predictions = ExtractAndTransform.load_predictions(predictions_path)
-    old_predictions_df = ExtractAndTransform.load_predictions(old_predictions_path)
-    old_leaderboard_df, old_points_progression = ExtractAndTransform.calculate_scores(results_df, old_predictions_df)
-    leaderboard_df, points_progression = ExtractAndTransform.calculate_scores(results_df, predictions)
-    total_leaderboard = pd.merge(old_leaderboard_df, leaderboard_df, on="Participant")[["Participant","Points_x","Points_y"]]
-    total_leaderboard['Points Difference'] = total_leaderboard["Points_y"] - total_leaderboard["Points_x"]
-    total_leaderboard["Change"] = total_leaderboard["Points Difference"].apply(ExtractAndTransform.format_arrow)
-    leaderboard_df = pd.merge(total_leaderboard[['Participant','Change']], leaderboard_df, on="Participant")
-    # leaderboard_df = leaderboard_df[~leaderboard_df["Participant"].isin(["Wanderers","Homies"])]
-    leaderboard_df["Rank"] = leaderboard_df["Points"].rank(method="dense", ascending=False).astype(int)
-    leaderboard_df = leaderboard_df.sort_values(by="Rank").reset_index(drop=True)
-    leaderboard_df["Matchwise Points (Last 5)"] = leaderboard_df["Matchwise Points (Last 5)"].apply(format_matchwise_points)
-    matchwise_df = ExtractAndTransform.matchwise_predictions(schedule_df, predictions)
-    prediction_ratio_counts, home_away_ratio_counts = Analysis.get_prediction_ratios(matchwise_df)
-
-    tab1, tab2, tab3, tab4 = st.tabs(["Leaderboard", "All Predictions", "Matchwise Predictions", "Analysis"])
-
-    with tab1:         
-        st.subheader("Leaderboard")
-        st.write(leaderboard_df[["Rank","Participant","Points",'Change','Accuracy (%)','Matchwise Points (Last 5)','Last 5 Matches', "Predicted Points","Bonus Points","Correct Predictions"]].to_html(escape=False, index=False), unsafe_allow_html=True)
-        number_of_outcomes, outcomes_string = ExtractAndTransform.format_outcomes(results_df)
-        st.markdown(f'##### Total Possible Outcomes for Remaining League Matches : **{outcomes_string}** ({number_of_outcomes:,}) outcomes') 
-
-        st.write('\n\n')
-        st.subheader("Points Progression Worm")
-        # st.plotly_chart(Plotting.plot_worm_graph(points_progression), use_container_width=True)
-        # st.write(leaderboard_df, use_container_width=True)
-
-        Plotting.plot_animated_worm_graph(points_progression)
-        st.write(total_leaderboard, use_container_width=True)
-    st.write('\n\n')
 
-    with tab2 : 
-        st.subheader("All Predictions")
-        st.dataframe(predictions, use_container_width=True)
+    base_path = os.environ.get("IPL_BASE_PATH", "/home/sushanth/Github/ipl-prediction-gamble")  # Change this to your actual folder path
+    # IPL_LEAGUES_ROOT lists folders (separated like PATH) holding any number of league directories
+    league_roots = os.environ.get("IPL_LEAGUES_ROOT", base_path).split(os.pathsep)
+    registry = get_league_registry(tuple(league_roots))
+    cache = get_data_cache()
+    if st.sidebar.button("Rescan leagues"):
+        registry.refresh()
+    cache.resize(DataCache.cache_size(len(registry.leagues)))
+    if not registry.leagues:
+        st.error(f"No leagues found under {', '.join(league_roots)}")
+        return None
+    league = registry.get(st.sidebar.selectbox("League", registry.names()))
+    exporter = get_figure_exporter(os.path.join(league.base_path, "The Visuals"))
 
+    # Only the selected view is computed; switching views reruns the page, widgets inside a view rerun just that view
+    views = VIEWS + (["Performance"] if profile else [])
+    view = st.radio("View", views, horizontal=True, key="view", label_visibility="collapsed")
     st.write('\n\n')
+    show_live_updates(get_league_watcher(league))
+
+    with Instrumentation.stage(f"{view} view"):
+        if view == "Leaderboard":
+            show_leaderboard(cache, league, registry)
+        elif view == "Time Travel":
+            show_time_travel(cache, league)
+        elif view == "All Predictions":
+            show_all_predictions(cache, league)
+        elif view == "Matchwise Predictions":
+            show_matchwise_predictions(cache, league)
+        elif view == "Analysis":
+            show_analysis(cache, league, exporter)
+        elif view == "What If":
+            show_what_if(cache, league)
 
-    with tab3:
-        st.subheader("Matchwise Predictions")
-        st.dataframe(matchwise_df, use_container_width=True)
-
-    with tab4:
-        st.subheader("Participant-wise Team Win Predictions")
-        participant_wise_team_predictions = ExtractAndTransform.get_participant_wise_team_predictions(predictions)
-        participants = participant_wise_team_predictions["Participant"].unique()
-        num_participants = len(participants)
-        cols_per_row = 6
-        for i in range(0, num_participants, cols_per_row):
-            cols = st.columns(cols_per_row)  # Create 6 columns in the row
-            
-            for j, col in enumerate(cols):
-                if i + j < num_participants: 
-                    participant = participants[i + j]
-                    with col:  # Place chart in the respective column
-                        st.write(f"###### {participant}")
-                        fig = Plotting.plot_participant_wise_team_predictions(
-                            participant_wise_team_predictions[participant_wise_team_predictions["Participant"] == participant]
-                        )
-                        fig.update_layout(showlegend=False)
-                        st.plotly_chart(fig, use_container_width=True)
-
-        st.write('\n\n')
-        counts_df = Analysis.prediction_counts_analysis(predictions)
-        counts_df_mean = counts_df.mean().sort_values(ascending=False)
-        st.plotly_chart(Plotting.avg_wins_plot(counts_df_mean), use_container_width=True)
-
-        st.write('\n\n')
-        st.subheader("Prediction Ratio Analysis")
-        prediction_ratio_counts, home_away_ratio_counts = Analysis.get_prediction_ratios(matchwise_df)
-        st.plotly_chart(Plotting.plot_prediction_ratio(prediction_ratio_counts), use_container_width=True)
-        Plotting.plot_home_away_ratio(home_away_ratio_counts)
-        st.write('\n\n')
-
-        percentage_df = Analysis.home_away_percentage(schedule_df, pd.DataFrame(predictions))
-        percentage_df.sort_values(by="Home", ascending=False, inplace=True)
-        percentage_df = percentage_df.rename(columns={"Home": "Home %", "Away": "Away %"})
-        st.plotly_chart(Plotting.plot_home_away_percentage(percentage_df), use_container_width=True)
-        # st.plotly_chart(Plotting.plot_bar_chart_race(points_progression), use_container_width=True)
-        st.plotly_chart(Plotting.plot_position_graph(points_progression), use_container_width=True)
-        points_progression_df = pd.DataFrame(points_progression)[1:]
-        points_progression_df = points_progression_df.reset_index().rename(columns={'index': 'Match Number'})
-        st.dataframe(points_progression_df, use_container_width=True, hide_index=True)
+    with st.sidebar.expander("Debug: data cache"):
+        st.dataframe(cache.stats(), hide_index=True, use_container_width=True)
+        for filename, error in list(exporter.errors.items()):
+            st.caption(f"Image export of {filename} failed: {error}")
+    return view
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,258 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+import pandas as pd
+import ExtractAndTransform
+import Analysis
+import AsOfIndex
+import IncrementalScoring
+import Ingestion
+import Leverage
+import PredictionStore
+import Similarity
+import Snapshot
+import Standings
+import WhatIf
+
+SLOTS_PER_LEAGUE = 48  # cached functions x the gamble folders each reads; one league fills about 30 today
+
+def path_fingerprint(path):
+    """Cheap identity of a file or a directory of files: names, modification times and sizes."""
+    if os.path.isdir(path):
+        return tuple(sorted((entry.name, entry.stat().st_mtime_ns, entry.stat().st_size)
+                            for entry in os.scandir(path) if entry.is_file()))
+    stat = os.stat(path)
+    return (os.path.basename(path), stat.st_mtime_ns, stat.st_size)
+
+def within(path, folders):
+    """Whether `path` is one of `folders` (normalized paths) or lies inside one."""
+    path = os.path.normpath(path)
+    return any(path == folder or path.startswith(folder + os.sep) for folder in folders)
+
+def cache_size(num_leagues):
+    """Entries a cache shared by this many leagues needs to hold every view of each at once."""
+    return SLOTS_PER_LEAGUE * max(1, num_leagues)
+
+
+class FingerprintCache:
+    """Bounded LRU cache of loaded and derived data, keyed on the fingerprints of the files it came from.
+
+    Every entry lives in a slot (function name + the paths it read) and remembers the fingerprints it was
+    computed from; when one of those files changes only the slots that read it are recomputed, and the
+    superseded value is replaced rather than kept alongside. Size it with cache_size so that every league
+    keeps all its slots.
+
+    Files under a folder a watcher polls (see `watch`) keep their fingerprints until the watcher expires
+    them on a change, so reruns do not touch the disk at all; any other file is checked on every lookup.
+
+    One cache is shared by every session thread, the live-update watcher and the API worker. The
+    bookkeeping is guarded by a lock that is never held while computing, and a miss holds a lock of its
+    own slot, so threads missing the same slot wait for one computation (and one write of whatever it
+    persists) instead of each running it. A slot's lock goes with its entry when that is evicted.
+    """
+
+    def __init__(self, max_entries=None):
+        self.max_entries = max_entries or cache_size(1)
+        self.entries = OrderedDict()
+        self.fingerprints = {}
+        self.watched = set()
+        self.expirations = 0
+        self.hits = {}
+        self.misses = {}
+        self.lock = threading.Lock()
+        self.slot_locks = {}
+
+    def watch(self, folders):
+        """Keep the fingerprints of the files in these folders until expire_fingerprints is called for them."""
+        with self.lock:
+            self.watched.update(os.path.normpath(folder) for folder in folders)
+
+    def fingerprint(self, path):
+        with self.lock:
+            fingerprint = self.fingerprints.get(path)
+            expirations = self.expirations
+        if fingerprint is None:
+            fingerprint = path_fingerprint(path)
+            with self.lock:
+                # Not kept if an expiry came in while the file was being checked: it may be older than that
+                if expirations == self.expirations and within(path, self.watched):
+                    self.fingerprints[path] = fingerprint
+        return fingerprint
+
+    def expire_fingerprints(self, folders=None):
+        """Re-check the files in these folders (every file by default) on their next lookup."""
+        with self.lock:
+            self.expirations += 1
+            if folders is None:
+                self.fingerprints.clear()
+                return
+            folders = [os.path.normpath(folder) for folder in folders]
+            for path in [path for path in self.fingerprints if within(path, folders)]:
+                del self.fingerprints[path]
+
+    def lookup(self, slot, version):
+        """The stored value when it is current (moved to the LRU front), else None; call with the lock held."""
+        entry = self.entries.get(slot)
+        if entry is None or entry[0] != version:
+            return None
+        self.entries.move_to_end(slot)
+        self.hits[slot[0]] = self.hits.get(slot[0], 0) + 1
+        return entry
+
+    def get(self, name, paths, compute):
+        """Return the cached result of `compute()` for these input paths, recomputing it if any of them changed."""
+        slot = (name,) + tuple(paths)
+        version = tuple(self.fingerprint(path) for path in paths)
+        with self.lock:
+            entry = self.lookup(slot, version)
+            if entry is not None:
+                return entry[1]
+            slot_lock = self.slot_locks.setdefault(slot, threading.Lock())
+        with slot_lock:
+            with self.lock:
+                entry = self.lookup(slot, version)  # computed by another thread while this one waited
+            if entry is not None:
+                return entry[1]
+            try:
+                value = compute()
+            except BaseException:
+                with self.lock:
+                    if slot not in self.entries:
+                        self.slot_locks.pop(slot, None)
+                raise
+            with self.lock:
+                self.misses[name] = self.misses.get(name, 0) + 1
+                self.entries[slot] = (version, value)
+                self.entries.move_to_end(slot)
+                self.evict()
+        return value
+
+    def evict(self):
+        """Drop the least recently used entries (and their slot locks) beyond `max_entries`; call with the lock held."""
+        while len(self.entries) > self.max_entries:
+            slot, _ = self.entries.popitem(last=False)
+            self.slot_locks.pop(slot, None)
+
+    def resize(self, max_entries):
+        with self.lock:
+            self.max_entries = max_entries
+            self.evict()
+
+    def stats(self):
+        """Hit/miss counters and live entries per cached function."""
+        with self.lock:
+            hits, misses = dict(self.hits), dict(self.misses)
+            entries = [slot[0] for slot in self.entries]
+        names = sorted(set(hits) | set(misses))
+        return pd.DataFrame({
+            "Function": names,
+            "Hits": [hits.get(name, 0) for name in names],
+            "Misses": [misses.get(name, 0) for name in names],
+            "Entries": [entries.count(name) for name in names],
+        })
+
+    def peek(self, name, paths):
+        """The last value stored for this slot, current or not."""
+        with self.lock:
+            entry = self.entries.get((name,) + tuple(paths))
+        return None if entry is None else entry[1]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.slot_locks.clear()
+            self.fingerprints.clear()
+            self.expirations += 1
+
+
+def load_schedule(cache, schedule_path):
+    return cache.get("load_schedule", [schedule_path], lambda: pd.read_csv(schedule_path))
+
+def load_results(cache, results_path):
+    """Results with the bonus of any decided league match left blank derived from the standings."""
+    results_file = os.path.join(results_path, "Results.csv")
+    return cache.get("load_results", [results_file], lambda: Standings.fill_bonus_points(
+        ExtractAndTransform.load_results(results_path), standings(cache, results_path)))
+
+def standings(cache, results_path):
+    """Points table and its history, extended from the previous version when results were only appended."""
+    results_file = os.path.join(results_path, "Results.csv")
+    return cache.get("standings", [results_file], lambda: Standings.build_standings(
+        ExtractAndTransform.load_results(results_path), cache.peek("standings", [results_file])))
+
+def load_predictions(cache, predictions_path):
+    return cache.get("load_predictions", [predictions_path], lambda: ExtractAndTransform.load_predictions(predictions_path))
+
+def load_prediction_store(cache, predictions_path, schedule_path):
+    return cache.get("load_prediction_store", [predictions_path, schedule_path], lambda: PredictionStore.load_store(
+        predictions_path, load_schedule(cache, schedule_path)))
+
+def gamble_issues(cache, predictions_path, schedule_path):
+    """Report of every pick that does not match its scheduled fixture, found when the store was compiled."""
+    return cache.get("gamble_issues", [predictions_path, schedule_path], lambda: Ingestion.issue_report(
+        load_prediction_store(cache, predictions_path, schedule_path).issues))
+
+def scoring_state_path(results_path, predictions_path):
+    """Where the incremental scoring state for one set of predictions is kept between runs.
+
+    The state sits next to the predictions rather than the results, since leagues may share one results file.
+    """
+    predictions_path = os.path.normpath(predictions_path)
+    return os.path.join(os.path.dirname(predictions_path), ".scoring_state", os.path.basename(predictions_path))
+
+def scoring_state(cache, results_path, predictions_path):
+    results_file = os.path.join(results_path, "Results.csv")
+    # The gamble files' fingerprint stands in for the picks, so an unchanged folder is not re-hashed pick by pick
+    return cache.get("scoring_state", [results_file, predictions_path], lambda: IncrementalScoring.updated_state(
+        load_results(cache, results_path), load_predictions(cache, predictions_path), scoring_state_path(results_path, predictions_path),
+        hashlib.sha1(repr(cache.fingerprint(predictions_path)).encode()).hexdigest()))
+
+def calculate_scores(cache, results_path, predictions_path):
+    results_file = os.path.join(results_path, "Results.csv")
+    return cache.get("calculate_scores", [results_file, predictions_path], lambda: IncrementalScoring.state_scores(
+        scoring_state(cache, results_path, predictions_path)))
+
+def as_of_index(cache, results_path, predictions_path, schedule_path):
+    """Leaderboard after every completed match, for looking the table up as of a match or date without rescoring."""
+    results_file = os.path.join(results_path, "Results.csv")
+    return cache.get("as_of_index", [results_file, predictions_path, schedule_path], lambda: AsOfIndex.build_index(
+        calculate_scores(cache, results_path, predictions_path)[1], scoring_state(cache, results_path, predictions_path),
+        load_schedule(cache, schedule_path)))
+
+def what_if_scorer(cache, results_path, predictions_path):
+    """Overlay scorer for hypothetical results, sharing the cached scoring state and standings."""
+    results_file = os.path.join(results_path, "Results.csv")
+    return cache.get("what_if_scorer", [results_file, predictions_path], lambda: WhatIf.OverlayScorer(
+        load_results(cache, results_path), load_predictions(cache, predictions_path),
+        scoring_state(cache, results_path, predictions_path), standings(cache, results_path)))
+
+def fixture_points(cache, results_path, predictions_path):
+    """Banked points and the points every participant stands to earn on each unplayed fixture, for the leverage tables."""
+    results_file = os.path.join(results_path, "Results.csv")
+    return cache.get("fixture_points", [results_file, predictions_path], lambda: Leverage.fixture_points(
+        load_results(cache, results_path), load_predictions(cache, predictions_path),
+        calculate_scores(cache, results_path, predictions_path)[0], standings(cache, results_path)))
+
+def matchwise_predictions(cache, schedule_path, predictions_path):
+    return cache.get("matchwise_predictions", [schedule_path, predictions_path], lambda: ExtractAndTransform.matchwise_predictions(
+        load_schedule(cache, schedule_path), load_prediction_store(cache, predictions_path, schedule_path)))
+
+def get_prediction_ratios(cache, schedule_path, predictions_path):
+    return cache.get("get_prediction_ratios", [schedule_path, predictions_path], lambda: Analysis.get_prediction_ratios(
+        matchwise_predictions(cache, schedule_path, predictions_path).copy()))
+
+def home_away_percentage(cache, schedule_path, predictions_path):
+    return cache.get("home_away_percentage", [schedule_path, predictions_path], lambda: Analysis.home_away_percentage(
+        load_schedule(cache, schedule_path), load_prediction_store(cache, predictions_path, schedule_path)))
+
+def prediction_agreement(cache, schedule_path, predictions_path):
+    return cache.get("prediction_agreement", [schedule_path, predictions_path], lambda: Similarity.agreement_matrix(
+        load_prediction_store(cache, predictions_path, schedule_path)))
+
+def season_snapshot(cache, results_path, predictions_path, schedule_path):
+    """Columnar snapshot of the scored season, reopened without recomputing when no input file's content changed."""
+    results_file = os.path.join(results_path, "Results.csv")
+    return cache.get("season_snapshot", [results_file, predictions_path, schedule_path], lambda: Snapshot.load_snapshot(
+        results_path, predictions_path, schedule_path, lambda: Snapshot.build_tables(
+            calculate_scores(cache, results_path, predictions_path), matchwise_predictions(cache, schedule_path, predictions_path))))
@@ -1,7 +1,10 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import os
 from collections import Counter
+import ScoringEngine
+import Ingestion
 
 def load_results(results_path):
     """Load the actual match results."""
@@ -11,46 +14,48 @@ def load_results(results_path):
 
 def load_predictions(predictions_path):
     """Load all participant predictions."""
-    predictions = {}
-    for filename in os.listdir(predictions_path):
-        if filename.endswith(".txt"):
-            participant = filename.replace(".txt", "")
-            with open(os.path.join(predictions_path, filename), "r") as file:
-                predictions[participant] = [line.strip() for line in file.readlines()]
-    return predictions
+    return {gamble.participant: gamble.picks for gamble in Ingestion.read_gambles(predictions_path)}
+
+
+def prediction_sides(schedule_df, predictions):
+    """Participants x scheduled matches matrix: 0 for a home pick, 1 for an away pick, -1 for anything else."""
+    home_teams = schedule_df.iloc[:, 2].to_numpy()
+    away_teams = schedule_df.iloc[:, 3].to_numpy()
+    match_columns = schedule_df.iloc[:, 0].to_numpy() - 1  # Adjusting index to ensure correct mapping
+    team_index = ScoringEngine.build_team_index(home_teams, away_teams)
+    num_matches = int(match_columns.max()) + 1 if len(match_columns) else 0
+    participants, pick_codes = ScoringEngine.encode_predictions(predictions, team_index, num_matches)
+    pick_codes = pick_codes[:, match_columns]
+    sides = np.full(pick_codes.shape, -1, dtype=np.int8)
+    sides[pick_codes == ScoringEngine.encode_winners(home_teams, team_index)] = 0
+    sides[pick_codes == ScoringEngine.encode_winners(away_teams, team_index)] = 1
+    return participants, sides
 
 
 def matchwise_predictions(schedule_df, predictions):
     """Generate a matchwise prediction table."""
-    matchwise_data = []
-    
-    for i, row in schedule_df.iterrows():
-        match_number = row.iloc[0]  # Ensuring we start from the first match
-        home_team = row.iloc[2]
-        away_team = row.iloc[3]
-        home_predictors = []
-        away_predictors = []
-        
-        for participant, predicted_winners in predictions.items():
-            if match_number - 1 < len(predicted_winners):  # Adjusting index to ensure correct mapping
-                if predicted_winners[match_number - 1] == home_team:
-                    home_predictors.append(participant)
-                elif predicted_winners[match_number - 1] == away_team:
-                    away_predictors.append(participant)
-        
-        matchwise_data.append({
-            "Date": row.iloc[1],
-            "Home Team": home_team,
-            "Home Predictors": ", ".join(home_predictors),
-            "Away Team": away_team,
-            "Away Predictors": ", ".join(away_predictors)
-        })
-    
-    return pd.DataFrame(matchwise_data)
+    participants, sides = prediction_sides(schedule_df, predictions)
+    home_predictors = sides == 0
+    away_predictors = sides == 1
+    participants = np.array(participants, dtype=object)
+    return pd.DataFrame({
+        "Date": schedule_df.iloc[:, 1].to_numpy(),
+        "Home Team": schedule_df.iloc[:, 2].to_numpy(),
+        "Home Predictors": [", ".join(participants[home_predictors[:, i]]) for i in range(len(schedule_df))],
+        "Away Team": schedule_df.iloc[:, 3].to_numpy(),
+        "Away Predictors": [", ".join(participants[away_predictors[:, i]]) for i in range(len(schedule_df))],
+        "Home Count": home_predictors.sum(axis=0),
+        "Away Count": away_predictors.sum(axis=0),
+    })
 
 
 def calculate_scores(results_df, predictions):
     """Calculate leaderboard scores, accuracy, matchwise points, total predicted points, and bonus points."""
+    return ScoringEngine.calculate_scores(results_df, predictions)
+
+
+def calculate_scores_iterrows(results_df, predictions):
+    """Row-by-row reference implementation of calculate_scores, kept for parity checks."""
     leaderboard = []
     completed_matches = results_df.dropna(subset=["Winner"]) 
     total_matches = len(completed_matches)
@@ -122,8 +127,15 @@ def calculate_scores(results_df, predictions):
     return pd.DataFrame(leaderboard).sort_values(by="Points", ascending=False), points_progression
 
 
+def check_scores_parity(results_df, predictions):
+    """Compare calculate_scores against the row-by-row reference, returning the mismatching columns."""
+    return ScoringEngine.compare_scores(calculate_scores(results_df, predictions), calculate_scores_iterrows(results_df, predictions))
+
+
 def get_participant_wise_team_predictions(predictions):
     """Get all team predictions by participants, sorted in descending order of team wins."""
+    if not isinstance(predictions, dict):
+        return participant_wise_team_predictions_from_store(predictions)
     rows = []
     
     for participant, predicted_winners in predictions.items():
@@ -137,6 +149,17 @@ def get_participant_wise_team_predictions(predictions):
     
     return top_fours_df
 
+def participant_wise_team_predictions_from_store(store):
+    """get_participant_wise_team_predictions for a PredictionStore, counting picks per team code."""
+    counts = store.team_counts()
+    rows = []
+    for p, participant in enumerate(store.participants):
+        for code in np.argsort(-counts[p], kind="stable"):
+            if counts[p, code] == 0:
+                break
+            rows.append((participant, store.teams[code], int(counts[p, code])))
+    return pd.DataFrame(rows, columns=["Participant", "Team", "Wins"])
+
 def format_outcomes(results_df):
         total_known_results = len(results_df["Winner"].dropna())
         number_of_outcomes = 2 ** (len(results_df) - total_known_results)
@@ -0,0 +1,318 @@
+import os
+import glob
+import hashlib
+import shutil
+import tempfile
+import uuid
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+import ScoringEngine
+
+try:
+    import fcntl
+except ImportError:  # no advisory locks (Windows): concurrent updates of one state are not serialized
+    fcntl = None
+
+STATE_VERSION = 2
+MATRIX_FIELDS = ["points", "correct", "cumulative"]      # matches x participants, preallocated to the schedule
+MATCH_FIELDS = ["match_index", "row_hashes", "no_result"]  # one entry per match, preallocated alike
+RUNNING_FIELDS = ["scores", "correct_predictions", "predicted_points", "bonus_points",
+                  "current_winning", "current_losing", "longest_winning", "winning_end", "longest_losing", "losing_end"]
+
+def row_hashes(completed_matches):
+    """Fingerprint of every completed results row, used to spot corrections to earlier matches."""
+    return pd.util.hash_pandas_object(completed_matches, index=True).to_numpy()
+
+def predictions_hash(predictions):
+    digest = hashlib.sha1()
+    for participant, predicted_winners in predictions.items():
+        digest.update(participant.encode())
+        digest.update("\x00".join(predicted_winners).encode())
+        digest.update(b"\x01")
+    return digest.hexdigest()
+
+def num_matches(state):
+    return len(state["dates"])
+
+def participant_matrices(state):
+    """(points, correct, cumulative) of the completed matches, as participants x matches views."""
+    filled = num_matches(state)
+    return tuple(state[field][:filled].T for field in MATRIX_FIELDS)
+
+def empty_state(predictions, bonus_dtype, capacity=0, predictions_key=None):
+    participants = list(predictions.keys())
+    num_participants = len(participants)
+    points_dtype = np.result_type(bonus_dtype, np.int64)
+    state = {
+        "version": STATE_VERSION,
+        "participants": participants,
+        "predictions_key": predictions_key or predictions_hash(predictions),
+        "generation": None,
+        "dates": [],
+        "match_index": np.zeros(capacity, dtype=np.int64),
+        "row_hashes": np.zeros(capacity, dtype=np.uint64),
+        "no_result": np.zeros(capacity, dtype=bool),
+        "points": np.zeros((capacity, num_participants), dtype=points_dtype),
+        "correct": np.zeros((capacity, num_participants), dtype=bool),
+        "cumulative": np.zeros((capacity, num_participants), dtype=points_dtype),
+    }
+    for field in RUNNING_FIELDS:
+        state[field] = np.zeros(num_participants, dtype=points_dtype if field in ("scores", "bonus_points") else np.int64)
+    state["winning_end"] -= 1
+    state["losing_end"] -= 1
+    return state
+
+def reserve(state, capacity):
+    """Make room for `capacity` matches, at least doubling the preallocated rows when they run out."""
+    allocated = len(state["match_index"])
+    if capacity <= allocated:
+        return
+    capacity = max(capacity, 2 * allocated)
+    filled = num_matches(state)
+    for field in MATRIX_FIELDS + MATCH_FIELDS:
+        grown = np.zeros((capacity,) + state[field].shape[1:], dtype=state[field].dtype)
+        grown[:filled] = state[field][:filled]
+        state[field] = grown
+    state["generation"] = None  # the matrices no longer live in the saved files
+
+def fold_match(state, label, date, row_digest, correct, no_result, points):
+    """Apply one scored match to the running state; O(participants).
+
+    The match is written into the next preallocated row in place, so rows past the state's own count
+    may be shared with states it was copied from (see WhatIf.copy_state) but never rows below it.
+    """
+    position = num_matches(state)
+    reserve(state, position + 1)
+    state["scores"] = state["scores"] + points
+    state["points"][position] = points
+    state["correct"][position] = correct
+    state["cumulative"][position] = state["scores"]
+    state["no_result"][position] = no_result
+    state["match_index"][position] = label
+    state["row_hashes"][position] = np.uint64(row_digest)
+    state["dates"].append(date)
+    if no_result:
+        return
+    state["correct_predictions"] += correct
+    if label < ScoringEngine.LEAGUE_MATCHES:
+        state["predicted_points"] += 10 * correct
+        state["bonus_points"] = state["bonus_points"] + np.where(correct, points - 10, 0)
+    state["current_winning"] = np.where(correct, state["current_winning"] + 1, 0)
+    state["current_losing"] = np.where(correct, 0, state["current_losing"] + 1)
+    new_winning = correct & (state["current_winning"] >= state["longest_winning"])
+    new_losing = ~correct & (state["current_losing"] >= state["longest_losing"])
+    state["longest_winning"] = np.where(new_winning, state["current_winning"], state["longest_winning"])
+    state["winning_end"] = np.where(new_winning, position, state["winning_end"])
+    state["longest_losing"] = np.where(new_losing, state["current_losing"], state["longest_losing"])
+    state["losing_end"] = np.where(new_losing, position, state["losing_end"])
+
+def score_matches(predictions, labels, winners, bonus_points):
+    """Correct-pick mask and points of every participant on a block of completed matches, matches x participants.
+
+    Only the slice of each participant's picks that the block spans is read and encoded.
+    """
+    labels = np.asarray(labels, dtype=int)
+    winners = np.asarray(winners, dtype=object)
+    no_result = winners == "NR"
+    if len(labels) == 0:
+        empty = np.zeros((0, len(predictions)), dtype=bool)
+        return empty, no_result, empty.astype(int)
+    start, stop = labels.min(), labels.max() + 1
+    windows = [predicted_winners[start:stop] for predicted_winners in predictions.values()]
+    lengths = np.array([len(window) for window in windows], dtype=int)
+    teams = pd.Index(sorted(set(winners[~no_result])))
+    pick_codes = np.full((len(windows), stop - start), ScoringEngine.MISSING, dtype=np.int16)
+    pick_codes[np.arange(stop - start) < lengths[:, None]] = teams.get_indexer([team for window in windows for team in window])
+    winner_codes = np.where(no_result, ScoringEngine.NO_RESULT, teams.get_indexer(np.where(no_result, "", winners)))
+    correct = (pick_codes[:, labels - start].T == winner_codes[:, None]) & ~no_result[:, None]
+    bonus_points = np.asarray(bonus_points)[:, None]
+    return correct, no_result, np.where(no_result[:, None], 5, np.where(correct, 10 + bonus_points, 0))
+
+def trailing_runs(mask):
+    """Length of the run of True that each row ends with."""
+    if mask.shape[1] == 0:
+        return np.zeros(mask.shape[0], dtype=np.int64)
+    return np.where(mask.all(axis=1), mask.shape[1], np.argmax(~mask[:, ::-1], axis=1))
+
+def restore_running(state):
+    """Recompute the running totals and streaks from the stored matrices, as folding them would leave them."""
+    points, correct, cumulative = participant_matrices(state)
+    filled = num_matches(state)
+    decided = ~state["no_result"][:filled]
+    league = decided & (state["match_index"][:filled] < ScoringEngine.LEAGUE_MATCHES)
+    state["scores"] = cumulative[:, -1].copy() if filled else np.zeros_like(state["scores"])
+    state["correct_predictions"] = correct.sum(axis=1).astype(np.int64)
+    state["predicted_points"] = 10 * correct[:, league].sum(axis=1).astype(np.int64)
+    state["bonus_points"] = np.where(correct[:, league], points[:, league] - 10, 0).sum(axis=1).astype(state["scores"].dtype)
+    decided_positions = np.flatnonzero(decided)
+    for name, mask in [("winning", correct[:, decided]), ("losing", ~correct[:, decided])]:
+        longest, run_end = ScoringEngine.longest_runs(mask)
+        state[f"current_{name}"] = trailing_runs(mask).astype(np.int64)
+        state[f"longest_{name}"] = longest.astype(np.int64)
+        state[f"{name}_end"] = np.where(longest > 0, decided_positions[run_end] if len(decided_positions) else -1, -1).astype(np.int64)
+
+def rewind(state, predictions, kept, bonus_dtype, capacity):
+    """The state as it was after its first `kept` completed matches, sliced from the stored matrices."""
+    rewound = empty_state(predictions, bonus_dtype, max(capacity, kept), state["predictions_key"])
+    for field in MATRIX_FIELDS + MATCH_FIELDS:
+        rewound[field][:kept] = state[field][:kept]
+    rewound["dates"] = list(state["dates"][:kept])
+    restore_running(rewound)
+    return rewound
+
+def update_state(results_df, predictions, state, predictions_key=None):
+    """Bring a scoring state up to date with the results table.
+
+    Newly appended rows are scored together and folded in one at a time, each written into its
+    preallocated row. If an earlier row was edited (a corrected winner or bonus) the state is cut back to
+    just before that match and only the matches from there on are rescored; a change to the predictions,
+    spotted through `predictions_key` (a fingerprint of their files; by default a hash of every pick),
+    starts from scratch.
+    """
+    completed_matches = results_df.dropna(subset=["Winner"])
+    bonus_dtype = completed_matches["Bonus Points"].dtype if "Bonus Points" in completed_matches.columns else np.int64
+    predictions_key = predictions_key or predictions_hash(predictions)
+    if state is None or state["participants"] != list(predictions.keys()) or state["predictions_key"] != predictions_key:
+        state = empty_state(predictions, bonus_dtype, len(results_df), predictions_key)
+
+    row_digests = row_hashes(completed_matches)
+    stored_digests = state["row_hashes"][:min(num_matches(state), len(row_digests))]
+    changed = np.flatnonzero(stored_digests != row_digests[:len(stored_digests)])
+    unchanged = int(changed[0]) if len(changed) else len(stored_digests)
+    if unchanged < num_matches(state) or state["points"].dtype != np.result_type(bonus_dtype, np.int64):
+        state = rewind(state, predictions, unchanged, bonus_dtype, len(results_df))
+    reserve(state, len(completed_matches))
+
+    new_matches = completed_matches.iloc[unchanged:]
+    bonus_points = new_matches["Bonus Points"].to_numpy() if "Bonus Points" in new_matches.columns else np.zeros(len(new_matches), dtype=int)
+    correct, no_result, points = score_matches(predictions, new_matches.index, new_matches["Winner"].to_numpy(), bonus_points)
+    for offset, (label, date) in enumerate(zip(new_matches.index, new_matches["Date"])):
+        fold_match(state, label, date, row_digests[unchanged + offset], correct[offset], bool(no_result[offset]),
+                   points[offset].astype(state["points"].dtype))
+    return state
+
+def state_scores(state):
+    """The (leaderboard_df, points_progression) pair calculate_scores would return for this state."""
+    points, correct, cumulative = participant_matrices(state)
+    completed = np.arange(num_matches(state))
+    totals = {
+        "Points": state["scores"],
+        "Predicted Points": state["predicted_points"],
+        "Bonus Points": state["bonus_points"],
+        "Longest Winning Streak": state["longest_winning"],
+        "Longest Losing Streak": state["longest_losing"],
+        "Winning Period": ScoringEngine.streak_periods(state["longest_winning"], state["winning_end"], completed, state["dates"]),
+        "Losing Period": ScoringEngine.streak_periods(state["longest_losing"], state["losing_end"], completed, state["dates"]),
+        "Correct Predictions": state["correct_predictions"],
+    }
+    return ScoringEngine.build_leaderboard(state["participants"], points, correct, state["no_result"][:len(completed)],
+                                          cumulative, totals)
+
+@contextmanager
+def locked(state_path):
+    """Hold the state's lock file, so processes and threads update one state one at a time."""
+    os.makedirs(state_path, exist_ok=True)
+    with open(os.path.join(state_path, "lock"), "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        yield
+
+def matrix_file(state_path, field, generation):
+    return os.path.join(state_path, f"{field}-{generation}.npy")
+
+def load_state(state_path):
+    """The saved state, with its matrices memory-mapped for writing so appended matches go straight to disk.
+
+    `state_path` is a directory: `meta.npz` holds everything but the matrices, which sit in one .npy file
+    each, named after the generation that wrote them.
+    """
+    meta_path = os.path.join(state_path, "meta.npz")
+    if not os.path.exists(meta_path):
+        return None
+    with np.load(meta_path, allow_pickle=False) as data:
+        if int(data["version"]) != STATE_VERSION:
+            return None
+        state = {key: data[key] for key in data.files}
+    for key in ("participants", "dates"):
+        state[key] = state[key].tolist()
+    state["predictions_key"] = str(state["predictions_key"])
+    state["generation"] = str(state["generation"])
+    try:
+        for field in MATRIX_FIELDS:
+            state[field] = np.load(matrix_file(state_path, field, state["generation"]), mmap_mode="r+")
+    except (OSError, ValueError):
+        return None
+    capacity = len(state["points"])
+    for field in MATCH_FIELDS:
+        padded = np.zeros(capacity, dtype=state[field].dtype)
+        padded[:len(state[field])] = state[field]
+        state[field] = padded
+    return state
+
+def write_atomically(path, write):
+    """Write a file through a uniquely named temporary file in the same folder, then move it into place.
+
+    A file that is replaced keeps its permissions (the temporary file is created private to its owner).
+    """
+    descriptor, temporary_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".", suffix=".tmp")
+    os.close(descriptor)
+    try:
+        write(temporary_path)
+        if os.path.exists(path):
+            shutil.copymode(path, temporary_path)
+        os.replace(temporary_path, path)
+    except BaseException:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        raise
+
+def save_state(state, state_path):
+    """Save what changed: appended rows are already in the mapped matrices, so only the metadata is rewritten.
+
+    A state whose matrices are not the saved ones (new, rewound or grown) is written as a new generation
+    of matrix files before the metadata that points at it, and the older generations are removed; a
+    reader holding the previous metadata keeps its own files mapped.
+    """
+    os.makedirs(state_path, exist_ok=True)
+    if state["generation"] is None:
+        generation = uuid.uuid4().hex[:12]
+        for field in MATRIX_FIELDS:
+            def write_matrix(temporary_path, values=state[field]):
+                with open(temporary_path, "wb") as f:
+                    np.save(f, values)
+            write_atomically(matrix_file(state_path, field, generation), write_matrix)
+        state["generation"] = generation
+    else:
+        for field in MATRIX_FIELDS:
+            if isinstance(state[field], np.memmap):
+                state[field].flush()
+    filled = num_matches(state)
+    arrays = {key: np.asarray(value) for key, value in state.items() if key not in MATRIX_FIELDS + MATCH_FIELDS}
+    arrays.update({field: state[field][:filled] for field in MATCH_FIELDS})
+    def write_meta(temporary_path):
+        with open(temporary_path, "wb") as f:
+            np.savez(f, **arrays)
+    write_atomically(os.path.join(state_path, "meta.npz"), write_meta)
+    for path in glob.glob(os.path.join(glob.escape(state_path), "*-*.npy")):
+        if not path.endswith(f"-{state['generation']}.npy"):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+def updated_state(results_df, predictions, state_path, predictions_key=None):
+    """The state stored in `state_path`, brought up to date with the results and saved back."""
+    with locked(state_path):
+        state = update_state(results_df, predictions, load_state(state_path), predictions_key)
+        save_state(state, state_path)
+    return state
+
+def update_scores(results_df, predictions, state_path, predictions_key=None):
+    """Incremental drop-in for calculate_scores that keeps its scoring state in `state_path` between runs."""
+    return state_scores(updated_state(results_df, predictions, state_path, predictions_key))
+
+def check_consistency(results_df, predictions, state_path):
+    """Compare the incremental leaderboard against a full recompute, returning the mismatching columns."""
+    return ScoringEngine.compare_scores(update_scores(results_df, predictions, state_path),
+                                        ScoringEngine.calculate_scores(results_df, predictions))
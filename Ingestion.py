@@ -0,0 +1,73 @@
+import os
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+
+Issue = namedtuple("Issue", ["participant", "match", "problem", "pick", "expected"])
+Gamble = namedtuple("Gamble", ["participant", "source", "picks", "issues"])
+
+ISSUE_COLUMNS = ["Participant", "Match", "Problem", "Pick", "Expected"]
+
+def file_source(entry):
+    """The [name, modification time, size] identity a gamble file is re-read on."""
+    stat = entry.stat()
+    return [entry.name, stat.st_mtime_ns, stat.st_size]
+
+def gamble_entries(predictions_path):
+    return [entry for entry in os.scandir(predictions_path) if entry.name.endswith(".txt")]
+
+def read_picks(path):
+    """The stripped lines of one gamble file, streamed rather than read whole."""
+    with open(path, "r") as file:
+        return [line.strip() for line in file]
+
+def check_picks(participant, picks, home_teams, away_teams):
+    """Every way a gamble deviates from the schedule: blank or unknown picks, teams not playing, wrong length."""
+    teams = set(home_teams) | set(away_teams)
+    issues = []
+    for match, (pick, home_team, away_team) in enumerate(zip(picks, home_teams, away_teams), start=1):
+        if pick == home_team or pick == away_team:
+            continue
+        if not pick:
+            problem = "missing pick"
+        elif pick in teams:
+            problem = "team not playing"
+        else:
+            problem = "unknown team"
+        issues.append(Issue(participant, match, problem, pick, f"{home_team} or {away_team}"))
+    if len(picks) != len(home_teams):
+        problem = "too few picks" if len(picks) < len(home_teams) else "too many picks"
+        issues.append(Issue(participant, None, problem, f"{len(picks)} lines", f"{len(home_teams)} lines"))
+    return issues
+
+def read_gamble(entry, home_teams=None, away_teams=None):
+    participant = entry.name[:-len(".txt")]
+    source = file_source(entry)
+    try:
+        picks = read_picks(entry.path)
+    except (OSError, UnicodeDecodeError) as error:
+        return Gamble(participant, source, [], [Issue(participant, None, "unreadable file", str(error), "")])
+    issues = check_picks(participant, picks, home_teams, away_teams) if home_teams is not None else []
+    return Gamble(participant, source, picks, issues)
+
+def read_gambles(predictions_path, home_teams=None, away_teams=None, previous=None, workers=None, chunk_size=256):
+    """Every gamble file in a directory, read and validated on a thread pool, in directory order.
+
+    Files are handed to the pool `chunk_size` at a time: they are small, so one task per file costs more in
+    scheduling than it saves while waiting on disk. `previous` maps file names to Gambles from an earlier
+    read; any file whose name, modification time and size are unchanged is taken from there instead of
+    being read again, so one edited file costs one read.
+    """
+    previous = previous or {}
+    entries = gamble_entries(predictions_path)
+    stale = [entry for entry in entries
+             if entry.name not in previous or previous[entry.name].source != file_source(entry)]
+    chunks = [stale[start:start + chunk_size] for start in range(0, len(stale), chunk_size)]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        fresh = {gamble.source[0]: gamble for gambles in executor.map(
+            lambda chunk: [read_gamble(entry, home_teams, away_teams) for entry in chunk], chunks) for gamble in gambles}
+    return [fresh.get(entry.name) or previous[entry.name] for entry in entries]
+
+def issue_report(issues):
+    """One row per problem found in the gambles, for display or export."""
+    return pd.DataFrame(list(issues), columns=ISSUE_COLUMNS).astype({"Match": "Int64"})
@@ -0,0 +1,151 @@
+import contextlib
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+import tracemalloc
+import pandas as pd
+
+_local = threading.local()
+_instrumented = set()
+_NULL_STAGE = contextlib.nullcontext()
+
+class Recorder:
+    """Wall time, call counts and (optionally) peak allocation of every stage entered on one thread.
+
+    Stages nest; each event keeps its depth and the time spent in child stages so the summary can
+    report self time next to inclusive time. Peak allocation is the high-water mark of traced memory
+    above what was allocated when the stage was entered, children included.
+    """
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.origin = time.perf_counter()
+        self.events = []
+        self.stack = []
+
+    def enter(self, name):
+        frame = {"name": name, "start": time.perf_counter(), "children": 0.0}
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if self.stack:
+                self.stack[-1]["peak"] = max(self.stack[-1]["peak"], peak)
+            tracemalloc.reset_peak()
+            frame["base"] = frame["peak"] = current
+        self.stack.append(frame)
+
+    def exit(self):
+        frame = self.stack.pop()
+        duration = time.perf_counter() - frame["start"]
+        event = {"name": frame["name"], "start": frame["start"] - self.origin, "duration": duration,
+                 "self": duration - frame["children"], "depth": len(self.stack), "peak_bytes": None}
+        if self.trace_memory:
+            frame["peak"] = max(frame["peak"], tracemalloc.get_traced_memory()[1])
+            event["peak_bytes"] = frame["peak"] - frame["base"]
+        if self.stack:
+            self.stack[-1]["children"] += duration
+            if self.trace_memory:
+                self.stack[-1]["peak"] = max(self.stack[-1]["peak"], frame["peak"])
+        self.events.append(event)
+
+    @contextlib.contextmanager
+    def span(self, name):
+        self.enter(name)
+        try:
+            yield
+        finally:
+            self.exit()
+
+    def summary(self):
+        """One row per stage, slowest first."""
+        columns = ["Stage", "Calls", "Total (ms)", "Self (ms)", "Mean (ms)", "Max (ms)", "Peak Alloc (KiB)"]
+        if not self.events:
+            return pd.DataFrame(columns=columns)
+        events_df = pd.DataFrame(self.events)
+        grouped = events_df.groupby("name", sort=False)
+        summary_df = pd.DataFrame({
+            "Stage": list(grouped.groups),
+            "Calls": grouped.size().to_numpy(),
+            "Total (ms)": grouped["duration"].sum().to_numpy() * 1000,
+            "Self (ms)": grouped["self"].sum().to_numpy() * 1000,
+            "Mean (ms)": grouped["duration"].mean().to_numpy() * 1000,
+            "Max (ms)": grouped["duration"].max().to_numpy() * 1000,
+            "Peak Alloc (KiB)": grouped["peak_bytes"].max().to_numpy(dtype=float) / 1024 if self.trace_memory else float("nan"),
+        })
+        return summary_df.sort_values("Total (ms)", ascending=False).reset_index(drop=True)
+
+    def to_json(self):
+        return json.dumps({"trace_memory": self.trace_memory, "events": self.events}, indent=2)
+
+    def to_chrome_trace(self):
+        """The events as Chrome trace "complete" events, loadable in chrome://tracing or Perfetto."""
+        pid, tid = os.getpid(), threading.get_ident()
+        trace_events = []
+        for event in sorted(self.events, key=lambda event: (event["start"], event["depth"])):
+            args = {"self_ms": round(event["self"] * 1000, 3)}
+            if event["peak_bytes"] is not None:
+                args["peak_kib"] = round(event["peak_bytes"] / 1024, 1)
+            trace_events.append({"name": event["name"], "ph": "X", "pid": pid, "tid": tid,
+                                 "ts": event["start"] * 1e6, "dur": event["duration"] * 1e6, "args": args})
+        return json.dumps({"traceEvents": trace_events, "displayTimeUnit": "ms"})
+
+
+def current():
+    """The recorder of the calling thread, or None when nothing is being recorded."""
+    return getattr(_local, "recorder", None)
+
+def stage(name):
+    """Context manager timing a block as `name`; a shared no-op when the thread is not recording."""
+    recorder = getattr(_local, "recorder", None)
+    if recorder is None:
+        return _NULL_STAGE
+    return recorder.span(name)
+
+def timed(function, name=None):
+    """Wrap `function` so its calls are recorded as a stage while the calling thread is recording."""
+    name = name or f"{function.__module__}.{function.__qualname__}"
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        recorder = getattr(_local, "recorder", None)
+        if recorder is None:
+            return function(*args, **kwargs)
+        recorder.enter(name)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            recorder.exit()
+    wrapper.__wrapped_by_instrumentation__ = True
+    return wrapper
+
+def instrument(*modules):
+    """Replace the functions defined in each module with `timed` wrappers.
+
+    Modules are only patched the first time profiling is switched on, so a process that never profiles
+    pays nothing; afterwards an idle wrapper costs one thread-local lookup per call.
+    """
+    for module in modules:
+        if module.__name__ in _instrumented:
+            continue
+        for attribute, value in list(vars(module).items()):
+            if inspect.isfunction(value) and value.__module__ == module.__name__ and not hasattr(value, "__wrapped_by_instrumentation__"):
+                setattr(module, attribute, timed(value))
+        _instrumented.add(module.__name__)
+
+@contextlib.contextmanager
+def recording(trace_memory=False):
+    """Record every stage entered on this thread until the block exits; yields the Recorder."""
+    recorder = Recorder(trace_memory)
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    previous = current()
+    _local.recorder = recorder
+    try:
+        yield recorder
+    finally:
+        _local.recorder = previous
+        if started_tracing:
+            tracemalloc.stop()
@@ -0,0 +1,142 @@
+import glob
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+import ExtractAndTransform
+import Standings
+
+DATA_FOLDERS = {"The Gambles", "The Calculated Gambles", "The Schedule", "The Results", "The Visuals"}
+
+League = namedtuple("League", ["name", "base_path", "schedule_path", "results_path", "predictions_path", "old_predictions_path"])
+
+def find_season_file(league_path, root_path, folder, pattern):
+    """Nearest `folder/pattern` at or above the league directory, without leaving the registry root."""
+    path = os.path.abspath(league_path)
+    root_path = os.path.abspath(root_path)
+    while True:
+        matches = sorted(glob.glob(os.path.join(path, folder, pattern)))
+        if matches:
+            return matches[-1]
+        if path == root_path or os.path.dirname(path) == path:
+            return None
+        path = os.path.dirname(path)
+
+def league_at(league_path, root_path):
+    """The League stored in `league_path`, or None if it lacks gambles, a schedule or results."""
+    calculated_path = os.path.join(league_path, "The Calculated Gambles")
+    gambles_path = os.path.join(league_path, "The Gambles")
+    has_calculated, has_gambles = os.path.isdir(calculated_path), os.path.isdir(gambles_path)
+    if not (has_calculated or has_gambles):
+        return None
+    schedule_path = find_season_file(league_path, root_path, "The Schedule", "*.csv")
+    results_file = find_season_file(league_path, root_path, "The Results", "Results.csv")
+    if schedule_path is None or results_file is None:
+        return None
+    name = os.path.relpath(league_path, root_path)
+    name = os.path.basename(os.path.abspath(league_path)) if name == "." else name
+    return League(name, league_path, schedule_path, os.path.dirname(results_file),
+                  calculated_path if has_calculated else gambles_path,
+                  gambles_path if has_calculated and has_gambles else None)
+
+def discover_leagues(root_paths):
+    """Every league directory under the roots: one holding `The Gambles` and/or `The Calculated Gambles`.
+
+    A league uses the nearest `The Schedule` and `The Results` at or above it, so pools that play the
+    same season keep their gambles in sub-directories of a folder holding that season's files once.
+    """
+    leagues = {}
+    for root_path in root_paths:
+        for directory, subdirectories, _ in os.walk(root_path):
+            league = league_at(directory, root_path)
+            if league is not None:
+                leagues[league.name] = league
+            # The data folders themselves and hidden caches never contain further leagues
+            subdirectories[:] = sorted(subdirectory for subdirectory in subdirectories
+                                       if subdirectory not in DATA_FOLDERS and not subdirectory.startswith((".", "__")))
+    return dict(sorted(leagues.items()))
+
+def summarize_league(league, leaderboard_df, results_df):
+    points = leaderboard_df["Points"]
+    leaders = leaderboard_df.loc[points == points.max(), "Participant"].tolist() if len(points) else []
+    runner_up = points[points < points.max()].max() if len(points) else None
+    return {
+        "League": league.name,
+        "Season": os.path.basename(league.schedule_path),
+        "Participants": len(leaderboard_df),
+        "Matches Played": int(results_df["Winner"].notna().sum()),
+        "Leader": ", ".join(leaders),
+        "Top Points": points.max() if len(points) else 0,
+        "Lead": points.max() - runner_up if pd.notna(runner_up) else 0,
+    }
+
+def score_season(results_path, leagues):
+    """Score leagues that share one season, parsing its results once; returns (summary rows, errors)."""
+    results_df = Standings.fill_bonus_points(ExtractAndTransform.load_results(results_path))
+    rows, errors = [], []
+    for league in leagues:
+        try:
+            predictions = ExtractAndTransform.load_predictions(league.predictions_path)
+            leaderboard_df, _ = ExtractAndTransform.calculate_scores(results_df, predictions)
+            rows.append(summarize_league(league, leaderboard_df, results_df))
+        except Exception as error:
+            errors.append((league.name, str(error)))
+    return rows, errors
+
+def score_leagues(leagues, workers=None, chunk_size=16):
+    """Summary table of every league, scored across a process pool of `workers`.
+
+    Leagues are grouped by their results file and split into chunks of `chunk_size`; each task parses its
+    season once and only sends back a summary row per league, so the caller never holds every league's
+    predictions or progression in memory. Leagues that fail to score are listed in the returned errors.
+    """
+    seasons = {}
+    for league in leagues:
+        seasons.setdefault(league.results_path, []).append(league)
+    tasks = [(results_path, season_leagues[i:i + chunk_size])
+             for results_path, season_leagues in seasons.items()
+             for i in range(0, len(season_leagues), chunk_size)]
+    rows, errors = [], []
+    if workers and workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for task_rows, task_errors in executor.map(score_season, *zip(*tasks)):
+                rows += task_rows
+                errors += task_errors
+    else:
+        for task in tasks:
+            task_rows, task_errors = score_season(*task)
+            rows += task_rows
+            errors += task_errors
+    summary_df = pd.DataFrame(rows, columns=["League", "Season", "Participants", "Matches Played", "Leader", "Top Points", "Lead"])
+    return summary_df.sort_values("League").reset_index(drop=True), errors
+
+
+class LeagueRegistry:
+    """The leagues found under a set of root directories, rediscovered on demand.
+
+    Only paths are held here; a league's data is loaded when it is selected or scored.
+    """
+
+    def __init__(self, root_paths):
+        self.root_paths = [os.path.abspath(root_path) for root_path in root_paths]
+        self.leagues = {}
+        self.refresh()
+
+    def refresh(self):
+        self.leagues = discover_leagues(self.root_paths)
+        return self.leagues
+
+    def names(self):
+        return list(self.leagues)
+
+    def get(self, name):
+        return self.leagues[name]
+
+    def input_paths(self):
+        """Every file and directory the league summaries are computed from, for fingerprint caching."""
+        paths = {os.path.join(league.results_path, "Results.csv") for league in self.leagues.values()}
+        paths |= {league.predictions_path for league in self.leagues.values()}
+        return sorted(paths)
+
+    def score_all(self, workers=None):
+        return score_leagues(list(self.leagues.values()), workers=workers)
@@ -0,0 +1,132 @@
+from collections import namedtuple
+import numpy as np
+import pandas as pd
+import ScoringEngine
+import Standings
+
+MAX_CHUNK_ELEMENTS = 4_000_000  # fixtures x participants x rivals evaluated at once by expected_ranks
+
+FixturePoints = namedtuple("FixturePoints", ["participants", "base_scores", "fixtures_df", "home_points", "away_points"])
+
+def fixture_points(results_df, predictions, leaderboard_df, standings=None):
+    """Banked points from the leaderboard and what every participant earns on each unplayed fixture under either result.
+
+    Bonuses are the estimates of Standings.fixture_bonuses, the model the simulation and What If use too:
+    a league fixture against today's points table, a playoff win at its entered (or assumed) bonus.
+    """
+    season = ScoringEngine.encode_season(results_df, predictions)
+    base_scores = leaderboard_df.set_index("Participant")["Points"].reindex(season.participants).fillna(0).to_numpy(dtype=float)
+    bonuses = Standings.fixture_bonuses(results_df, standings)
+    fixtures_df = results_df.iloc[bonuses.rows][["Match #", "Date", "Home Team", "Away Team"]].reset_index(drop=True)
+    _, home_points, away_points = ScoringEngine.remaining_fixture_points(season, bonuses.away, bonuses.home)
+    return FixturePoints(season.participants, base_scores, fixtures_df, home_points, away_points)
+
+def ranks_after(base_scores, fixture_points):
+    """Rank of every participant if only one fixture were added to today's totals: fixtures x participants.
+
+    As in expected_ranks (and RankSolver.rank_bounds) a rank is one plus the participants strictly above,
+    so the two can be compared; it is found with one sort and binary search per fixture.
+    """
+    totals = base_scores[None, :] + fixture_points.T
+    ranks = np.empty(totals.shape, dtype=int)
+    for fixture, fixture_totals in enumerate(totals):
+        ranks[fixture] = 1 + len(fixture_totals) - np.searchsorted(np.sort(fixture_totals), fixture_totals, side="right")
+    return ranks
+
+def normal_cdf(x):
+    """Standard normal CDF through the Abramowitz-Stegun erf approximation (error below 1e-6)."""
+    z = np.abs(x) / np.sqrt(2)
+    t = 1 / (1 + 0.3275911 * z)
+    erfc = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429)))) * np.exp(-z * z)
+    return np.where(x >= 0, 1 - erfc / 2, erfc / 2)
+
+def expected_ranks(base_scores, home_points, away_points, rows, home_win_probability=0.5):
+    """Expected final rank of the `rows` participants given each unplayed fixture goes home or away.
+
+    Rank counts the rivals finishing strictly above, plus one. With every other fixture left open, the
+    final gap between a participant and a rival is a sum of independent per-fixture swings, so its mean
+    and variance follow from a few matrix products; conditioning on one fixture just fixes that fixture's
+    swing. The chance of each rival finishing above is then read off a normal approximation of the gap,
+    so no outcome is ever rescored. Returns (if_home, if_away), each fixtures x rows.
+    """
+    rows = np.asarray(rows, dtype=int)
+    num_fixtures = home_points.shape[1]
+    p = np.broadcast_to(np.asarray(home_win_probability, dtype=float), (num_fixtures,))
+    weight = p * (1 - p)
+    swing = (home_points - away_points).astype(float)
+    mean = base_scores + home_points @ p + away_points @ (1 - p)
+    squared = (swing ** 2) @ weight
+    if_home = np.empty((num_fixtures, len(rows)))
+    if_away = np.empty((num_fixtures, len(rows)))
+    chunk = max(1, MAX_CHUNK_ELEMENTS // max(1, num_fixtures * len(base_scores)))
+    for start in range(0, len(rows), chunk):
+        block = rows[start:start + chunk]
+        # Gap of every rival over each row participant: (rows, rivals) before conditioning
+        gap = mean[None, :] - mean[block, None]
+        variance = squared[None, :] + squared[block, None] - 2 * (swing[block] * weight) @ swing.T
+        fixture_swing = swing.T[:, None, :] - swing.T[:, block, None]  # fixtures x rows x rivals
+        conditional_variance = np.maximum(variance[None] - weight[:, None, None] * fixture_swing ** 2, 0)
+        spread = np.sqrt(conditional_variance)
+        for outcome, shift in [(if_home, (1 - p)[:, None, None] * fixture_swing), (if_away, -p[:, None, None] * fixture_swing)]:
+            conditional_gap = gap[None] + shift
+            # Points move in whole steps, so "strictly above" is a gap of at least one: the continuity correction
+            above = np.where(spread > 1e-9, normal_cdf((conditional_gap - 0.5) / np.maximum(spread, 1e-9)), conditional_gap > 0.5)
+            outcome[:, start:start + len(block)] = 1 + above.sum(axis=2)
+    return if_home, if_away
+
+def fixture_labels(fixtures_df):
+    return (fixtures_df["Home Team"] + " v " + fixtures_df["Away Team"]).tolist()
+
+def participant_leverage(points, participant, home_win_probability=0.5):
+    """One participant's unplayed fixtures ranked by leverage: how far their expected final rank moves with the result.
+
+    "Rank If Home/Away" is the rank straight after that result with nothing else played; "Leverage" is the
+    expected final rank under an away win minus that under a home win, so positive means a home win helps.
+    """
+    row = points.participants.index(participant)
+    if_home, if_away = expected_ranks(points.base_scores, points.home_points, points.away_points, [row], home_win_probability)
+    home_ranks = ranks_after(points.base_scores, points.home_points)[:, row]
+    away_ranks = ranks_after(points.base_scores, points.away_points)[:, row]
+    home_points, away_points = points.home_points[row], points.away_points[row]
+    leverage = if_away[:, 0] - if_home[:, 0]
+    fixtures_df = points.fixtures_df
+    leverage_df = pd.DataFrame({
+        "Match #": fixtures_df["Match #"],
+        "Date": fixtures_df["Date"],
+        "Fixture": fixture_labels(fixtures_df),
+        "Pick": np.where(home_points > 0, fixtures_df["Home Team"], np.where(away_points > 0, fixtures_df["Away Team"], "-")),
+        "Root For": np.where(leverage > 0, fixtures_df["Home Team"], np.where(leverage < 0, fixtures_df["Away Team"], "-")),
+        "Points Swing": home_points - away_points,
+        "Rank If Home": home_ranks,
+        "Rank If Away": away_ranks,
+        "Expected Rank If Home": if_home[:, 0].round(1),
+        "Expected Rank If Away": if_away[:, 0].round(1),
+        "Leverage": leverage.round(2),
+    })
+    order = np.lexsort((leverage_df["Match #"].to_numpy(), -np.abs(leverage)))
+    return leverage_df.iloc[order].reset_index(drop=True)
+
+def matches_to_watch(points):
+    """Unplayed fixtures ranked by how much the leaderboard reshuffles between their two results.
+
+    Each fixture is added to today's totals once per result and the whole pool re-ranked (a sort per
+    fixture and result); "Rank Swing" is how many places a participant's rank differs between the two.
+    """
+    fixtures_df = points.fixtures_df
+    if fixtures_df.empty:
+        return pd.DataFrame(columns=["Match #", "Date", "Fixture", "Home Backers", "Away Backers", "Participants Moved",
+                                     "Mean Rank Swing", "Biggest Swing", "Biggest Mover"])
+    rank_swing = np.abs(ranks_after(points.base_scores, points.home_points) - ranks_after(points.base_scores, points.away_points))
+    biggest = rank_swing.argmax(axis=1)
+    watch_df = pd.DataFrame({
+        "Match #": fixtures_df["Match #"],
+        "Date": fixtures_df["Date"],
+        "Fixture": fixture_labels(fixtures_df),
+        "Home Backers": (points.home_points > 0).sum(axis=0),
+        "Away Backers": (points.away_points > 0).sum(axis=0),
+        "Participants Moved": (rank_swing > 0).sum(axis=1),
+        "Mean Rank Swing": rank_swing.mean(axis=1).round(2),
+        "Biggest Swing": rank_swing.max(axis=1),
+        "Biggest Mover": np.asarray(points.participants, dtype=object)[biggest],
+    })
+    return watch_df.sort_values(by=["Mean Rank Swing", "Match #"], ascending=[False, True], kind="stable").reset_index(drop=True)
@@ -0,0 +1,119 @@
+import threading
+import time
+from collections import deque, namedtuple
+import pandas as pd
+import DataCache
+
+Update = namedtuple("Update", ["version", "time", "changed_df", "progression_df"])
+
+def league_folders(league):
+    """What a league's leaderboard is computed from: the results and gamble folders and the schedule."""
+    return [path for path in [league.results_path, league.predictions_path, league.old_predictions_path, league.schedule_path] if path]
+
+def standings(leaderboard_df):
+    """Participant -> (rank, points), ranked densely like the leaderboard."""
+    ranks = leaderboard_df["Points"].rank(method="dense", ascending=False).astype(int)
+    return pd.DataFrame({"Rank": ranks.to_numpy(), "Points": leaderboard_df["Points"].to_numpy()},
+                        index=leaderboard_df["Participant"].to_numpy())
+
+def leaderboard_changes(old_df, new_df):
+    """Rows of the new standings whose rank or points differ from the old, with the change in each."""
+    joined = new_df.join(old_df, rsuffix=" Before", how="left")
+    changed = joined[(joined["Rank"] != joined["Rank Before"]) | (joined["Points"] != joined["Points Before"])]
+    return pd.DataFrame({
+        "Participant": changed.index,
+        "Rank": changed["Rank"].to_numpy(),
+        "Rank Change": (changed["Rank Before"] - changed["Rank"]).astype("Int64").to_numpy(),
+        "Points": changed["Points"].to_numpy(),
+        "Points Change": (changed["Points"] - changed["Points Before"]).astype("Int64").to_numpy(),
+    }).sort_values(by=["Rank", "Participant"]).reset_index(drop=True)
+
+def new_progression_points(old_progression, new_progression):
+    """Cumulative points at every match the new progression has past the end of the old one."""
+    rows = [(participant, match, points[match]) for participant, points in new_progression.items()
+            for match in range(len(old_progression.get(participant, [])), len(points))]
+    return pd.DataFrame(rows, columns=["Participant", "Match", "Points"])
+
+
+class LeagueWatcher:
+    """Watches one league's input folders and rescores it once per change for every open session.
+
+    A background thread polls the fingerprints (names, modification times, sizes) of the watched folders
+    every `interval` seconds; the standard library has no inotify binding and a stat of each file is
+    cheap next to scoring. The cache keeps the fingerprints of the watched folders until the watcher expires
+    them, so lookups in between never stat a file. On a change the scores are recomputed through the
+    shared cache, which also leaves them warm for every session's next rerun, and an Update with only the
+    leaderboard rows that moved and the new progression points is published. Sessions compare `version` with the last one
+    they showed, which costs no computation. A failed check is kept in `error` for the dashboard to show,
+    and the watcher goes on polling: the next check retries until one succeeds.
+    """
+
+    def __init__(self, cache, league, interval=2.0, history=20):
+        self.cache = cache
+        self.league = league
+        self.interval = interval
+        self.updates = deque(maxlen=history)
+        self.version = 0
+        self.fingerprint = None
+        self.error = None
+        self.standings = None
+        self.progression = None
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread = None
+        cache.watch(league_folders(league))
+
+    def poll(self):
+        return tuple(DataCache.path_fingerprint(path) for path in league_folders(self.league))
+
+    def rescore(self):
+        league = self.league
+        self.cache.expire_fingerprints(league_folders(league))
+        leaderboard_df, points_progression = DataCache.calculate_scores(self.cache, league.results_path, league.predictions_path)
+        DataCache.season_snapshot(self.cache, league.results_path, league.predictions_path, league.schedule_path)
+        return standings(leaderboard_df), points_progression
+
+    def check(self):
+        """Rescore if any watched file changed; returns the Update published, if any."""
+        fingerprint = self.poll()
+        if fingerprint == self.fingerprint:
+            return None
+        new_standings, new_progression = self.rescore()
+        with self.lock:
+            self.fingerprint = fingerprint
+            if self.standings is None:
+                self.standings, self.progression = new_standings, new_progression
+                return None
+            changed_df = leaderboard_changes(self.standings, new_standings)
+            progression_df = new_progression_points(self.progression, new_progression)
+            self.standings, self.progression = new_standings, new_progression
+            if changed_df.empty and progression_df.empty:
+                return None
+            update = Update(self.version + 1, time.time(), changed_df, progression_df)
+            self.updates.append(update)
+            self.version = update.version
+            return update
+
+    def updates_since(self, version):
+        with self.lock:
+            return [update for update in self.updates if update.version > version]
+
+    def run(self):
+        while not self.stopped.is_set():
+            try:
+                self.check()
+                self.error = None
+            except Exception as error:  # often a file caught mid-write, which the next poll sees complete
+                self.error = f"{type(error).__name__}: {error}"
+            self.stopped.wait(self.interval)
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, name=f"watch {self.league.name}", daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
@@ -1,9 +1,10 @@
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
 import numpy as np
 import pandas as pd
 import streamlit as st
-import time
+import RankHistory
 
 team_colors = {
     'Chennai Super Kings': '#F9CD05',  # Yellow
@@ -46,7 +47,6 @@ def plot_worm_graph(points_progression):
                                  line=dict(color=color_map[participant], width=2), line_shape='spline'))
     
     fig.update_layout(title="Points Progression", xaxis_title="Matches", yaxis_title="Points", template="plotly_dark")
-    fig.write_image("The Visuals/worm_graph.png", format="png", scale=4)
     return fig
 
 def plot_participant_wise_team_predictions(participant_wise_team_predictions):
@@ -76,7 +76,6 @@ def avg_wins_plot(mean_counts_df):
         labels={"value": "Average Wins", "index": "Teams"},
     )
     fig.update_layout(showlegend=False)
-    fig.write_image("The Visuals/Average Win Prediction.png", format="png", scale=4)
     return fig
 
 def plot_prediction_ratio(prediction_ratio_counts):
@@ -93,33 +92,32 @@ def plot_prediction_ratio(prediction_ratio_counts):
     return fig
 
 def plot_home_away_ratio(home_away_ratio_counts, steps=20, delay=0.05):
-    """Plot the prediction ratio analysis."""
-    container = st.empty()
-
-    # Normalize and prepare data
+    """Plot the prediction ratio analysis, growing the bars client-side with Plotly animation frames."""
     df = home_away_ratio_counts.copy().reset_index(drop=True)
     max_counts = df["Count"].max()
     df["Home-Away Ratio"] = df["Home-Away Ratio"].astype(str)  # Ensure it's string for consistent display
 
-    # Animate in 'steps' frames
-    for step in range(1, steps + 1):
-        progress_ratio = step / steps
-        df_animated = df.copy()
-        df_animated["Animated Count"] = df["Count"] * progress_ratio
-
-        fig = px.bar(
-            df_animated,
-            x="Home-Away Ratio",
-            y="Animated Count",
-            color="Home-Away Ratio",
-            color_discrete_sequence=px.colors.qualitative.Set1,
-            title="Home-Away Ratio Analysis",
-            labels={"Animated Count": "Count"},
-            range_y=[0, max_counts * 1.1],  # keep scale fixed
-        )
-
-        container.plotly_chart(fig, use_container_width=True)
-        time.sleep(delay)
+    fig = px.bar(
+        df,
+        x="Home-Away Ratio",
+        y="Count",
+        color="Home-Away Ratio",
+        color_discrete_sequence=px.colors.qualitative.Set1,
+        title="Home-Away Ratio Analysis",
+        range_y=[0, max_counts * 1.1],  # keep scale fixed
+    )
+    # Frames carry only the scaled bar heights; the chart opens finished and Play replays the growth in the browser
+    fig.frames = [go.Frame(name=str(step), data=[go.Bar(y=[y * step / steps for y in trace.y]) for trace in fig.data])
+                  for step in range(1, steps + 1)]
+    fig.update_layout(updatemenus=[{
+        "type": "buttons",
+        "buttons": [{
+            "label": "Play",
+            "method": "animate",
+            "args": [None, {"frame": {"duration": delay * 1000, "redraw": False}, "fromcurrent": False, "mode": "immediate"}]
+        }]
+    }])
+    return fig
 
 def plot_home_away_percentage(percentage_df):
     """Plot the prediction ratio analysis."""
@@ -156,54 +154,70 @@ def plot_home_away_percentage(percentage_df):
 
 
 def plot_animated_worm_graph(points_progression, delay=0.1):
-    """Plot animated worm graph showing points progression with smooth curves."""
-    container = st.empty()
+    """Plot animated worm graph showing points progression with smooth curves.
 
+    Each trace is sent to the browser once; the animation frames only slide a curtain off the matches
+    not yet reached, so the whole animation runs client-side from a single figure. The curtain is painted
+    in the plot background of the figure's own template, so show it without Streamlit's theme
+    (theme=None); hover is off until the last frame, as the lines behind the curtain would still answer it.
+    """
     participants = list(points_progression.keys())
     num_matches = len(next(iter(points_progression.values())))
     colorscale = px.colors.qualitative.G10
     color_map = {p: colorscale[i % len(colorscale)] for i, p in enumerate(participants)}
     y_max = max(max(v) for v in points_progression.values())
 
-    for frame in range(1, num_matches + 1):
-        fig = go.Figure()
-
-        for p in participants:
-            x_vals = list(range(frame))
-            y_vals = points_progression[p][:frame]
-            fig.add_trace(go.Scatter(
-                x=x_vals,
-                y=y_vals,
-                mode='lines',
-                name=p,
-                line=dict(color=color_map[p], width=3),
-                marker=dict(size=6),
-                line_shape='spline'
-            ))
-
-        fig.update_layout(
-            title="📊 Points Progression",
-            xaxis_title="Matches",
-            yaxis_title="Points",
-            yaxis=dict(range=[0, y_max + 5]),
-            xaxis=dict(range=[0, num_matches]),
-            template="plotly_dark",
-            showlegend=True,
-            transition=dict(duration=200, easing="cubic-in-out")  # smoother slide
-        )
-
-        container.plotly_chart(fig, use_container_width=True)
-        time.sleep(delay)
+    fig = go.Figure()
+    for p in participants:
+        fig.add_trace(go.Scatter(
+            x=list(range(num_matches)),
+            y=points_progression[p],
+            mode='lines',
+            name=p,
+            line=dict(color=color_map[p], width=3),
+            marker=dict(size=6),
+            line_shape='spline'
+        ))
+
+    background = pio.templates["plotly_dark"].layout.plot_bgcolor
+
+    def curtain(frame):
+        return [dict(type="rect", xref="x", yref="paper", x0=frame - 0.5, x1=num_matches + 1, y0=0, y1=1,
+                     fillcolor=background, line=dict(width=0), layer="above")]
+
+    fig.frames = [go.Frame(name=str(frame), layout=dict(shapes=curtain(frame),
+                                                        hovermode="closest" if frame == num_matches else False))
+                  for frame in range(1, num_matches + 1)]
+    fig.update_layout(
+        title="📊 Points Progression",
+        xaxis_title="Matches",
+        yaxis_title="Points",
+        yaxis=dict(range=[0, y_max + 5]),
+        xaxis=dict(range=[0, num_matches]),
+        template="plotly_dark",
+        plot_bgcolor=background,
+        hovermode="closest",
+        showlegend=True,
+        shapes=curtain(num_matches),
+        updatemenus=[{
+            "type": "buttons",
+            "buttons": [{
+                "label": "Play",
+                "method": "animate",
+                "args": [None, {
+                    "frame": {"duration": delay * 1000, "redraw": True},
+                    "fromcurrent": False,
+                    "mode": "immediate",
+                    "transition": {"duration": 0},
+                }]
+            }]
+        }]
+    )
+    return fig
 
 def plot_bar_chart_race(points_progression) :
     """Plot for bar chart race showing points progression."""
-    data = []
-    for participant, scores in points_progression.items():
-        for match, points in enumerate(scores):
-            data.append({"Participant": participant, "Match": match, "Points": points})
-    points_progression_df = pd.DataFrame(data)
-    points_progression_df["Rank"] = points_progression_df.groupby("Match")["Points"].rank(method="first", ascending=False)
-    points_progression_df.sort_values(by=["Match", "Rank"], inplace=True)
+    points_progression_df = RankHistory.long_form(RankHistory.build_rank_history(points_progression))
     # st.write(points_progression_df.to_html(index=False), unsafe_allow_html=True)
 
     fig = px.bar(points_progression_df, 
@@ -239,7 +253,8 @@ def plot_bar_chart_race(points_progression) :
 
 
 def plot_time_spent_position(time_spent_position_df):
-    all_ranks = pd.Series(range(1, 12), name="Rank")
+    num_ranks = int(time_spent_position_df["Rank"].max())
+    all_ranks = pd.Series(range(1, num_ranks + 1), name="Rank")
 
     participants = time_spent_position_df['Participant'].unique()
 
@@ -250,7 +265,7 @@ def plot_time_spent_position(time_spent_position_df):
         sub_df = time_spent_position_df[time_spent_position_df['Participant'] == participant]
         sub_df = pd.merge(all_ranks, sub_df, on="Rank", how="left").fillna(0)
 
-        x = np.linspace(1, 11, num = 11)
+        x = np.linspace(1, num_ranks, num = num_ranks)
 
         fig = px.line(
             x = x,
@@ -268,15 +283,16 @@ def plot_time_spent_position(time_spent_position_df):
         st.plotly_chart(fig, use_container_width=True)    
 
 def plot_position_graph(points_progression):
-    data = []
-    for participant, scores in points_progression.items():
-        for match, points in enumerate(scores):
-            data.append({"Participant": participant, "Match": match, "Points": points})
-    points_progression_df = pd.DataFrame(data)
-    points_progression_df = points_progression_df[~points_progression_df["Participant"].isin(["Wanderers", "Homies"])]
-    points_progression_df["Rank"] = points_progression_df.groupby("Match")["Points"].rank(method="first", ascending=False)
+    history = RankHistory.build_rank_history(points_progression, exclude=["Wanderers", "Homies"])
+    points_progression_df = RankHistory.long_form(history)
     fig = px.line(points_progression_df, x="Match", y="Rank", color="Participant", line_shape='spline')
     fig.update_layout(title="Position Graph", xaxis_title="Matches", yaxis_title="Rank", template="plotly_dark")
     fig.update_yaxes(autorange="reversed")
-    fig.write_image("The Visuals/position_graph.png", format="png", scale=4)
-    return fig
\ No newline at end of file
+    return fig
+
+def plot_agreement_heatmap(agreement_df):
+    """Heatmap of how often each pair of participants picked the same winner."""
+    fig = px.imshow(agreement_df, zmin=0, zmax=100, color_continuous_scale="RdBu_r", aspect="auto",
+                    labels=dict(x="Participant", y="Participant", color="Agreement %"))
+    fig.update_layout(title="Prediction Agreement", template="plotly_dark")
+    return fig
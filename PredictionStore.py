@@ -0,0 +1,160 @@
+import json
+import os
+import numpy as np
+import Ingestion
+import IncrementalScoring
+
+MAGIC = b"IPLPICKS"
+STORE_VERSION = 2
+ALIGNMENT = 64
+MISSING = -1
+
+def source_fingerprint(predictions_path):
+    """Name, modification time and size of every gamble file the store is compiled from."""
+    return sorted(Ingestion.file_source(entry) for entry in Ingestion.gamble_entries(predictions_path))
+
+def schedule_teams(schedule_df):
+    """Home and away team of every scheduled match, tolerating the schedule CSV's padded headers."""
+    schedule_df = schedule_df.rename(columns=lambda column: column.strip())
+    return schedule_df["Home Team"].str.strip().tolist(), schedule_df["Away Team"].str.strip().tolist()
+
+
+class PredictionStore:
+    """All participants' picks as a participants x matches matrix of small team codes.
+
+    Codes index into `teams`, whose first entries are the scheduled teams; anything else a participant
+    wrote (a typo, an empty line) gets its own code so no information is lost, and MISSING marks matches
+    past the end of a participant's file. The matrix is memory-mapped straight from the store file.
+    `issues` lists what validating the files against the schedule found.
+    """
+
+    def __init__(self, participants, teams, codes, home_codes, away_codes, issues=()):
+        self.participants = participants
+        self.teams = teams
+        self.codes = codes
+        self.home_codes = home_codes
+        self.away_codes = away_codes
+        self.issues = list(issues)
+
+    @property
+    def num_matches(self):
+        return self.codes.shape[1]
+
+    def sides(self):
+        """0 where the participant picked the home team, 1 for the away team, -1 for anything else."""
+        num_scheduled = len(self.home_codes)
+        codes = self.codes[:, :num_scheduled]
+        sides = np.full(codes.shape, -1, dtype=np.int8)
+        sides[codes == self.home_codes] = 0
+        sides[codes == self.away_codes] = 1
+        return sides
+
+    def row_picks(self, position):
+        row = self.codes[position]
+        return [self.teams[code] for code in row[row != MISSING]]
+
+    def gambles(self, sources):
+        """The store's rows as Ingestion.Gambles, so recompiling can skip re-reading unchanged files."""
+        sources = {source[0]: source for source in sources}
+        issues = {participant: [] for participant in self.participants}
+        for issue in self.issues:
+            issues[issue.participant].append(issue)
+        return {participant + ".txt": Ingestion.Gamble(participant, sources[participant + ".txt"],
+                                                       self.row_picks(position), issues[participant])
+                for position, participant in enumerate(self.participants) if participant + ".txt" in sources}
+
+    def team_counts(self):
+        """Participants x teams matrix of how many matches each participant picked each team to win."""
+        offsets = np.arange(len(self.participants))[:, None] * len(self.teams)
+        valid = self.codes != MISSING
+        counts = np.bincount((offsets + self.codes)[valid], minlength=len(self.participants) * len(self.teams))
+        return counts.reshape(len(self.participants), len(self.teams))
+
+
+def compile_store(predictions_path, schedule_df, previous=None, workers=None):
+    """Read and validate the gamble text files and encode them against the schedule.
+
+    `previous` maps file names to already read Ingestion.Gambles, which are reused for unchanged files.
+    """
+    home_teams, away_teams = schedule_teams(schedule_df)
+    gambles = Ingestion.read_gambles(predictions_path, home_teams, away_teams, previous, workers)
+    teams = list(dict.fromkeys(home_teams + away_teams))
+    team_index = {team: code for code, team in enumerate(teams)}
+    for gamble in gambles:
+        for team in gamble.picks:
+            if team not in team_index:
+                team_index[team] = len(teams)
+                teams.append(team)
+    num_matches = max([len(home_teams)] + [len(gamble.picks) for gamble in gambles])
+    dtype = np.int8 if len(teams) < 127 else np.int16
+    codes = np.full((len(gambles), num_matches), MISSING, dtype=dtype)
+    for p, gamble in enumerate(gambles):
+        codes[p, :len(gamble.picks)] = [team_index[team] for team in gamble.picks]
+    return PredictionStore([gamble.participant for gamble in gambles], teams, codes,
+                           np.array([team_index[team] for team in home_teams], dtype=dtype),
+                           np.array([team_index[team] for team in away_teams], dtype=dtype),
+                           [issue for gamble in gambles for issue in gamble.issues])
+
+def write_store(store, store_path, sources):
+    header = json.dumps({
+        "version": STORE_VERSION,
+        "participants": store.participants,
+        "teams": store.teams,
+        "home_codes": store.home_codes.tolist(),
+        "away_codes": store.away_codes.tolist(),
+        "shape": list(store.codes.shape),
+        "dtype": store.codes.dtype.str,
+        "sources": sources,
+        "issues": [list(issue) for issue in store.issues],
+    }).encode()
+    offset = -(-(len(MAGIC) + 8 + len(header)) // ALIGNMENT) * ALIGNMENT
+    os.makedirs(os.path.dirname(store_path) or ".", exist_ok=True)
+    def write(temporary_path):
+        with open(temporary_path, "wb") as f:
+            f.write(MAGIC)
+            f.write(len(header).to_bytes(4, "little"))
+            f.write(offset.to_bytes(4, "little"))
+            f.write(header)
+            f.write(b"\0" * (offset - len(MAGIC) - 8 - len(header)))
+            f.write(np.ascontiguousarray(store.codes).tobytes())
+    IncrementalScoring.write_atomically(store_path, write)
+
+def read_header(store_path):
+    with open(store_path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            return None, 0
+        header_length = int.from_bytes(f.read(4), "little")
+        offset = int.from_bytes(f.read(4), "little")
+        header = json.loads(f.read(header_length))
+    return (header, offset) if header.get("version") == STORE_VERSION else (None, 0)
+
+def read_store(store_path):
+    """Open a store file, memory-mapping the pick matrix."""
+    header, offset = read_header(store_path)
+    dtype = np.dtype(header["dtype"])
+    codes = np.memmap(store_path, dtype=dtype, mode="r", offset=offset, shape=tuple(header["shape"]))
+    return PredictionStore(header["participants"], header["teams"], codes,
+                           np.array(header["home_codes"], dtype=dtype), np.array(header["away_codes"], dtype=dtype),
+                           [Ingestion.Issue(*issue) for issue in header["issues"]])
+
+def store_path_for(predictions_path):
+    """Where the compiled store of a gamble directory lives."""
+    predictions_path = os.path.normpath(predictions_path)
+    return os.path.join(os.path.dirname(predictions_path), ".prediction_store", os.path.basename(predictions_path) + ".picks")
+
+def load_store(predictions_path, schedule_df, store_path=None):
+    """Open the compiled store for a gamble directory, recompiling it if any source file or the schedule changed."""
+    store_path = store_path or store_path_for(predictions_path)
+    sources = source_fingerprint(predictions_path)
+    home_teams, away_teams = schedule_teams(schedule_df)
+    previous = None
+    if os.path.exists(store_path):
+        header, _ = read_header(store_path)
+        if (header is not None
+                and [header["teams"][code] for code in header["home_codes"]] == home_teams
+                and [header["teams"][code] for code in header["away_codes"]] == away_teams):
+            if header["sources"] == sources:
+                return read_store(store_path)
+            previous = read_store(store_path).gambles(header["sources"])
+    write_store(compile_store(predictions_path, schedule_df, previous), store_path, sources)
+    return read_store(store_path)
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+from collections import namedtuple
+import ScoringEngine
+
+RankHistory = namedtuple("RankHistory", ["participants", "points", "ranks"])
+
+def build_rank_history(points_progression, exclude=()):
+    """Participants x matches matrices of cumulative points and dense rank (1 = top, ties share a rank).
+
+    Column 0 is the start of the season, as in points_progression. Ranks are computed for every match at
+    once with one array sort, using the same dense rule as the leaderboard.
+    """
+    participants = [participant for participant in points_progression if participant not in exclude]
+    points = np.array([points_progression[participant] for participant in participants])
+    if points.size == 0:
+        return RankHistory(participants, points, np.zeros(points.shape, dtype=np.int32))
+    return RankHistory(participants, points, ScoringEngine.dense_ranks(points.T).T)
+
+def long_form(history):
+    """One row per (participant, match) with its points and rank, ordered by match and then rank."""
+    num_participants, num_columns = history.points.shape
+    points_progression_df = pd.DataFrame({
+        "Participant": np.repeat(np.array(history.participants, dtype=object), num_columns),
+        "Match": np.tile(np.arange(num_columns), num_participants),
+        "Points": history.points.ravel(),
+        "Rank": history.ranks.ravel(),
+    })
+    return points_progression_df.sort_values(by=["Match", "Rank"], kind="stable")
+
+def time_at_position(history):
+    """How many matches each participant has spent at each rank, skipping the pre-season column."""
+    ranks = history.ranks[:, 1:]
+    max_rank = int(ranks.max()) if ranks.size else 0
+    offsets = np.arange(len(history.participants))[:, None] * (max_rank + 1)
+    counts = np.bincount((offsets + ranks).ravel(), minlength=len(history.participants) * (max_rank + 1))
+    counts = counts.reshape(len(history.participants), max_rank + 1)
+    participant_index, rank = np.nonzero(counts)
+    time_spent_position_df = pd.DataFrame({
+        "Participant": np.array(history.participants, dtype=object)[participant_index],
+        "Rank": rank,
+        "Count": counts[participant_index, rank],
+    })
+    return time_spent_position_df.sort_values(by=["Participant", "Rank"]).reset_index(drop=True)
+
+def rank_summary(history):
+    """Current, best and worst rank, matches at the top and rank volatility (mean move per match) per participant."""
+    ranks = history.ranks[:, 1:]
+    if ranks.shape[1] == 0:
+        ranks = history.ranks
+    moves = np.abs(np.diff(ranks, axis=1))
+    return pd.DataFrame({
+        "Participant": history.participants,
+        "Current Rank": ranks[:, -1],
+        "Best Rank": ranks.min(axis=1),
+        "Worst Rank": ranks.max(axis=1),
+        "Average Rank": ranks.mean(axis=1).round(2),
+        "Matches at #1": (ranks == 1).sum(axis=1),
+        "Volatility": moves.mean(axis=1).round(2) if moves.shape[1] else 0.0,
+    }).sort_values(by=["Current Rank", "Best Rank"]).reset_index(drop=True)
@@ -0,0 +1,168 @@
+import itertools
+import numpy as np
+import pandas as pd
+import ScoringEngine
+import Standings
+
+MAX_FREE_MATCHES = 16  # matches a participant left unpicked that are still enumerated exactly
+OPEN_BONUS = 1e6  # stands in for a playoff bonus not entered yet: larger than any swing the other matches allow
+
+def remaining_points(results_df, predictions, standings=None):
+    """Banked points, the bonus model of the unplayed matches, and which of those can still move the table.
+
+    Matches where every participant gains the same under every outcome (e.g. everyone predicted the same
+    team) cannot change anyone's relative position, so `decisive` marks the unplayed matches worth keeping.
+    Bonuses come from Standings.fixture_bonuses, so they are estimates with a low and a high bound.
+    """
+    season = ScoringEngine.encode_season(results_df, predictions)
+    bonuses = Standings.fixture_bonuses(results_df, standings)
+    _, home_points, away_points = ScoringEngine.remaining_fixture_points(season, bonuses.away, bonuses.home)
+    decisive = (home_points != home_points[:1]).any(axis=0) | (away_points != away_points[:1]).any(axis=0)
+    return season, ScoringEngine.played_scores(season), bonuses, decisive
+
+def outcome_points(season, decisive, home_bonus, away_bonus):
+    """Points everyone earns on each decisive match if the home or the away team wins it with the given bonus."""
+    _, home_points, away_points = ScoringEngine.remaining_fixture_points(season, away_bonus, home_bonus)
+    return home_points[:, decisive], away_points[:, decisive]
+
+def extreme_scenarios(base_scores, picked_points, free_points, favourable, no_result=False):
+    """Final points of everyone when each participant's own picks all win (or all lose).
+
+    For a match a participant has picked, its own pick winning is at least as good against every rival
+    at once as a no-result or the other outcome, so the best (and worst) case of every participant is a
+    single scenario, scored with the (home, away) `picked_points`. A no-result gives everyone 5, so on the
+    matches a participant did not pick it is the best case whenever washouts are allowed and never the
+    worst. Otherwise those free matches are scored with `free_points` and enumerated exactly when there are
+    few of them, or resolved rival by rival in the participant's favour (best case) or against it (worst
+    case) when there are many, so the bounds stay safe rather than exact.
+    """
+    home_points, away_points = picked_points
+    free_home_points, free_away_points = free_points
+    num_participants = len(base_scores)
+    picked_home = home_points > 0
+    picked_away = away_points > 0
+    scenarios = np.empty((num_participants, num_participants))
+    for p in range(num_participants):
+        home_wins = picked_home[p] if favourable else picked_away[p]
+        free = np.flatnonzero(~picked_home[p] & ~picked_away[p])
+        totals = base_scores + np.where(home_wins, home_points, 0).sum(axis=1) + np.where(~home_wins & (picked_home[p] | picked_away[p]), away_points, 0).sum(axis=1)
+        if len(free) == 0 or (favourable and no_result):
+            scenarios[p] = totals + 5 * len(free)
+            continue
+        home_points_free, away_points_free = free_home_points[:, free], free_away_points[:, free]
+        if len(free) > MAX_FREE_MATCHES:
+            pick = np.minimum if favourable else np.maximum
+            scenarios[p] = totals + pick(home_points_free, away_points_free).sum(axis=1)
+            continue
+        outcomes = np.array(list(itertools.product([True, False], repeat=len(free))))
+        candidates = totals + outcomes @ home_points_free.T + (~outcomes) @ away_points_free.T
+        above = (candidates > candidates[:, [p]]).sum(axis=1)
+        best = np.argmin(above) if favourable else np.argmax(above)
+        scenarios[p] = candidates[best]
+    return scenarios
+
+def rank_bounds(results_df, predictions, standings=None, no_result=True):
+    """Best and worst finishing rank still possible for every participant, and the points range behind them.
+
+    Ranks count the participants strictly above, so "Worst Rank" <= k means a guaranteed top-k finish.
+    Every unplayed match may be won with any bonus in its Standings.fixture_bonuses range (a playoff bonus
+    not entered yet has no upper limit, so "Max Points" can be infinite) or, with `no_result`, washed out.
+    The ranges are treated as independent, so the bounds are exact once the bonuses are settled and safe before.
+    """
+    season, base_scores, bonuses, decisive = remaining_points(results_df, predictions, standings)
+    high = outcome_points(season, decisive, np.minimum(bonuses.home_high, OPEN_BONUS), np.minimum(bonuses.away_high, OPEN_BONUS))
+    low = outcome_points(season, decisive, bonuses.home_low, bonuses.away_low)
+    # Picked matches swing most at the high bonus; free ones help the best case most at the low bonus
+    best_case = extreme_scenarios(base_scores, high, low, favourable=True, no_result=no_result)
+    worst_case = extreme_scenarios(base_scores, high, high, favourable=False)
+
+    # Points come from every unplayed match, including the ones that cannot move the table
+    picks = season.pick_codes[:, bonuses.rows]
+    picked_home = picks == season.home_codes[bonuses.rows]
+    picked_away = picks == season.away_codes[bonuses.rows]
+    max_points = base_scores + np.where(picked_home, 10 + bonuses.home_high, np.where(picked_away, 10 + bonuses.away_high, 5 if no_result else 0)).sum(axis=1)
+    own_best = np.diag(best_case)[:, None]
+    own_worst = np.diag(worst_case)[:, None]
+    bounds_df = pd.DataFrame({
+        "Participant": season.participants,
+        "Max Points": max_points.astype(float),
+        "Min Points": base_scores.astype(float),
+        "Best Rank": (best_case > own_best).sum(axis=1) + 1,
+        "Worst Rank": (worst_case > own_worst).sum(axis=1) + 1,
+    })
+    bounds_df["Can Finish First"] = bounds_df["Best Rank"] == 1
+    return bounds_df
+
+def guaranteed_top_k(results_df, predictions, k, standings=None):
+    """Participants who finish in the top k whatever happens in the remaining matches."""
+    bounds_df = rank_bounds(results_df, predictions, standings)
+    return bounds_df.loc[bounds_df["Worst Rank"] <= k, "Participant"].tolist()
+
+def title_race_status(bounds_df):
+    """Short clinch/elimination label for the leaderboard."""
+    def status(row):
+        if row["Worst Rank"] == 1:
+            return "🏆 Clinched"
+        if not row["Can Finish First"]:
+            return f"Eliminated (best #{row['Best Rank']})"
+        return f"Alive (top {row['Worst Rank']} locked)" if row["Worst Rank"] < len(bounds_df) else "Alive"
+    return bounds_df.apply(status, axis=1)
+
+def difference_distribution(home_difference, away_difference, home_win_probability, nr_probability):
+    """Exact distribution of the points swing between two participants, as (lowest swing, probabilities, step)."""
+    scale = np.gcd.reduce(np.abs(np.concatenate([home_difference, away_difference, [0]])))
+    if scale == 0:
+        return 0, np.ones(1), 1
+    home_difference = home_difference // scale
+    away_difference = away_difference // scale
+    low = np.minimum(np.minimum(home_difference, away_difference), 0).sum()
+    high = np.maximum(np.maximum(home_difference, away_difference), 0).sum()
+    distribution = np.zeros(high - low + 1)
+    distribution[-low] = 1.0
+    for home_step, away_step, home_probability, nr in zip(home_difference, away_difference, home_win_probability, nr_probability):
+        decided = 1 - nr
+        updated = nr * distribution
+        updated += decided * home_probability * np.roll(distribution, home_step)
+        updated += decided * (1 - home_probability) * np.roll(distribution, away_step)
+        distribution = updated
+    return low * scale, distribution, scale
+
+def pairwise_above_probabilities(results_df, predictions, home_win_probability=0.5, nr_probability=0.0, standings=None,
+                                 participants=None):
+    """Exact probability that each participant (row) finishes strictly above each other one (column).
+
+    Only the matches where the two participants would gain differently matter, and the swing over those is
+    accumulated with a dynamic programme over point differences instead of enumerating outcomes.
+    `home_win_probability` and `nr_probability` are scalars or one value per unplayed row of `results_df`,
+    and every win earns its estimated bonus from Standings.fixture_bonuses.
+    The work grows with the square of the pool, so `participants` can limit the table to some of them.
+    """
+    season, base_scores, bonuses, decisive = remaining_points(results_df, predictions, standings)
+    # The dynamic programme steps through whole points
+    home_points, away_points = (np.rint(points).astype(int) for points in outcome_points(season, decisive, bonuses.home, bonuses.away))
+    all_participants = season.participants
+    if participants is None:
+        participants = all_participants
+    position = {participant: row for row, participant in enumerate(all_participants)}
+    rows = [position[participant] for participant in participants]
+    base_scores, home_points, away_points = base_scores[rows], home_points[rows], away_points[rows]
+    home_win_probability = np.broadcast_to(np.asarray(home_win_probability, dtype=float), decisive.shape)[decisive]
+    nr_probability = np.broadcast_to(np.asarray(nr_probability, dtype=float), decisive.shape)[decisive]
+
+    num_participants = len(participants)
+    probabilities = np.full((num_participants, num_participants), np.nan)
+    for a, b in itertools.combinations(range(num_participants), 2):
+        home_difference = home_points[a] - home_points[b]
+        away_difference = away_points[a] - away_points[b]
+        swing = (home_difference != 0) | (away_difference != 0)
+        current = base_scores[a] - base_scores[b]
+        if not swing.any():
+            probabilities[a, b] = float(current > 0)
+            probabilities[b, a] = float(current < 0)
+            continue
+        low, distribution, scale = difference_distribution(home_difference[swing], away_difference[swing],
+                                                           home_win_probability[swing], nr_probability[swing])
+        final = current + low + scale * np.arange(len(distribution))
+        probabilities[a, b] = distribution[final > 0].sum()
+        probabilities[b, a] = distribution[final < 0].sum()
+    return pd.DataFrame(probabilities, index=participants, columns=participants)
@@ -0,0 +1,139 @@
+"""A file-drop stand-in for a live match-result feed.
+
+Each JSON file dropped into the inbox (default `The Results/inbox`) holds one result or a list of them,
+e.g. {"match": 57, "winner": "Punjab Kings", "bonus": 4}; "NR" marks a washout and a missing bonus is
+left for the standings to derive. Applied files move to `processed/`, invalid ones to `rejected/`.
+
+    python ResultFeed.py --base-path . --watch
+    python ResultFeed.py --base-path /tmp/league --replay "The Results/Results.csv" --every 5
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import shutil
+import time
+import pandas as pd
+import IncrementalScoring
+import PredictionStore
+
+RESULT_COLUMNS = ["Match #", "Date", "Home Team", "Away Team", "Winner", "Bonus Points"]
+
+def read_fixtures(schedule_path):
+    """{match number: (date, home, away)} from a schedule CSV."""
+    schedule_df = pd.read_csv(schedule_path)
+    home_teams, away_teams = PredictionStore.schedule_teams(schedule_df)
+    dates = schedule_df.iloc[:, 1].astype(str).str.strip()
+    return {int(number): fixture for number, fixture in zip(schedule_df.iloc[:, 0], zip(dates, home_teams, away_teams))}
+
+def write_atomically(path, content):
+    def write(temporary_path):
+        with open(temporary_path, "w", newline="") as f:
+            f.write(content)
+    IncrementalScoring.write_atomically(path, write)
+
+def apply_results(results_file, fixtures, results):
+    """Set the winner (and bonus) of each result's row in Results.csv, adding rows up to it if missing.
+
+    The file is rewritten once, through a temporary file, so a reader never sees it half written.
+    """
+    with open(results_file, newline="") as f:
+        content = f.read()
+    newline = "\r\n" if "\r\n" in content else "\n"
+    rows = list(csv.reader(io.StringIO(content)))
+    header, rows = (rows[0], rows[1:]) if rows else (RESULT_COLUMNS, [])
+    for result in results:
+        match, winner, bonus = int(result["match"]), str(result["winner"]).strip(), result.get("bonus")
+        if match not in fixtures:
+            raise ValueError(f"match {match} is not in the schedule")
+        date, home_team, away_team = fixtures[match]
+        if winner not in (home_team, away_team, "NR"):
+            raise ValueError(f"match {match} is {home_team} v {away_team}, not won by {winner}")
+        while len(rows) < match:
+            number = len(rows) + 1
+            rows.append([str(number), *fixtures[number], "", ""][:len(header)])
+        row = rows[match - 1] + [""] * (len(header) - len(rows[match - 1]))
+        row[header.index("Winner")] = winner
+        if "Bonus Points" in header:
+            row[header.index("Bonus Points")] = "" if bonus is None else str(int(bonus))
+        rows[match - 1] = row
+    output = io.StringIO()
+    writer = csv.writer(output, lineterminator=newline)
+    writer.writerow(header)
+    writer.writerows(rows)
+    updated = output.getvalue()
+    write_atomically(results_file, updated if content.endswith(newline) or not content else updated[:-len(newline)])
+
+def process_inbox(inbox_path, results_file, fixtures):
+    """Apply every dropped file in name order; returns (applied, rejected) file names."""
+    applied, rejected = [], []
+    for name in sorted(name for name in os.listdir(inbox_path) if name.endswith(".json")):
+        path = os.path.join(inbox_path, name)
+        try:
+            with open(path) as f:
+                results = json.load(f)
+            apply_results(results_file, fixtures, results if isinstance(results, list) else [results])
+            destination, done = "processed", applied
+        except (ValueError, KeyError, TypeError) as error:
+            destination, done = "rejected", rejected
+            with open(os.path.join(inbox_path, name + ".error"), "w") as f:
+                f.write(f"{error}\n")
+        os.makedirs(os.path.join(inbox_path, destination), exist_ok=True)
+        for moved in [name, name + ".error"]:
+            if os.path.exists(os.path.join(inbox_path, moved)):
+                shutil.move(os.path.join(inbox_path, moved), os.path.join(inbox_path, destination, moved))
+        done.append(name)
+    return applied, rejected
+
+def drop_result(inbox_path, result):
+    """Drop one result into the inbox the way an upstream feed would: written aside, then renamed in."""
+    os.makedirs(inbox_path, exist_ok=True)
+    name = f"{time.strftime('%Y%m%d-%H%M%S')}-match-{int(result['match']):03d}.json"
+    write_atomically(os.path.join(inbox_path, name), json.dumps(result))
+    return name
+
+def replay_results(source_file, results_file):
+    """Decided results of `source_file` that `results_file` does not have yet, in match order."""
+    source_df = pd.read_csv(source_file)
+    current_df = pd.read_csv(results_file)
+    decided = set(current_df.loc[current_df["Winner"].notna(), "Match #"].astype(int))
+    pending = source_df[source_df["Winner"].notna() & ~source_df["Match #"].astype(int).isin(decided)]
+    return [{"match": int(row["Match #"]), "winner": row["Winner"],
+             "bonus": None if pd.isna(row.get("Bonus Points")) else int(row["Bonus Points"])}
+            for _, row in pending.iterrows()]
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply match results dropped into an inbox folder to Results.csv.")
+    parser.add_argument("--base-path", default=os.path.dirname(os.path.abspath(__file__)))
+    parser.add_argument("--inbox", help="folder results are dropped into (default: The Results/inbox)")
+    parser.add_argument("--watch", action="store_true", help="keep applying new drops instead of exiting")
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between inbox checks with --watch")
+    parser.add_argument("--replay", metavar="RESULTS_CSV", help="drop the results this file has and the league lacks")
+    parser.add_argument("--every", type=float, default=5.0, help="seconds between replayed drops")
+    args = parser.parse_args()
+
+    results_file = os.path.join(args.base_path, "The Results", "Results.csv")
+    schedule_path = sorted(os.path.join(args.base_path, "The Schedule", name)
+                           for name in os.listdir(os.path.join(args.base_path, "The Schedule")) if name.endswith(".csv"))[-1]
+    inbox_path = args.inbox or os.path.join(args.base_path, "The Results", "inbox")
+    os.makedirs(inbox_path, exist_ok=True)
+    fixtures = read_fixtures(schedule_path)
+    pending = replay_results(args.replay, results_file) if args.replay else []
+    try:
+        while True:
+            if pending:
+                print(f"Dropped {drop_result(inbox_path, pending.pop(0))}")
+            applied, rejected = process_inbox(inbox_path, results_file, fixtures)
+            for name in applied:
+                print(f"Applied {name}")
+            for name in rejected:
+                print(f"Rejected {name} (see rejected/{name}.error)")
+            if not (args.watch or pending):
+                break
+            time.sleep(args.every if pending else args.interval)
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""Move every gamble and result onto a rescheduled fixture list.
+
+    python ScheduleMigration.py "new schedule.csv" --dry-run
+    python ScheduleMigration.py "new schedule.csv"
+    python ScheduleMigration.py --rollback
+"""
+import argparse
+import csv
+import hashlib
+import io
+import json
+import os
+import shutil
+import time
+import uuid
+from collections import defaultdict, namedtuple
+import numpy as np
+import pandas as pd
+import IncrementalScoring
+import LeagueRegistry
+import PredictionStore
+
+BACKUP_FOLDER = ".schedule_migration"
+
+MigrationPlan = namedtuple("MigrationPlan", ["source", "moves", "schedule_path", "new_schedule_path", "files", "results_file", "notes"])
+
+def read_schedule(schedule_path):
+    """(home teams, away teams, dates) of a schedule CSV, tolerating its padded headers."""
+    schedule_df = pd.read_csv(schedule_path)
+    home_teams, away_teams = PredictionStore.schedule_teams(schedule_df)
+    dates = schedule_df.rename(columns=lambda column: column.strip())["Date"].str.strip().tolist()
+    return home_teams, away_teams, dates
+
+def fixture_permutation(old_schedule, new_schedule):
+    """For every match of the new schedule, the row of the same fixture in the old one.
+
+    Fixtures are matched on (home, away). A pair that is scheduled more than once (a league game and a
+    playoff between the same sides) is matched first where it did not move, then on its date, and then in
+    order of appearance; those last matches are listed in the notes since they are a guess.
+    """
+    old_home, old_away, old_dates = old_schedule
+    new_home, new_away, new_dates = new_schedule
+    if len(old_home) != len(new_home):
+        raise ValueError(f"the old schedule has {len(old_home)} matches and the new one {len(new_home)}")
+    old_fixtures = list(zip(old_home, old_away))
+    new_fixtures = list(zip(new_home, new_away))
+    source = np.full(len(new_fixtures), -1)
+    unmatched = defaultdict(list)
+    for old_row, fixture in enumerate(old_fixtures):
+        unmatched[fixture].append(old_row)
+    stages = [
+        lambda new_row, old_row: old_row == new_row,
+        lambda new_row, old_row: old_dates[old_row] == new_dates[new_row],
+        lambda new_row, old_row: True,
+    ]
+    notes = []
+    for stage, same in enumerate(stages):
+        for new_row, fixture in enumerate(new_fixtures):
+            if source[new_row] >= 0:
+                continue
+            candidates = [old_row for old_row in unmatched[fixture] if same(new_row, old_row)]
+            if not candidates:
+                continue
+            source[new_row] = candidates[0]
+            unmatched[fixture].remove(candidates[0])
+            if stage == len(stages) - 1 and len(candidates) > 1:
+                notes.append(f"{fixture[0]} v {fixture[1]} is scheduled more than once; "
+                             f"match {new_row + 1} was taken to be old match {candidates[0] + 1}")
+    missing = [f"{home} v {away}" for new_row, (home, away) in enumerate(new_fixtures) if source[new_row] < 0]
+    if missing:
+        raise ValueError("fixtures not in the old schedule: " + ", ".join(missing))
+    return source, notes
+
+def line_ending(content):
+    return "\r\n" if "\r\n" in content else "\n"
+
+def permute_files(contents, source):
+    """Reorder the first len(source) lines of many files at once.
+
+    The picks of all files are stacked into one array and reordered with a single fancy index. Lines past
+    the schedule are kept; a file too short for the schedule is padded with blank picks only as far as a
+    moved pick needs.
+    """
+    num_matches = len(source)
+    newlines = [line_ending(content) for content in contents]
+    split = [content.split(newline) for content, newline in zip(contents, newlines)]
+    trailing_newline = [lines[-1] == "" and len(lines) > 1 for lines in split]
+    split = [lines[:-1] if ending else lines for lines, ending in zip(split, trailing_newline)]
+    picks = np.full((len(split), num_matches), "", dtype=object)
+    for row, lines in enumerate(split):
+        picks[row, :min(len(lines), num_matches)] = lines[:num_matches]
+    picks = picks[:, source]
+    permuted = []
+    for row, lines in enumerate(split):
+        new_lines = picks[row].tolist() + lines[num_matches:]
+        while len(new_lines) > len(lines) and new_lines[-1] == "":
+            new_lines.pop()
+        permuted.append(newlines[row].join(new_lines) + (newlines[row] if trailing_newline[row] else ""))
+    return permuted
+
+def permute_results(content, source, new_schedule):
+    """Results.csv rows in the new match order, renumbered and redated from the new schedule.
+
+    A table filled in only as far as the matches played so far is permuted too: a result moved ahead of
+    matches with no row yet gets blank rows (fixture, no winner) before it, and the table still ends at
+    its last result. A table with more rows than the schedule cannot be placed and is refused.
+    """
+    rows = list(csv.reader(io.StringIO(content)))
+    header, rows = rows[0], [row for row in rows[1:] if row]
+    if len(rows) > len(source):
+        raise ValueError(f"Results.csv has {len(rows)} rows but the schedule only {len(source)} matches")
+    new_home, new_away, new_dates = new_schedule
+    present = np.flatnonzero(np.asarray(source) < len(rows))
+    num_rows = int(present[-1]) + 1 if len(present) else 0
+    newline = line_ending(content)
+    output = io.StringIO()
+    writer = csv.writer(output, lineterminator=newline)
+    writer.writerow(header)
+    for new_row, old_row in enumerate(source[:num_rows]):
+        if old_row < len(rows):
+            writer.writerow([str(new_row + 1), new_dates[new_row]] + rows[old_row][2:])
+        else:
+            writer.writerow([str(new_row + 1), new_dates[new_row], new_home[new_row], new_away[new_row]] + [""] * (len(header) - 4))
+    permuted = output.getvalue()
+    return permuted if content.endswith(newline) else permuted[:-len(newline)]
+
+def gamble_files(base_path, schedule_path):
+    """Every gamble file of every league under `base_path` that is played on `schedule_path`."""
+    files = []
+    for league in LeagueRegistry.discover_leagues([base_path]).values():
+        if os.path.abspath(league.schedule_path) != os.path.abspath(schedule_path):
+            continue
+        for predictions_path in filter(None, [league.predictions_path, league.old_predictions_path]):
+            files.extend(sorted(os.path.join(predictions_path, name) for name in os.listdir(predictions_path) if name.endswith(".txt")))
+    return files
+
+def plan_migration(base_path, new_schedule_path, schedule_path=None):
+    """What migrating `base_path` onto the new schedule would change, without touching any file."""
+    schedule_path = schedule_path or LeagueRegistry.find_season_file(base_path, base_path, "The Schedule", "*.csv")
+    if schedule_path is None:
+        raise ValueError(f"no schedule under {base_path}")
+    new_schedule = read_schedule(new_schedule_path)
+    source, notes = fixture_permutation(read_schedule(schedule_path), new_schedule)
+    moves = [(int(old_row) + 1, new_row + 1, new_schedule[0][new_row], new_schedule[1][new_row])
+             for new_row, old_row in enumerate(source) if old_row != new_row]
+    results_file = LeagueRegistry.find_season_file(base_path, base_path, "The Results", "Results.csv")
+    return MigrationPlan(source, moves, schedule_path, new_schedule_path, gamble_files(base_path, schedule_path), results_file, notes)
+
+def content_digest(content):
+    return hashlib.sha1(content.encode()).hexdigest()
+
+def read_text(path):
+    with open(path, "r", newline="") as f:
+        return f.read()
+
+def write_text(path, content):
+    """Write through a uniquely named temporary file so a reader never sees half a file."""
+    def write(temporary_path):
+        with open(temporary_path, "w", newline="") as f:
+            f.write(content)
+    IncrementalScoring.write_atomically(path, write)
+
+def write_all(contents):
+    """Write many files through write_text; returns the paths written and the error that stopped it, if any."""
+    written = []
+    for path, content in contents.items():
+        try:
+            write_text(path, content)
+        except OSError as error:
+            return written, error
+        written.append(path)
+    return written, None
+
+def restore(backup_path, base_path, paths):
+    with open(os.path.join(backup_path, "originals.json")) as f:
+        originals = json.load(f)
+    _, error = write_all({os.path.join(base_path, path): originals[path] for path in paths})
+    if error is not None:
+        raise error
+
+def new_migration_id():
+    """Timestamp down to the microsecond, so ids sort in the order migrations ran, plus a random suffix."""
+    now = time.time()
+    return f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(now))}-{int(now * 1e6) % 1_000_000:06d}-{uuid.uuid4().hex[:8]}"
+
+def apply_migration(plan, base_path):
+    """Rewrite every gamble, the results and the schedule, keeping the originals for rollback.
+
+    New contents are computed in one batch before anything is written. The originals are kept in one
+    file rather than thousands of copies; if writing fails part way, the files already written are put
+    back. A results table that cannot be moved stops the migration before anything is written. Returns the
+    migration id, or None when nothing changes.
+    """
+    new_schedule = read_schedule(plan.new_schedule_path)
+    originals = {path: read_text(path) for path in plan.files}
+    updates = dict(zip(plan.files, permute_files(list(originals.values()), plan.source)))
+    if plan.results_file is not None:
+        originals[plan.results_file] = read_text(plan.results_file)
+        updates[plan.results_file] = permute_results(originals[plan.results_file], plan.source, new_schedule)
+    originals[plan.schedule_path] = read_text(plan.schedule_path)
+    updates[plan.schedule_path] = read_text(plan.new_schedule_path)
+    updates = {path: content for path, content in updates.items() if content != originals[path]}
+    if not updates:
+        return None
+
+    migration_id = new_migration_id()
+    backup_path = os.path.join(base_path, BACKUP_FOLDER, migration_id)
+    relative = {path: os.path.relpath(path, base_path) for path in updates}
+    os.makedirs(backup_path)
+    with open(os.path.join(backup_path, "originals.json"), "w") as f:
+        json.dump({relative[path]: originals[path] for path in updates}, f)
+    written, error = write_all(updates)
+    if error is not None:
+        write_all({path: originals[path] for path in written})
+        shutil.rmtree(backup_path)
+        raise error
+    manifest = {"id": migration_id, "moves": plan.moves,
+                "files": {relative[path]: content_digest(content) for path, content in updates.items()}}
+    with open(os.path.join(backup_path, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return migration_id
+
+def migrations(base_path):
+    """Ids of the completed migrations that can still be rolled back, oldest first."""
+    backups_path = os.path.join(base_path, BACKUP_FOLDER)
+    if not os.path.isdir(backups_path):
+        return []
+    return sorted(name for name in os.listdir(backups_path) if os.path.exists(os.path.join(backups_path, name, "manifest.json")))
+
+def rollback(base_path, migration_id=None, force=False):
+    """Put back the files a migration (the latest by default) rewrote, and forget it.
+
+    Files edited since the migration are not overwritten unless `force` is set.
+    """
+    available = migrations(base_path)
+    if not available:
+        raise ValueError("no migration to roll back")
+    migration_id = migration_id or available[-1]
+    if migration_id not in available:
+        raise ValueError(f"no migration {migration_id} to roll back")
+    backup_path = os.path.join(base_path, BACKUP_FOLDER, migration_id)
+    with open(os.path.join(backup_path, "manifest.json")) as f:
+        manifest = json.load(f)
+    paths = [path for path in manifest["files"] if os.path.exists(os.path.join(base_path, path))]
+    current = {os.path.join(base_path, path): read_text(os.path.join(base_path, path)) for path in paths}
+    edited = [path for path, digest in manifest["files"].items()
+              if path not in paths or content_digest(current[os.path.join(base_path, path)]) != digest]
+    if edited and not force:
+        raise ValueError("edited since the migration: " + ", ".join(edited))
+    restore(backup_path, base_path, manifest["files"])
+    shutil.rmtree(backup_path)
+    return manifest
+
+def main():
+    parser = argparse.ArgumentParser(description="Move gambles and results onto a rescheduled fixture list.")
+    parser.add_argument("new_schedule", nargs="?", help="the rescheduled fixture list (CSV, same layout as The Schedule)")
+    parser.add_argument("--base-path", default=os.path.dirname(os.path.abspath(__file__)))
+    parser.add_argument("--schedule", help="the schedule the gambles currently follow (default: the one under --base-path)")
+    parser.add_argument("--dry-run", action="store_true", help="show what would move without writing anything")
+    parser.add_argument("--rollback", nargs="?", const="", metavar="ID", help="undo a migration (default: the latest)")
+    parser.add_argument("--force", action="store_true", help="roll back even files edited since the migration")
+    args = parser.parse_args()
+    try:
+        run(parser, args)
+    except ValueError as error:
+        parser.exit(1, f"{error}\n")
+
+def run(parser, args):
+    if args.rollback is not None:
+        manifest = rollback(args.base_path, args.rollback or None, args.force)
+        print(f"Rolled back migration {manifest['id']}: {len(manifest['files'])} file(s) restored")
+        return
+    if args.new_schedule is None:
+        parser.error("a new schedule is required unless --rollback is given")
+    plan = plan_migration(args.base_path, args.new_schedule, args.schedule)
+    for old_match, new_match, home_team, away_team in plan.moves:
+        print(f"Match {old_match:>3} -> {new_match:>3}  {home_team} v {away_team}")
+    for note in plan.notes:
+        print(f"Note: {note}")
+    if args.dry_run:
+        print(f"{len(plan.moves)} match(es) would move in {len(plan.files)} gamble file(s); nothing written")
+        return
+    migration_id = apply_migration(plan, args.base_path)
+    if migration_id is None:
+        print("The new schedule matches the current one; nothing to migrate")
+    else:
+        print(f"Migration {migration_id}: {len(plan.moves)} match(es) moved in {len(plan.files)} gamble file(s); "
+              f"undo with --rollback {migration_id}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+import numpy as np
+import pandas as pd
+from collections import namedtuple
+
+MISSING = -1     # participant has no pick (or an empty line) for the match
+NO_RESULT = -2   # match was washed out ("NR")
+UNPLAYED = -3    # match has no winner yet
+LEAGUE_MATCHES = 70
+
+Season = namedtuple("Season", ["participants", "teams", "pick_codes", "home_codes", "away_codes", "winner_codes", "bonus_points"])
+
+def build_team_index(*team_lists):
+    """Assign a small integer code to every team name seen in the given lists."""
+    team_index = {}
+    for teams in team_lists:
+        for team in teams:
+            if isinstance(team, str) and team and team != "NR" and team not in team_index:
+                team_index[team] = len(team_index)
+    return team_index
+
+def encode_predictions(predictions, team_index, num_matches):
+    """Encode participant predictions as a participants x matches matrix of team codes."""
+    if not isinstance(predictions, dict):
+        return encode_store(predictions, team_index, num_matches)
+    participants = list(predictions.keys())
+    pick_codes = np.full((len(participants), num_matches), MISSING, dtype=np.int16)
+    lengths = np.array([min(len(predicted_winners), num_matches) for predicted_winners in predictions.values()], dtype=int)
+    picks = [team for predicted_winners in predictions.values() for team in predicted_winners[:num_matches]]
+    pick_codes[np.arange(num_matches) < lengths[:, None]] = pd.Index(list(team_index)).get_indexer(picks)
+    return participants, pick_codes
+
+def encode_store(store, team_index, num_matches):
+    """Re-key a PredictionStore's pick codes onto `team_index` without going back to team names."""
+    remap = np.array([team_index.get(team, MISSING) for team in store.teams] + [MISSING], dtype=np.int16)
+    pick_codes = np.full((len(store.participants), num_matches), MISSING, dtype=np.int16)
+    width = min(num_matches, store.num_matches)
+    pick_codes[:, :width] = remap[store.codes[:, :width]]
+    return list(store.participants), pick_codes
+
+def encode_winners(winners, team_index):
+    """Encode a column of match winners, keeping NR and unplayed matches distinct."""
+    codes = np.full(len(winners), UNPLAYED, dtype=np.int16)
+    for i, team in enumerate(winners):
+        if team == "NR":
+            codes[i] = NO_RESULT
+        elif isinstance(team, str):
+            codes[i] = team_index.get(team, MISSING)
+    return codes
+
+def encode_season(results_df, predictions):
+    """Encode every row of the results table (played or not) together with the participants' picks."""
+    team_index = build_team_index(results_df["Home Team"], results_df["Away Team"], results_df["Winner"].dropna())
+    participants, pick_codes = encode_predictions(predictions, team_index, len(results_df))
+    if "Bonus Points" in results_df.columns:
+        bonus_points = results_df["Bonus Points"].fillna(0).to_numpy()
+    else:
+        bonus_points = np.zeros(len(results_df), dtype=int)
+    return Season(
+        participants=participants,
+        teams=list(team_index),
+        pick_codes=pick_codes,
+        home_codes=encode_winners(results_df["Home Team"], team_index),
+        away_codes=encode_winners(results_df["Away Team"], team_index),
+        winner_codes=encode_winners(results_df["Winner"], team_index),
+        bonus_points=bonus_points,
+    )
+
+def played_scores(season):
+    """Total points every participant has already banked from completed matches."""
+    played = season.winner_codes != UNPLAYED
+    points, _, _ = score_matrix(season.pick_codes[:, played], season.winner_codes[played], season.bonus_points[played])
+    return points.sum(axis=1)
+
+def remaining_fixture_points(season, away_bonus=4, home_bonus=0):
+    """Points each participant would earn on every unplayed match if the home or the away team won it.
+
+    Unplayed rows carry no bonus yet, so by default an away win is credited with the flat away bonus.
+    Either bonus may instead be an array with one entry per unplayed match (see Standings.projected_bonuses).
+    """
+    unplayed = np.flatnonzero(season.winner_codes == UNPLAYED)
+    pick_codes = season.pick_codes[:, unplayed]
+    home_points = np.where(pick_codes == season.home_codes[unplayed], 10 + np.asarray(home_bonus), 0)
+    away_points = np.where(pick_codes == season.away_codes[unplayed], 10 + np.asarray(away_bonus), 0)
+    return unplayed, home_points, away_points
+
+def score_matrix(pick_codes, winner_codes, bonus_points):
+    """Points earned by every participant on every completed match, plus the correct-pick mask."""
+    no_result = winner_codes == NO_RESULT
+    correct = (pick_codes == winner_codes) & (winner_codes >= 0)
+    points = np.where(no_result, 5, np.where(correct, 10 + bonus_points, 0))
+    return points, correct, no_result
+
+def longest_runs(mask):
+    """Longest run of True per row and the column where its latest occurrence ends."""
+    num_rows, num_cols = mask.shape
+    if num_cols == 0:
+        return np.zeros(num_rows, dtype=int), np.full(num_rows, -1)
+    columns = np.arange(num_cols)
+    last_break = np.maximum.accumulate(np.where(mask, -1, columns), axis=1)
+    runs = columns - last_break
+    longest = runs.max(axis=1)
+    run_end = num_cols - 1 - np.argmax((runs == longest[:, None])[:, ::-1], axis=1)
+    return longest, run_end
+
+def dense_ranks(totals):
+    """Dense rank (1 = top) of every column within its row of `totals`, e.g. participants within a season."""
+    order = np.argsort(-totals, axis=1, kind="stable").astype(np.int32)
+    sorted_totals = np.take_along_axis(totals, order, axis=1)
+    new_value = np.ones(sorted_totals.shape, dtype=np.int32)
+    new_value[:, 1:] = sorted_totals[:, 1:] != sorted_totals[:, :-1]
+    ranks = np.empty(totals.shape, dtype=np.int32)
+    np.put_along_axis(ranks, order, np.cumsum(new_value, axis=1, dtype=np.int32), axis=1)
+    return ranks
+
+def streak_periods(longest, run_end, streak_columns, dates):
+    """Format 'start - end' date spans for each participant's longest streak."""
+    periods = []
+    for length, end in zip(longest, run_end):
+        if length == 0:
+            periods.append("")
+            continue
+        end_position = streak_columns[end]
+        periods.append(dates[end_position - length + 1] + " - " + dates[end_position])
+    return periods
+
+def calculate_scores(results_df, predictions):
+    """Calculate leaderboard scores, accuracy, matchwise points, total predicted points, and bonus points."""
+    completed_matches = results_df.dropna(subset=["Winner"])
+    match_index = completed_matches.index.to_numpy()
+    total_matches = len(completed_matches)
+    num_matches = int(match_index.max()) + 1 if total_matches > 0 else 0
+
+    team_index = build_team_index(completed_matches["Winner"])
+    participants, pick_codes = encode_predictions(predictions, team_index, num_matches)
+    pick_codes = pick_codes[:, match_index]
+    winner_codes = encode_winners(completed_matches["Winner"], team_index)
+    if "Bonus Points" in completed_matches.columns:
+        bonus_points = completed_matches["Bonus Points"].to_numpy()
+    else:
+        bonus_points = np.zeros(total_matches, dtype=int)
+
+    points, correct, no_result = score_matrix(pick_codes, winner_codes, bonus_points)
+    league_stage = match_index < LEAGUE_MATCHES
+    scores = points.sum(axis=1)
+    correct_predictions = correct.sum(axis=1)
+    total_predicted_points = (correct & league_stage).sum(axis=1) * 10
+    total_bonus_points = (correct & league_stage) @ bonus_points if total_matches > 0 else np.zeros(len(participants), dtype=int)
+    cumulative = np.cumsum(points, axis=1)
+
+    # NR matches neither extend nor break a streak, so streaks are measured over the decided matches only
+    decided = np.flatnonzero(~no_result)
+    dates = completed_matches["Date"].tolist()
+    longest_winning, winning_end = longest_runs(correct[:, decided])
+    longest_losing, losing_end = longest_runs(~correct[:, decided])
+    winning_periods = streak_periods(longest_winning, winning_end, decided, dates)
+    losing_periods = streak_periods(longest_losing, losing_end, decided, dates)
+
+    totals = {
+        "Points": scores,
+        "Predicted Points": total_predicted_points,
+        "Bonus Points": total_bonus_points,
+        "Longest Winning Streak": longest_winning,
+        "Longest Losing Streak": longest_losing,
+        "Winning Period": winning_periods,
+        "Losing Period": losing_periods,
+        "Correct Predictions": correct_predictions,
+    }
+    return build_leaderboard(participants, points, correct, no_result, cumulative, totals)
+
+def build_leaderboard(participants, points, correct, no_result, cumulative, totals):
+    """Assemble the leaderboard DataFrame and progression dict from per-match matrices and per-participant totals."""
+    total_matches = points.shape[1]
+    symbols = np.where(no_result[-5:], "➖", np.where(correct[:, -5:], "✅", "❌"))
+
+    leaderboard = []
+    points_progression = {}
+    for p, participant in enumerate(participants):
+        matchwise_points = points[p].tolist()
+        accuracy = (totals["Correct Predictions"][p] / total_matches) * 100 if total_matches > 0 else 0
+        leaderboard.append({
+            "Participant": participant,
+            "Points": totals["Points"][p],
+            "Accuracy (%)": round(accuracy, 2),
+            "Predicted Points": totals["Predicted Points"][p],
+            "Bonus Points": totals["Bonus Points"][p],
+            "Matchwise Points (All)": matchwise_points,
+            "Matchwise Points (Last 5)": matchwise_points[-5:],
+            "Last 5 Matches": " ".join(symbols[p]),
+            "Longest Winning Streak": totals["Longest Winning Streak"][p],
+            "Longest Losing Streak": totals["Longest Losing Streak"][p],
+            "Winning Period": totals["Winning Period"][p],
+            "Losing Period": totals["Losing Period"][p],
+            "Correct Predictions": totals["Correct Predictions"][p],
+        })
+        points_progression[participant] = [0] + cumulative[p].tolist()
+
+    return pd.DataFrame(leaderboard).sort_values(by="Points", ascending=False), points_progression
+
+def compare_scores(scores, reference):
+    """Names of the leaderboard columns (and the progression) that differ between two calculate_scores outputs."""
+    leaderboard_df, points_progression = scores
+    reference_df, reference_progression = reference
+    leaderboard_df = leaderboard_df.set_index("Participant").sort_index()
+    reference_df = reference_df.set_index("Participant").sort_index()
+    mismatches = [column for column in reference_df.columns if leaderboard_df[column].tolist() != reference_df[column].tolist()]
+    if points_progression != reference_progression:
+        mismatches.append("Points Progression")
+    return mismatches
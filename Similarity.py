@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import PredictionStore
+
+def side_matrices(store):
+    """Float32 participants x matches matrices marking home and away picks (neither for anything else)."""
+    sides = store.sides()
+    return (sides == 0).astype(np.float32), (sides == 1).astype(np.float32)
+
+def pairwise_agreement(store):
+    """Participants x participants counts of matches two participants picked alike, and of matches both picked.
+
+    With home picks as +1 and away picks as -1, the product of two pick rows is the number of agreements minus
+    disagreements, so the whole matrix is one matrix product instead of a loop over pairs. The Hamming distance
+    between two participants is `compared - agreed`. Counts are float32, which is exact at season sizes.
+    """
+    home, away = side_matrices(store)
+    signed = home - away
+    picked = home + away
+    if picked.all():
+        compared = np.full((len(store.participants), len(store.participants)), picked.shape[1], dtype=np.float32)
+    else:
+        compared = picked @ picked.T
+    agreed = (compared + signed @ signed.T) / 2
+    return agreed, compared
+
+def agreement_matrix(store):
+    """Share (%) of commonly picked matches each pair of participants picked the same way."""
+    agreed, compared = pairwise_agreement(store)
+    share = np.divide(agreed * np.float32(100), compared, out=np.full(agreed.shape, np.nan, dtype=np.float32), where=compared > 0)
+    return pd.DataFrame(share.round(1), index=store.participants, columns=store.participants)
+
+def pick_counts(store):
+    """Home and away pick counts of every scheduled match."""
+    sides = store.sides()
+    return (sides == 0).sum(axis=0), (sides == 1).sum(axis=0)
+
+def consensus_entropy(home_counts, away_counts):
+    """Binary entropy (bits) of the pool's split on each match: 0 when unanimous, 1 for an even split."""
+    total = home_counts + away_counts
+    entropy = np.zeros(len(total))
+    for counts in (home_counts, away_counts):
+        share = np.divide(counts, total, out=np.zeros(len(total)), where=total > 0)
+        entropy -= share * np.log2(share, out=np.zeros(len(total)), where=share > 0)
+    return entropy
+
+def match_consensus(store, schedule_df):
+    """Per scheduled match: how the pool split and how contested the pick was."""
+    home_teams, away_teams = PredictionStore.schedule_teams(schedule_df)
+    home_counts, away_counts = pick_counts(store)
+    total = home_counts + away_counts
+    return pd.DataFrame({
+        "Match": np.arange(1, len(home_counts) + 1),
+        "Home Team": home_teams,
+        "Away Team": away_teams,
+        "Home Picks": home_counts,
+        "Away Picks": away_counts,
+        "Majority %": np.divide(np.maximum(home_counts, away_counts) * 100.0, total,
+                                out=np.zeros(len(total)), where=total > 0).round(1),
+        "Entropy": consensus_entropy(home_counts, away_counts).round(3),
+    })
+
+def contrarian_scores(store, agreement_df=None):
+    """How often each participant sided against the rest of the pool, and who they agree with most.
+
+    The contrarian score is the average share of the other participants who picked the opposite side,
+    over the matches the participant picked: 0 means always with the crowd, 100 always against it.
+    """
+    sides = store.sides()
+    home_counts, away_counts = pick_counts(store)
+    same_side = np.where(sides == 0, home_counts, away_counts) - 1
+    others = (home_counts + away_counts) - 1
+    picked = (sides >= 0) & (others > 0)
+    against = np.where(picked, 1 - same_side / np.maximum(others, 1), 0)
+    num_picked = picked.sum(axis=1)
+    contrarian = np.divide(against.sum(axis=1) * 100.0, num_picked, out=np.zeros(len(num_picked)), where=num_picked > 0)
+    scores_df = pd.DataFrame({"Participant": store.participants, "Contrarian Score": contrarian.round(1)})
+    if agreement_df is None:
+        agreement_df = agreement_matrix(store)
+    if len(store.participants) > 1:
+        share = agreement_df.to_numpy(copy=True)
+        np.fill_diagonal(share, -np.inf)
+        closest = np.argmax(np.nan_to_num(share, nan=-np.inf), axis=1)
+        scores_df["Most Similar To"] = np.array(store.participants, dtype=object)[closest]
+        scores_df["Agreement %"] = share[np.arange(len(closest)), closest]
+    return scores_df.sort_values(by="Contrarian Score", ascending=False).reset_index(drop=True)
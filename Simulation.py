@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+import ScoringEngine
+import Standings
+
+MAX_SIMULATIONS = 1_000_000
+MIN_SIMULATIONS = 10_000
+SIMULATION_BUDGET = 10_000_000  # simulated participant-seasons per refresh (seasons x participants)
+MAX_BATCH_ELEMENTS = 2_000_000  # seasons x participants held in memory by one batch
+
+def simulation_sizes(num_participants, num_simulations=None, batch_size=None):
+    """Seasons to simulate and seasons per batch for a pool of this size.
+
+    The work and memory of a batch grow with seasons x participants, so the default number of seasons
+    shrinks as the pool grows (up to a million for a small league, ten thousand from a thousand participants
+    on) and batches are cut to keep every array of a batch near MAX_BATCH_ELEMENTS entries.
+    """
+    num_participants = max(1, num_participants)
+    if num_simulations is None:
+        num_simulations = min(MAX_SIMULATIONS, max(MIN_SIMULATIONS, SIMULATION_BUDGET // num_participants))
+    if batch_size is None:
+        batch_size = max(1, MAX_BATCH_ELEMENTS // num_participants)
+    return num_simulations, min(batch_size, num_simulations)
+
+def simulate_batch(base_scores, home_points, away_points, home_win_probability, nr_probability, num_simulations, seed):
+    """Simulate one batch of completions and count how often each participant lands on each rank."""
+    rng = np.random.default_rng(seed)
+    num_participants, num_remaining = home_points.shape
+    uniform = rng.random((num_simulations, num_remaining), dtype=np.float32)
+    home_wins = uniform < home_win_probability * (1 - nr_probability)
+    away_wins = uniform < 1 - nr_probability
+    away_wins &= ~home_wins
+    no_results = (num_remaining - home_wins.sum(axis=1) - away_wins.sum(axis=1)).astype(np.float32)
+
+    totals = base_scores.astype(np.float32) + 5 * no_results[:, None]
+    totals += home_wins.astype(np.float32) @ home_points.T.astype(np.float32)
+    totals += away_wins.astype(np.float32) @ away_points.T.astype(np.float32)
+
+    ranks = ScoringEngine.dense_ranks(totals)
+    index_type = np.int32 if num_participants * num_participants < 2**31 else np.int64
+    flat = np.arange(num_participants, dtype=index_type) * num_participants + (ranks - 1).astype(index_type, copy=False)
+    return np.bincount(flat.ravel(), minlength=num_participants * num_participants).reshape(num_participants, num_participants)
+
+def simulate_rank_probabilities(results_df, predictions, num_simulations=None, batch_size=None, seed=None,
+                                workers=None, home_win_probability=0.5, nr_probability=0.0, standings=None):
+    """Monte Carlo estimate of each participant's probability of finishing in each rank.
+
+    Unplayed rows of the results table are filled with random winners (optionally per-match home win
+    probabilities and a washout rate) and every participant is rescored with the usual 10 / 5-for-NR rules,
+    a win earning its estimated bonus from Standings.fixture_bonuses (PLAYOFF_BONUS for a playoff whose
+    bonus has not been entered). Batches are seeded from one SeedSequence, so a given seed reproduces the same
+    numbers whether the batches run in-process or across a process pool of `workers`. Left out, the
+    number of seasons and the batch size follow the pool size (see simulation_sizes).
+    """
+    season = ScoringEngine.encode_season(results_df, predictions)
+    base_scores = ScoringEngine.played_scores(season)
+    bonuses = Standings.fixture_bonuses(results_df, standings)
+    unplayed, home_points, away_points = ScoringEngine.remaining_fixture_points(season, bonuses.away, bonuses.home)
+    home_win_probability = np.broadcast_to(np.asarray(home_win_probability, dtype=np.float32), (len(unplayed),))
+
+    num_participants = len(season.participants)
+    num_simulations, batch_size = simulation_sizes(num_participants, num_simulations, batch_size)
+    if len(unplayed) == 0:
+        num_simulations = batch_size = 1
+    batch_sizes = [batch_size] * (num_simulations // batch_size)
+    if num_simulations % batch_size:
+        batch_sizes.append(num_simulations % batch_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(batch_sizes))
+    batches = [(base_scores, home_points, away_points, home_win_probability, nr_probability, size, batch_seed)
+               for size, batch_seed in zip(batch_sizes, seeds)]
+
+    rank_counts = np.zeros((num_participants, num_participants), dtype=np.int64)
+    if workers and workers > 1 and len(batches) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for counts in executor.map(simulate_batch, *zip(*batches)):
+                rank_counts += counts
+    else:
+        for batch in batches:
+            rank_counts += simulate_batch(*batch)
+
+    rank_probabilities = pd.DataFrame(rank_counts / sum(batch_sizes), index=season.participants,
+                                      columns=range(1, num_participants + 1))
+    rank_probabilities.index.name = "Participant"
+    return rank_probabilities.sort_values(by=list(rank_probabilities.columns), ascending=False)
@@ -0,0 +1,134 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import IncrementalScoring
+import RankHistory
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # snapshots are an optimization; without pyarrow every start computes from the raw files
+    pa = pq = None
+
+SNAPSHOT_VERSION = 3
+
+def file_digest(path, digest=None):
+    digest = digest or hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest
+
+def input_hashes(results_path, predictions_path, schedule_path):
+    """Content hashes of everything a snapshot is computed from."""
+    predictions_digest = hashlib.sha1()
+    for filename in sorted(os.listdir(predictions_path)):
+        if filename.endswith(".txt"):
+            predictions_digest.update(filename.encode() + b"\0")
+            file_digest(os.path.join(predictions_path, filename), predictions_digest)
+    return {
+        "results": file_digest(os.path.join(results_path, "Results.csv")).hexdigest(),
+        "predictions": predictions_digest.hexdigest(),
+        "schedule": file_digest(schedule_path).hexdigest(),
+    }
+
+def snapshot_path_for(predictions_path):
+    """Where the snapshot of one gamble directory lives."""
+    predictions_path = os.path.normpath(predictions_path)
+    return os.path.join(os.path.dirname(predictions_path), ".snapshot", os.path.basename(predictions_path))
+
+def build_tables(scores, matchwise_df):
+    """The tables a snapshot holds, from calculate_scores' (leaderboard_df, points_progression) and matchwise_predictions.
+
+    The progression (in participant order) and the time spent at each rank share one rank history.
+    """
+    leaderboard_df, points_progression = scores
+    history = RankHistory.build_rank_history(points_progression)
+    return {
+        "leaderboard": leaderboard_df,
+        "progression": RankHistory.long_form(history).sort_index().reset_index(drop=True),
+        "time_spent": RankHistory.time_at_position(history),
+        "matchwise": matchwise_df,
+    }
+
+
+class Snapshot:
+    """The scored season of one gamble directory as a set of Parquet tables plus a manifest of input hashes.
+
+    Tables are read on demand and only for the requested columns. Without pyarrow the same interface is
+    served from the tables held in memory.
+    """
+
+    def __init__(self, path, manifest, tables=None):
+        self.path = path
+        self.manifest = manifest
+        self.tables = tables
+
+    def read(self, name, columns=None):
+        if self.tables is not None:
+            table = self.tables[name]
+            return (table[columns] if columns is not None else table).copy()
+        arrow_table = pq.read_table(os.path.join(self.path, name + ".parquet"), columns=columns)
+        df = arrow_table.to_pandas()
+        for field in arrow_table.schema:
+            if pa.types.is_list(field.type):
+                df[field.name] = [value.tolist() for value in df[field.name]]
+        return df
+
+    def points_progression(self):
+        """The {participant: [cumulative points, ...]} form calculate_scores returns."""
+        progression_df = self.read("progression", ["Participant", "Points"])
+        return {participant: group.tolist() for participant, group in progression_df.groupby("Participant", sort=False)["Points"]}
+
+
+def read_manifest(snapshot_path):
+    manifest_path = os.path.join(snapshot_path, "manifest.json")
+    if pq is None or not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    return manifest if manifest.get("version") == SNAPSHOT_VERSION else None
+
+def write_snapshot(snapshot_path, tables, hashes):
+    """Write every table into a new folder and then the manifest that points at it, which makes it current.
+
+    Nothing of the current snapshot is touched until the manifest is swapped, so a reader sees either the
+    old tables or the new ones. The folder the new manifest replaces is kept for readers still holding
+    the old one; anything older (or left by an interrupted write) is removed. Writers take turns through
+    the snapshot's lock file.
+    """
+    manifest = {"version": SNAPSHOT_VERSION, "inputs": hashes,
+                "tables": {name: {"rows": len(table), "columns": list(table.columns)} for name, table in tables.items()}}
+    if pq is None:
+        return Snapshot(None, manifest, tables)
+    with IncrementalScoring.locked(snapshot_path):
+        previous = read_manifest(snapshot_path)
+        tables_path = tempfile.mkdtemp(dir=snapshot_path, prefix="tables-")
+        for name, table in tables.items():
+            pq.write_table(pa.Table.from_pandas(table, preserve_index=False), os.path.join(tables_path, name + ".parquet"))
+        manifest["tables_folder"] = os.path.basename(tables_path)
+        def write_manifest(temporary_path):
+            with open(temporary_path, "w") as f:
+                json.dump(manifest, f, indent=2)
+        IncrementalScoring.write_atomically(os.path.join(snapshot_path, "manifest.json"), write_manifest)
+        keep = {"lock", "manifest.json", manifest["tables_folder"], previous and previous["tables_folder"]}
+        for name in os.listdir(snapshot_path):
+            path = os.path.join(snapshot_path, name)
+            if name in keep:
+                continue
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                os.remove(path)
+    return Snapshot(tables_path, manifest)
+
+def load_snapshot(results_path, predictions_path, schedule_path, build, snapshot_path=None):
+    """Open the snapshot when its inputs are unchanged, otherwise `build()` the tables and write a new one."""
+    snapshot_path = snapshot_path or snapshot_path_for(predictions_path)
+    hashes = input_hashes(results_path, predictions_path, schedule_path)
+    manifest = read_manifest(snapshot_path)
+    if manifest is not None and manifest["inputs"] == hashes:
+        return Snapshot(os.path.join(snapshot_path, manifest["tables_folder"]), manifest)
+    return write_snapshot(snapshot_path, build(), hashes)
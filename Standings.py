@@ -0,0 +1,228 @@
+from collections import namedtuple
+import numpy as np
+import pandas as pd
+import ScoringEngine
+
+AWAY_WIN_BONUS = 4
+WIN_POINTS = 2
+NO_RESULT_POINTS = 1
+RANKED_AFTER_MATCHES = 17  # league results in before rank differences count, as in the bonuses entered for 2025
+PLAYOFF_BONUS = 65  # assumed for a playoff win until its bonus is entered by hand (2025's were 40, 65, 65 and 90)
+
+FixtureBonuses = namedtuple("FixtureBonuses", ["rows", "home", "away", "home_low", "home_high", "away_low", "away_high"])
+
+def rank_difference_bonus(positions, winner, loser, away_win, ranked=True):
+    """The README rule: +4 for an away win, plus how far the winner stood below the loser in the table."""
+    return (AWAY_WIN_BONUS if away_win else 0) + (max(0, int(positions[winner] - positions[loser])) if ranked else 0)
+
+
+class StandingsTable:
+    """IPL points table kept in order as results are appended one at a time.
+
+    Teams are ordered by points, then wins (the results file carries no net run rate), then by the order
+    they reached that record. Applying a result only moves the teams involved up past the rows they now
+    outrank, so each match costs O(teams) instead of a re-sort. Bonuses use table positions, so the order
+    of reaching a record stands in for the net run rate that separates level teams in the real table. The
+    first RANKED_AFTER_MATCHES results earn only the away bonus: the table is too young to rank by.
+
+    Every applied match records the positions going into it, the bonus it derived and the points and
+    positions coming out of it.
+    """
+
+    def __init__(self, teams):
+        self.teams = list(teams)
+        self.team_index = {team: code for code, team in enumerate(self.teams)}
+        num_teams = len(self.teams)
+        self.played = np.zeros(num_teams, dtype=int)
+        self.won = np.zeros(num_teams, dtype=int)
+        self.lost = np.zeros(num_teams, dtype=int)
+        self.no_result = np.zeros(num_teams, dtype=int)
+        self.points = np.zeros(num_teams, dtype=int)
+        self.order = list(range(num_teams))
+        self.applied = []
+        self.positions_before = []
+        self.bonus_points = []
+        self.points_history = []
+        self.position_history = []
+
+    def key(self, code):
+        return (self.points[code], self.won[code])
+
+    def promote(self, code):
+        """Move a team up past every row it now outranks."""
+        position = self.order.index(code)
+        while position > 0 and self.key(self.order[position - 1]) < self.key(code):
+            self.order[position - 1], self.order[position] = code, self.order[position - 1]
+            position -= 1
+
+    def ranked(self):
+        """Whether the table has settled enough for position differences to earn bonuses."""
+        return len(self.applied) >= RANKED_AFTER_MATCHES
+
+    def positions(self):
+        positions = np.zeros(len(self.teams), dtype=int)
+        positions[self.order] = np.arange(1, len(self.teams) + 1)
+        return positions
+
+    def apply(self, home_team, away_team, winner):
+        """Add one league result ("NR" for a washout) and return the bonus it earned the winner."""
+        home, away = self.team_index[home_team], self.team_index[away_team]
+        positions, ranked = self.positions(), self.ranked()
+        self.played[[home, away]] += 1
+        if winner == "NR":
+            bonus = 0
+            self.no_result[[home, away]] += 1
+            self.points[[home, away]] += NO_RESULT_POINTS
+            self.promote(home)
+            self.promote(away)
+        else:
+            winner_code = self.team_index[winner]
+            loser_code = away if winner_code == home else home
+            bonus = rank_difference_bonus(positions, winner_code, loser_code, winner_code == away, ranked)
+            self.won[winner_code] += 1
+            self.lost[loser_code] += 1
+            self.points[winner_code] += WIN_POINTS
+            self.promote(winner_code)
+        self.applied.append((home_team, away_team, winner))
+        self.positions_before.append(positions)
+        self.bonus_points.append(bonus)
+        self.points_history.append(self.points.copy())
+        self.position_history.append(self.positions())
+        return bonus
+
+    def projected_bonuses(self, home_teams, away_teams, ranked=None):
+        """Bonus a home and an away win would earn in each fixture if it were played against today's table.
+
+        `ranked` says per fixture whether rank differences count by then (default: whether they do now).
+        """
+        home = np.array([self.team_index[team] for team in home_teams], dtype=int)
+        away = np.array([self.team_index[team] for team in away_teams], dtype=int)
+        ranked = np.broadcast_to(self.ranked() if ranked is None else ranked, home.shape)
+        positions = self.positions()
+        home_bonus = np.where(ranked, np.maximum(0, positions[home] - positions[away]), 0)
+        away_bonus = AWAY_WIN_BONUS + np.where(ranked, np.maximum(0, positions[away] - positions[home]), 0)
+        return home_bonus, away_bonus
+
+    def position_bounds(self, extra_matches):
+        """Best and worst position every team can hold after playing `extra_matches` more (one count per team).
+
+        Each of those matches may earn a team nothing or a win; teams that could end level are counted
+        on whichever side is worse, since the tie-break could go either way.
+        """
+        low_points = self.points
+        high_points = self.points + WIN_POINTS * np.asarray(extra_matches)
+        others = ~np.eye(len(self.teams), dtype=bool)
+        best = 1 + ((low_points[None, :] > high_points[:, None]) & others).sum(axis=1)
+        worst = 1 + ((high_points[None, :] >= low_points[:, None]) & others).sum(axis=1)
+        return best, worst
+
+    def table(self):
+        """The points table as it stands, top first."""
+        return pd.DataFrame({
+            "Position": np.arange(1, len(self.teams) + 1),
+            "Team": [self.teams[code] for code in self.order],
+            "Played": self.played[self.order],
+            "Won": self.won[self.order],
+            "Lost": self.lost[self.order],
+            "NR": self.no_result[self.order],
+            "Points": self.points[self.order],
+        })
+
+    def history(self):
+        """Points and table position of every team after each applied match, one row per match."""
+        index = pd.RangeIndex(1, len(self.applied) + 1, name="Match #")
+        points_df = pd.DataFrame(np.array(self.points_history).reshape(-1, len(self.teams)), index=index, columns=self.teams)
+        positions_df = pd.DataFrame(np.array(self.position_history).reshape(-1, len(self.teams)), index=index, columns=self.teams)
+        return points_df, positions_df
+
+
+def league_results(results_df):
+    """The decided league-stage rows (ahead of any unplayed one) as (home, away, winner) tuples."""
+    league_df = results_df.iloc[:ScoringEngine.LEAGUE_MATCHES]
+    decided = league_df["Winner"].notna().to_numpy()
+    num_decided = len(decided) if decided.all() else int(np.argmin(decided))
+    return list(league_df[["Home Team", "Away Team", "Winner"]].iloc[:num_decided].itertuples(index=False, name=None))
+
+def build_standings(results_df, standings=None):
+    """Standings after every decided league match, extending `standings` when it holds a prefix of them.
+
+    Appending results therefore costs O(teams) per new match; an edited earlier row rebuilds the table.
+    """
+    matches = league_results(results_df)
+    teams = sorted(ScoringEngine.build_team_index(results_df["Home Team"], results_df["Away Team"]))
+    if standings is None or standings.teams != teams or standings.applied != matches[:len(standings.applied)]:
+        standings = StandingsTable(teams)
+    for home_team, away_team, winner in matches[len(standings.applied):]:
+        standings.apply(home_team, away_team, winner)
+    return standings
+
+def derived_bonus_points(results_df, standings=None):
+    """Bonus of every results row under the README rule; NaN for playoff and undecided rows."""
+    standings = build_standings(results_df, standings)
+    bonus_points = np.full(len(results_df), np.nan)
+    bonus_points[:len(standings.bonus_points)] = standings.bonus_points
+    return pd.Series(bonus_points, index=results_df.index, name="Bonus Points")
+
+def playoff_bonus(results_df, position):
+    """The bonus a win earns on one playoff row: the one entered ahead of the result, or PLAYOFF_BONUS."""
+    if "Bonus Points" in results_df.columns and pd.notna(results_df["Bonus Points"].iloc[position]):
+        return float(results_df["Bonus Points"].iloc[position])
+    return PLAYOFF_BONUS
+
+def fixture_bonuses(results_df, standings=None):
+    """The bonus a home and an away win would earn on every unplayed row of the results, and its range.
+
+    This is the one bonus model for everything that looks ahead (simulation, solver, leverage, what-if).
+    A league fixture is estimated against today's table, as StandingsTable.projected_bonuses does, and
+    ranges over every table the matches before it could still produce: exact for the next fixture and
+    wider further out. Playoff bonuses are settled by hand: one entered on a row ahead of its result is
+    used for either winner; otherwise a win is estimated at PLAYOFF_BONUS and may earn anything from
+    nothing up, so its upper bound is infinite. `rows` are the positions of the unplayed rows.
+    """
+    standings = build_standings(results_df, standings)
+    rows = np.flatnonzero(results_df["Winner"].isna().to_numpy())
+    league = rows < ScoringEngine.LEAGUE_MATCHES
+    bonuses = {field: np.zeros(len(rows)) for field in FixtureBonuses._fields[1:]}
+    teams_df = results_df[["Home Team", "Away Team"]]
+    bonuses["home"][league], bonuses["away"][league] = standings.projected_bonuses(
+        teams_df["Home Team"].iloc[rows[league]], teams_df["Away Team"].iloc[rows[league]], rows[league] >= RANKED_AFTER_MATCHES)
+
+    # Every league row between the end of the table and a fixture is a match played before it
+    extra_matches = np.zeros(len(standings.teams), dtype=int)
+    counted = len(standings.applied)
+    for i in np.flatnonzero(league):
+        row = rows[i]
+        for home_team, away_team in teams_df.iloc[counted:row].itertuples(index=False):
+            extra_matches[[standings.team_index[home_team], standings.team_index[away_team]]] += 1
+        counted = row
+        home, away = standings.team_index[teams_df.iloc[row, 0]], standings.team_index[teams_df.iloc[row, 1]]
+        if row >= RANKED_AFTER_MATCHES:
+            best, worst = standings.position_bounds(extra_matches) if extra_matches.any() else (standings.positions(),) * 2
+            bonuses["home_low"][i], bonuses["home_high"][i] = max(0, best[home] - worst[away]), max(0, worst[home] - best[away])
+            bonuses["away_low"][i], bonuses["away_high"][i] = max(0, best[away] - worst[home]), max(0, worst[away] - best[home])
+        bonuses["away_low"][i] += AWAY_WIN_BONUS
+        bonuses["away_high"][i] += AWAY_WIN_BONUS
+
+    for i in np.flatnonzero(~league):
+        estimate = playoff_bonus(results_df, rows[i])
+        entered = "Bonus Points" in results_df.columns and pd.notna(results_df["Bonus Points"].iloc[rows[i]])
+        for side in ("home", "away"):
+            bonuses[side][i] = estimate
+            bonuses[side + "_low"][i] = estimate if entered else 0
+            bonuses[side + "_high"][i] = estimate if entered else np.inf
+    return FixtureBonuses(rows, **bonuses)
+
+def fill_bonus_points(results_df, standings=None):
+    """Results with every decided league row that has no hand-entered bonus given its derived one.
+
+    Entered bonuses are kept as they are: they were settled with net run rates this file does not carry.
+    """
+    if "Bonus Points" not in results_df.columns:
+        results_df = results_df.assign(**{"Bonus Points": np.nan})
+    missing = results_df["Bonus Points"].isna() & results_df["Winner"].notna()
+    if not missing.any():
+        return results_df
+    results_df = results_df.copy()
+    derived = derived_bonus_points(results_df, standings)
+    results_df["Bonus Points"] = results_df["Bonus Points"].fillna(derived.where(missing))
+    return results_df
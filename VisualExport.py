@@ -0,0 +1,137 @@
+import argparse
+import hashlib
+import json
+import os
+import queue
+import threading
+import plotly.io as pio
+import ExtractAndTransform
+import Analysis
+import Plotting
+import Standings
+
+def figure_digest(fig):
+    """Hash of everything that ends up in the image, so unchanged figures are not re-encoded."""
+    return hashlib.sha1(fig.to_json().encode()).hexdigest()
+
+
+class FigureExporter:
+    """Writes figure PNGs into a visuals folder off the request path.
+
+    Figures are queued with `submit`; a background thread drains the queue and renders every pending
+    image in one Kaleido session. A manifest of figure digests next to the images lets unchanged figures
+    skip the renderer entirely. `errors` holds the last failure of each file until it is written again.
+    """
+
+    def __init__(self, visuals_path, scale=4, batch_window=0.5):
+        self.visuals_path = visuals_path
+        self.scale = scale
+        self.batch_window = batch_window
+        self.manifest_path = os.path.join(visuals_path, ".export_manifest.json")
+        self.manifest = {}
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path) as f:
+                self.manifest = json.load(f)
+        self.jobs = queue.Queue()
+        self.pending = {}
+        self.failed = {}
+        self.errors = {}
+        self.lock = threading.Lock()
+        self.worker = None
+
+    def is_current(self, filename, digest):
+        return self.manifest.get(filename) == digest and os.path.exists(os.path.join(self.visuals_path, filename))
+
+    def submit(self, fig, filename):
+        """Queue `fig` for export unless the same figure was already written, queued, or failed to render."""
+        digest = figure_digest(fig)
+        with self.lock:
+            if self.is_current(filename, digest) or digest in (self.pending.get(filename), self.failed.get(filename)):
+                return False
+            self.pending[filename] = digest
+            if self.worker is None:
+                self.worker = threading.Thread(target=self.run, name="figure-exporter", daemon=True)
+                self.worker.start()
+        self.jobs.put((filename, fig, digest))
+        return True
+
+    def run(self):
+        while True:
+            batch = [self.jobs.get()]
+            # Give the rest of the page a moment to queue its figures so they share one renderer session
+            while True:
+                try:
+                    batch.append(self.jobs.get(timeout=self.batch_window))
+                except queue.Empty:
+                    break
+            self.export_batch(batch)
+            for _ in batch:
+                self.jobs.task_done()
+
+    def export_batch(self, batch):
+        """Render a batch of (filename, figure, digest) jobs, keeping only the latest job per file."""
+        latest = {filename: (fig, digest) for filename, fig, digest in batch}
+        filenames = list(latest)
+        figures = [latest[filename][0] for filename in filenames]
+        paths = [os.path.join(self.visuals_path, filename) for filename in filenames]
+        try:
+            if hasattr(pio, "write_images"):
+                pio.write_images(figures, paths, format="png", scale=self.scale)
+            else:
+                for fig, path in zip(figures, paths):
+                    fig.write_image(path, format="png", scale=self.scale)
+        except Exception as error:
+            with self.lock:
+                for filename in filenames:
+                    self.errors[filename] = str(error)
+                    self.failed[filename] = latest[filename][1]
+                    self.pending.pop(filename, None)
+            return
+        with self.lock:
+            for filename in filenames:
+                self.manifest[filename] = latest[filename][1]
+                self.errors.pop(filename, None)
+                if self.pending.get(filename) == latest[filename][1]:
+                    del self.pending[filename]
+            with open(self.manifest_path, "w") as f:
+                json.dump(self.manifest, f, indent=2, sort_keys=True)
+
+    def flush(self):
+        """Block until every queued export has been written."""
+        self.jobs.join()
+
+
+def build_figures(base_path):
+    """The figures saved under The Visuals, built from the current results and calculated gambles."""
+    results_df = Standings.fill_bonus_points(ExtractAndTransform.load_results(os.path.join(base_path, "The Results")))
+    predictions = ExtractAndTransform.load_predictions(os.path.join(base_path, "The Calculated Gambles"))
+    _, points_progression = ExtractAndTransform.calculate_scores(results_df, predictions)
+    counts_df_mean = Analysis.prediction_counts_analysis(predictions).mean().sort_values(ascending=False)
+    return {
+        "worm_graph.png": Plotting.plot_worm_graph(points_progression),
+        "Average Win Prediction.png": Plotting.avg_wins_plot(counts_df_mean),
+        "position_graph.png": Plotting.plot_position_graph(points_progression),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Regenerate the PNGs in The Visuals offline.")
+    parser.add_argument("--base-path", default=os.path.dirname(os.path.abspath(__file__)))
+    parser.add_argument("--force", action="store_true", help="re-render images even if their figure is unchanged")
+    args = parser.parse_args()
+
+    exporter = FigureExporter(os.path.join(args.base_path, "The Visuals"))
+    figures = build_figures(args.base_path)
+    jobs = []
+    for filename, fig in figures.items():
+        digest = figure_digest(fig)
+        if args.force or not exporter.is_current(filename, digest):
+            jobs.append((filename, fig, digest))
+    if jobs:
+        exporter.export_batch(jobs)
+    for filename, error in exporter.errors.items():
+        print(f"Export failed for {filename}: {error}")
+    if not exporter.errors:
+        print(f"{len(jobs)} image(s) written, {len(figures) - len(jobs)} unchanged")
+
+if __name__ == "__main__":
+    main()
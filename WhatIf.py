@@ -0,0 +1,86 @@
+import copy
+import threading
+import numpy as np
+import ScoringEngine
+import IncrementalScoring
+import Standings
+
+def copy_state(state):
+    """Copy of a scoring state that fold_match can extend without touching the original.
+
+    fold_match writes each match into the next preallocated row and never rewrites the rows below a
+    state's own count, so the copies share the matrices and only the running totals and dates are copied.
+    """
+    copied = dict(state)
+    for field in IncrementalScoring.RUNNING_FIELDS:
+        copied[field] = state[field].copy()
+    copied["dates"] = list(state["dates"])
+    return copied
+
+def private_state(state, extra):
+    """Copy of a state with matrices of its own in memory and room for `extra` more matches.
+
+    The cached state maps its matrices from disk, where hypothetical results must not be written.
+    """
+    copied = copy_state(state)
+    filled = IncrementalScoring.num_matches(state)
+    for field in IncrementalScoring.MATRIX_FIELDS + IncrementalScoring.MATCH_FIELDS:
+        copied[field] = np.zeros((filled + extra,) + state[field].shape[1:], dtype=state[field].dtype)
+        copied[field][:filled] = state[field][:filled]
+    copied["generation"] = None
+    return copied
+
+
+class OverlayScorer:
+    """Rescores a leaderboard for hypothetical winners of unplayed fixtures on top of the real results.
+
+    The scoring state of the played matches is reused as is and every picked fixture is folded in on top
+    of it, in match order. The states after each picked fixture are remembered, so changing one pick only
+    refolds the picks from that match on; the rest of the overlay is not rescored.
+    """
+
+    def __init__(self, results_df, predictions, state, standings):
+        self.results_df = results_df
+        self.season = ScoringEngine.encode_season(results_df, predictions)
+        self.standings = standings
+        self.fixtures = results_df.index[self.season.winner_codes == ScoringEngine.UNPLAYED].tolist()
+        self.state = private_state(state, len(self.fixtures))
+        self.steps = []
+        self.lock = threading.Lock()
+
+    def fold(self, state, standings, label, winner):
+        """State and standings after one more hypothetical result."""
+        position = self.results_df.index.get_loc(label)
+        row = self.results_df.iloc[position]
+        state = copy_state(state)
+        if label < ScoringEngine.LEAGUE_MATCHES and standings is not None:
+            standings = copy.deepcopy(standings)
+            bonus = standings.apply(row["Home Team"], row["Away Team"], winner)
+        elif label >= ScoringEngine.LEAGUE_MATCHES:
+            bonus = Standings.playoff_bonus(self.results_df, position)
+        else:
+            bonus = 0
+        if winner == "NR":
+            correct = np.zeros(len(self.season.participants), dtype=bool)
+            points = np.full(len(self.season.participants), 5)
+        else:
+            winner_code = self.season.home_codes[position] if winner == row["Home Team"] else self.season.away_codes[position]
+            correct = self.season.pick_codes[:, position] == winner_code
+            points = np.where(correct, 10 + bonus, 0)
+        IncrementalScoring.fold_match(state, label, row["Date"], 0, correct, winner == "NR", points.astype(state["points"].dtype))
+        return state, standings
+
+    def rescore(self, overlay):
+        """(leaderboard_df, points_progression) with `overlay` ({match label: winner or "NR"}) applied."""
+        picks = sorted((label, winner) for label, winner in overlay.items() if label in self.fixtures)
+        with self.lock:
+            common = 0
+            while common < min(len(picks), len(self.steps)) and self.steps[common][0] == picks[common]:
+                common += 1
+            del self.steps[common:]
+            state, standings = (self.steps[-1][1], self.steps[-1][2]) if self.steps else (self.state, self.standings)
+            for label, winner in picks[common:]:
+                state, standings = self.fold(state, standings, label, winner)
+                self.steps.append(((label, winner), state, standings))
+            # Scored before the lock is released: another session may replace the remembered steps right after
+            return IncrementalScoring.state_scores(state)
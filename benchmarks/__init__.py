@@ -0,0 +1 @@
+"""Synthetic leagues and timing harness for the scoring, analysis and plotting hot paths."""
@@ -0,0 +1,81 @@
+"""Compare the matrix-based matchwise_predictions + get_prediction_ratios with the original string-based path.
+
+    python -m benchmarks.bench_matchwise --participants 11 100 1000 --matches 74
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import ExtractAndTransform
+import Analysis
+import PredictionStore
+from benchmarks import synthetic
+
+def legacy_matchwise_predictions(schedule_df, predictions):
+    """matchwise_predictions as it was before the matrix rewrite."""
+    matchwise_data = []
+    for i, row in schedule_df.iterrows():
+        match_number = row.iloc[0]
+        home_team = row.iloc[2]
+        away_team = row.iloc[3]
+        home_predictors = []
+        away_predictors = []
+        for participant, predicted_winners in predictions.items():
+            if match_number - 1 < len(predicted_winners):
+                if predicted_winners[match_number - 1] == home_team:
+                    home_predictors.append(participant)
+                elif predicted_winners[match_number - 1] == away_team:
+                    away_predictors.append(participant)
+        matchwise_data.append({
+            "Date": row.iloc[1],
+            "Home Team": home_team,
+            "Home Predictors": ", ".join(home_predictors),
+            "Away Team": away_team,
+            "Away Predictors": ", ".join(away_predictors)
+        })
+    return pd.DataFrame(matchwise_data)
+
+def legacy_get_prediction_ratios(matchwise_predictions_df):
+    """The predictor-counting part of get_prediction_ratios before the rewrite (four string splits)."""
+    home = matchwise_predictions_df['Home Predictors'].str.split(',').apply(len)
+    away = matchwise_predictions_df['Away Predictors'].str.split(',').apply(len)
+    matchwise_predictions_df["Absolute Prediction Difference"] = abs(home - away)
+    matchwise_predictions_df["Prediction Difference"] = (matchwise_predictions_df['Home Predictors'].str.split(',').apply(len)
+                                                         - matchwise_predictions_df['Away Predictors'].str.split(',').apply(len))
+    return matchwise_predictions_df["Prediction Difference"].value_counts()
+
+def best_of(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--participants", type=int, nargs="+", default=[11, 100, 1000])
+    parser.add_argument("--matches", type=int, default=74)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'participants':>12} {'legacy (s)':>12} {'dict (s)':>12} {'store (s)':>12} {'speedup':>8}")
+    for num_participants in args.participants:
+        rng = np.random.default_rng(0)
+        schedule_df = synthetic.generate_schedule(args.matches, rng)
+        predictions = synthetic.generate_predictions(schedule_df, num_participants, rng)
+        with tempfile.TemporaryDirectory() as gambles_path:
+            synthetic.write_predictions(gambles_path, predictions)
+            store = PredictionStore.compile_store(gambles_path, schedule_df)
+        legacy = best_of(lambda: legacy_get_prediction_ratios(legacy_matchwise_predictions(schedule_df, predictions)), args.repeat)
+        matrix = best_of(lambda: Analysis.get_prediction_ratios(ExtractAndTransform.matchwise_predictions(schedule_df, predictions)), args.repeat)
+        stored = best_of(lambda: Analysis.get_prediction_ratios(ExtractAndTransform.matchwise_predictions(schedule_df, store)), args.repeat)
+        print(f"{num_participants:>12} {legacy:>12.4f} {matrix:>12.4f} {stored:>12.4f} {legacy / stored:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
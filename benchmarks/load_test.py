@@ -0,0 +1,124 @@
+"""Poll the JSON API from many concurrent keep-alive clients and report throughput and latency.
+
+    python -m benchmarks.load_test --spawn --clients 1000 --duration 10
+    python -m benchmarks.load_test --url http://127.0.0.1:8502 --paths /leaderboard /matchwise --no-etag
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+REPO_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+async def read_response(reader):
+    """(status, headers) of one response, with its body read and discarded."""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("connection closed")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    await reader.readexactly(int(headers.get("content-length", 0)))
+    return int(status_line.split()[1]), headers
+
+async def client(host, port, paths, deadline, args, latencies, statuses, errors):
+    """One polling client: a keep-alive connection cycling through `paths`, revalidating with its last ETags."""
+    etags = {}
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+    except OSError as error:
+        errors[type(error).__name__] += 1
+        return
+    request_number = 0
+    try:
+        while time.perf_counter() < deadline:
+            path = paths[request_number % len(paths)]
+            request_number += 1
+            headers = f"GET {path} HTTP/1.1\r\nHost: {host}\r\n"
+            if args.gzip:
+                headers += "Accept-Encoding: gzip\r\n"
+            if not args.no_etag and path in etags:
+                headers += f"If-None-Match: {etags[path]}\r\n"
+            start = time.perf_counter()
+            writer.write((headers + "\r\n").encode("latin-1"))
+            await writer.drain()
+            status, response_headers = await read_response(reader)
+            latencies.append(time.perf_counter() - start)
+            statuses[status] += 1
+            if "etag" in response_headers:
+                etags[path] = response_headers["etag"]
+            if args.interval:
+                await asyncio.sleep(args.interval)
+    except (OSError, ConnectionError, asyncio.IncompleteReadError) as error:
+        errors[type(error).__name__] += 1
+    finally:
+        writer.close()
+
+async def run(host, port, paths, args):
+    latencies, statuses, errors = [], Counter(), Counter()
+    deadline = time.perf_counter() + args.duration
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, paths, deadline, args, latencies, statuses, errors) for _ in range(args.clients)))
+    return time.perf_counter() - start, latencies, statuses, errors
+
+def wait_for_port(host, port, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))] if sorted_values else float("nan")
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the JSON API with concurrent polling clients.")
+    parser.add_argument("--url", default="http://127.0.0.1:8502")
+    parser.add_argument("--paths", nargs="+", default=["/leaderboard", "/progression?per_page=20", "/matchwise", "/team-predictions"])
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--interval", type=float, default=0.0, help="pause between a client's requests, in seconds")
+    parser.add_argument("--gzip", action="store_true", help="ask for gzipped bodies")
+    parser.add_argument("--no-etag", action="store_true", help="never send If-None-Match, so every response has a body")
+    parser.add_argument("--spawn", action="store_true", help="start ApiServer.py for the test and stop it afterwards")
+    parser.add_argument("--leagues-root", nargs="+", default=[REPO_PATH], help="league roots for --spawn")
+    args = parser.parse_args()
+
+    url = urlsplit(args.url)
+    host, port = url.hostname, url.port or 80
+    server = None
+    if args.spawn:
+        server = subprocess.Popen([sys.executable, os.path.join(REPO_PATH, "ApiServer.py"), "--host", host, "--port", str(port),
+                                   "--leagues-root", *args.leagues_root], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        if not wait_for_port(host, port, timeout=30):
+            server.kill()
+            sys.exit("ApiServer.py did not start listening")
+    try:
+        elapsed, latencies, statuses, errors = asyncio.run(run(host, port, args.paths, args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    latencies.sort()
+    print(f"{len(latencies)} requests from {args.clients} clients in {elapsed:.1f}s: {len(latencies) / elapsed:,.0f} req/s")
+    print("Status: " + ", ".join(f"{status} x {count}" for status, count in sorted(statuses.items())))
+    print("Latency (ms): " + ", ".join(f"p{int(fraction * 100)} {percentile(latencies, fraction) * 1000:.1f}"
+                                       for fraction in (0.5, 0.95, 0.99)) + f", max {latencies[-1] * 1000 if latencies else float('nan'):.1f}")
+    if errors:
+        print("Errors: " + ", ".join(f"{name} x {count}" for name, count in errors.items()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""Time the scoring, analysis and plotting hot paths on synthetic leagues, and compare runs.
+
+    python -m benchmarks.run --participants 10 100 1000 10000 --matches 74 1000 --output bench.json
+    python -m benchmarks.run --participants 100 1000 --completed 0.5 0.9 --only "Simulation|RankSolver|Leverage|WhatIf"
+    python -m benchmarks.run --compare before.json after.json --threshold 1.2
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import re
+import shutil
+import sys
+import tempfile
+import time
+import warnings
+import numpy as np
+import pandas as pd
+
+REPO_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_PATH)
+import ExtractAndTransform
+import Analysis
+import IncrementalScoring
+import Leverage
+import Plotting
+import RankSolver
+import Simulation
+import Standings
+import WhatIf
+from benchmarks import synthetic
+
+def best_of(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def data_benchmarks(base_path):
+    """(name, callable) pairs over one league, each reading its inputs from already-loaded data."""
+    schedule_df = pd.read_csv(os.path.join(base_path, "The Schedule", "ipl_2025_schedule.csv"))
+    results_path = os.path.join(base_path, "The Results")
+    predictions_path = os.path.join(base_path, "The Calculated Gambles")
+    results_df = ExtractAndTransform.load_results(results_path)
+    predictions = ExtractAndTransform.load_predictions(predictions_path)
+    leaderboard_df, points_progression = ExtractAndTransform.calculate_scores(results_df, predictions)
+    matchwise_df = ExtractAndTransform.matchwise_predictions(schedule_df, predictions)
+    prediction_ratio_counts, home_away_ratio_counts = Analysis.get_prediction_ratios(matchwise_df.copy())
+    counts_df_mean = Analysis.prediction_counts_analysis(predictions).mean().sort_values(ascending=False)
+    percentage_df = Analysis.home_away_percentage(schedule_df, pd.DataFrame(predictions))
+    percentage_df = percentage_df.rename(columns={"Home": "Home %", "Away": "Away %"})
+    return [
+        ("load_predictions", lambda: ExtractAndTransform.load_predictions(predictions_path)),
+        ("calculate_scores", lambda: ExtractAndTransform.calculate_scores(results_df, predictions)),
+        ("matchwise_predictions", lambda: ExtractAndTransform.matchwise_predictions(schedule_df, predictions)),
+        ("get_prediction_ratios", lambda: Analysis.get_prediction_ratios(matchwise_df.copy())),
+        ("home_away_percentage", lambda: Analysis.home_away_percentage(schedule_df, pd.DataFrame(predictions))),
+        ("get_points_progression_df", lambda: Analysis.get_points_progression_df(points_progression)),
+        ("Plotting.plot_worm_graph", lambda: Plotting.plot_worm_graph(points_progression)),
+        ("Plotting.plot_animated_worm_graph", lambda: Plotting.plot_animated_worm_graph(points_progression)),
+        ("Plotting.avg_wins_plot", lambda: Plotting.avg_wins_plot(counts_df_mean)),
+        ("Plotting.plot_prediction_ratio", lambda: Plotting.plot_prediction_ratio(prediction_ratio_counts)),
+        ("Plotting.plot_home_away_ratio", lambda: Plotting.plot_home_away_ratio(home_away_ratio_counts)),
+        ("Plotting.plot_home_away_percentage", lambda: Plotting.plot_home_away_percentage(percentage_df)),
+        ("Plotting.plot_position_graph", lambda: Plotting.plot_position_graph(points_progression)),
+    ]
+
+def remaining_season_benchmarks(base_path, head_to_head_participants=25, overlay_fixtures=10):
+    """(name, callable) pairs for the views over the unplayed part of the season; none once every match is played."""
+    results_df = ExtractAndTransform.load_results(os.path.join(base_path, "The Results"))
+    if results_df["Winner"].notna().all():
+        return []
+    predictions = ExtractAndTransform.load_predictions(os.path.join(base_path, "The Calculated Gambles"))
+    leaderboard_df, _ = ExtractAndTransform.calculate_scores(results_df, predictions)
+    standings = Standings.build_standings(results_df)
+    fixture_points = Leverage.fixture_points(results_df, predictions, leaderboard_df, standings)
+    top_participants = leaderboard_df["Participant"].head(head_to_head_participants).tolist()
+    scorer = WhatIf.OverlayScorer(results_df, predictions, IncrementalScoring.update_state(results_df, predictions, None), standings)
+    fixtures = scorer.fixtures[:overlay_fixtures]
+    home_teams = results_df.loc[fixtures, "Home Team"].tolist()
+    away_teams = results_df.loc[fixtures, "Away Team"].tolist()
+    flips = iter(range(sys.maxsize))
+
+    def rescore_overlay():
+        # Flip the first pick every call, so each run refolds the whole overlay instead of hitting the remembered steps
+        flip = next(flips) % 2
+        winners = [away if i == 0 and flip else home for i, (home, away) in enumerate(zip(home_teams, away_teams))]
+        scorer.rescore(dict(zip(fixtures, winners)))
+
+    return [
+        ("Simulation.simulate_rank_probabilities", lambda: Simulation.simulate_rank_probabilities(results_df, predictions, seed=0, standings=standings)),
+        ("RankSolver.rank_bounds", lambda: RankSolver.rank_bounds(results_df, predictions, standings)),
+        ("RankSolver.pairwise_above_probabilities", lambda: RankSolver.pairwise_above_probabilities(
+            results_df, predictions, standings=standings, participants=top_participants)),
+        ("Leverage.fixture_points", lambda: Leverage.fixture_points(results_df, predictions, leaderboard_df, standings)),
+        ("Leverage.matches_to_watch", lambda: Leverage.matches_to_watch(fixture_points)),
+        ("Leverage.participant_leverage", lambda: Leverage.participant_leverage(fixture_points, top_participants[0])),
+        ("WhatIf.OverlayScorer.rescore", rescore_overlay),
+    ]
+
+def dashboard_benchmarks(base_path):
+    """One cold and one warm headless pass over every dashboard view against the league."""
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    def run_dashboard():
+        app = AppTest.from_file(os.path.join(REPO_PATH, "Dashboard.py"), default_timeout=600)
+        app.run()
+        # Views are computed lazily, so walk through every one of them
+        for view in app.radio(key="view").options[1:]:
+            app.radio(key="view").set_value(view).run()
+        if app.exception:
+            raise RuntimeError(app.exception[0].message)
+
+    def cold_run():
+        st.cache_resource.clear()
+        for state_directory in (".scoring_state", ".prediction_store", ".snapshot"):
+            shutil.rmtree(os.path.join(base_path, state_directory), ignore_errors=True)
+        run_dashboard()
+
+    os.environ["IPL_BASE_PATH"] = base_path
+    os.chdir(REPO_PATH)  # the dashboard reads styles.css relative to the working directory
+    return [("Dashboard.main (cold)", cold_run), ("Dashboard.main (warm)", run_dashboard)]
+
+def run_benchmarks(args):
+    results = []
+    pattern = re.compile(args.only) if args.only else None
+    scenarios = [(num_matches, num_participants, completed) for num_matches in args.matches
+                 for num_participants in args.participants for completed in args.completed]
+    for num_matches, num_participants, completed in scenarios:
+        num_completed = round(num_matches * completed)
+        scenario = f"p{num_participants}_m{num_matches}_nr{args.nr_rate}_bonus{args.bonus_rate}"
+        if num_completed < num_matches:
+            scenario += f"_c{num_completed}"
+        with tempfile.TemporaryDirectory() as base_path:
+            synthetic.write_league(base_path, num_participants, num_matches, num_completed, nr_rate=args.nr_rate,
+                                   bonus_rate=args.bonus_rate, seed=args.seed)
+            benchmarks = data_benchmarks(base_path) + remaining_season_benchmarks(base_path)
+            if args.dashboard and num_participants <= args.dashboard_max_participants:
+                benchmarks += dashboard_benchmarks(base_path)
+            for name, function in benchmarks:
+                if pattern and not pattern.search(name):
+                    continue
+                seconds = best_of(function, 1 if name.startswith("Dashboard") else args.repeat)
+                results.append({"scenario": scenario, "participants": num_participants, "matches": num_matches,
+                                "completed": num_completed, "benchmark": name, "seconds": seconds})
+                print(f"{scenario:<40} {name:<42} {seconds:>10.4f}s", flush=True)
+    return {
+        "meta": {
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+def compare_runs(before_path, after_path, threshold):
+    """Print the per-benchmark ratio between two saved runs; returns the regressions beyond `threshold`."""
+    with open(before_path) as f:
+        before = {(row["scenario"], row["benchmark"]): row["seconds"] for row in json.load(f)["results"]}
+    with open(after_path) as f:
+        after = {(row["scenario"], row["benchmark"]): row["seconds"] for row in json.load(f)["results"]}
+    regressions = []
+    for key in sorted(set(before) & set(after)):
+        ratio = after[key] / before[key] if before[key] > 0 else float("inf")
+        flag = ""
+        if ratio > threshold:
+            flag = "REGRESSION"
+            regressions.append(key)
+        elif ratio < 1 / threshold:
+            flag = "faster"
+        print(f"{key[0]:<40} {key[1]:<42} {before[key]:>10.4f}s -> {after[key]:>10.4f}s {ratio:>6.2f}x {flag}")
+    for key in sorted(set(before) ^ set(after)):
+        print(f"{key[0]:<40} {key[1]:<42} only in {'before' if key in before else 'after'}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--participants", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--matches", type=int, nargs="+", default=[74])
+    parser.add_argument("--completed", type=float, nargs="+", default=[1.0, 0.75],
+                        help="share of the matches with a result; below 1 the remaining-season views are timed too")
+    parser.add_argument("--nr-rate", type=float, default=0.04)
+    parser.add_argument("--bonus-rate", type=float, default=0.4)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", help="regular expression selecting benchmark names")
+    parser.add_argument("--no-dashboard", dest="dashboard", action="store_false", help="skip the headless Dashboard.main runs")
+    parser.add_argument("--dashboard-max-participants", type=int, default=100,
+                        help="largest league the dashboard is rendered for (it draws one chart per participant)")
+    parser.add_argument("--output", help="write the timings to this JSON file")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="compare two saved runs instead of timing")
+    parser.add_argument("--threshold", type=float, default=1.25, help="slowdown ratio flagged as a regression")
+    args = parser.parse_args()
+
+    if args.compare:
+        regressions = compare_runs(*args.compare, args.threshold)
+        print(f"{len(regressions)} regression(s) beyond {args.threshold:.2f}x")
+        sys.exit(1 if regressions else 0)
+
+    warnings.simplefilter("ignore")  # pandas copy warnings from the plotting code would drown the timings
+    report = run_benchmarks(args)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
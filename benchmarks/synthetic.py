@@ -0,0 +1,98 @@
+"""Synthetic leagues written in the repo's exact folder layout.
+
+    python -m benchmarks.synthetic /tmp/league --participants 1000 --matches 74
+"""
+import argparse
+import datetime
+import os
+import numpy as np
+import pandas as pd
+
+TEAMS = ["Chennai Super Kings", "Delhi Capitals", "Gujarat Titans", "Kolkata Knight Riders", "Lucknow Super Giants",
+         "Mumbai Indians", "Punjab Kings", "Rajasthan Royals", "Royal Challengers Bengaluru", "Sunrisers Hyderabad"]
+
+def generate_schedule(num_matches, rng, start=datetime.date(2025, 3, 22)):
+    """Schedule with the same (space-padded) header the IPL schedule CSV uses."""
+    pairs = np.array([rng.choice(len(TEAMS), 2, replace=False) for _ in range(num_matches)])
+    dates = [start + datetime.timedelta(days=i * 7 // 9) for i in range(num_matches)]
+    return pd.DataFrame({
+        "Match #": np.arange(1, num_matches + 1),
+        " Date": [f"{date:%B} {date.day}, {date.year}" for date in dates],
+        " Home Team": [TEAMS[i] for i in pairs[:, 0]],
+        " Away Team": [TEAMS[i] for i in pairs[:, 1]],
+    })
+
+def generate_results(schedule_df, num_completed, rng, nr_rate=0.04, bonus_rate=0.4):
+    """Results.csv rows: the first `num_completed` matches decided, the rest left blank.
+
+    Away wins carry the +4 away bonus plus, with probability `bonus_rate`, a rank-difference bonus.
+    """
+    num_matches = len(schedule_df)
+    home_teams = schedule_df[" Home Team"].to_numpy()
+    away_teams = schedule_df[" Away Team"].to_numpy()
+    away_wins = rng.random(num_matches) < 0.5
+    winners = np.where(away_wins, away_teams, home_teams).astype(object)
+    no_result = rng.random(num_matches) < nr_rate
+    winners[no_result] = "NR"
+    bonus = np.where(away_wins & ~no_result, 4 + np.where(rng.random(num_matches) < bonus_rate, rng.integers(1, 10, num_matches), 0), 0)
+    results_df = pd.DataFrame({
+        "Match #": schedule_df["Match #"].to_numpy(),
+        "Date": schedule_df[" Date"].to_numpy(),
+        "Home Team": home_teams,
+        "Away Team": away_teams,
+        "Winner": winners,
+        "Bonus Points": pd.array(bonus, dtype="Int64"),
+    })
+    results_df.loc[num_completed:, ["Winner", "Bonus Points"]] = None
+    return results_df
+
+def generate_predictions(schedule_df, num_participants, rng, home_bias=0.55):
+    """Random home/away picks for every participant, as load_predictions would return them."""
+    away = rng.random((num_participants, len(schedule_df))) >= home_bias
+    picks = np.where(away, schedule_df[" Away Team"].to_numpy(), schedule_df[" Home Team"].to_numpy())
+    return {f"Participant {p + 1:05d}": picks[p].tolist() for p in range(num_participants)}
+
+def write_predictions(predictions_path, predictions):
+    os.makedirs(predictions_path, exist_ok=True)
+    for participant, picks in predictions.items():
+        with open(os.path.join(predictions_path, participant + ".txt"), "w") as f:
+            f.write("\n".join(picks))
+
+def write_league(base_path, num_participants=11, num_matches=74, num_completed=None, nr_rate=0.04, bonus_rate=0.4,
+                 recalculated_rate=0.1, seed=0):
+    """Write schedule, results and both gamble directories under `base_path`; returns the base path."""
+    rng = np.random.default_rng(seed)
+    num_completed = num_matches if num_completed is None else num_completed
+    schedule_df = generate_schedule(num_matches, rng)
+    os.makedirs(os.path.join(base_path, "The Schedule"), exist_ok=True)
+    os.makedirs(os.path.join(base_path, "The Results"), exist_ok=True)
+    os.makedirs(os.path.join(base_path, "The Visuals"), exist_ok=True)
+    schedule_df.to_csv(os.path.join(base_path, "The Schedule", "ipl_2025_schedule.csv"), index=False)
+    generate_results(schedule_df, num_completed, rng, nr_rate, bonus_rate).to_csv(
+        os.path.join(base_path, "The Results", "Results.csv"), index=False)
+
+    predictions = generate_predictions(schedule_df, num_participants, rng)
+    write_predictions(os.path.join(base_path, "The Gambles"), predictions)
+    # The calculated gambles revise a share of each participant's picks, like the mid-season re-predictions
+    home_teams = schedule_df[" Home Team"].tolist()
+    away_teams = schedule_df[" Away Team"].tolist()
+    for picks in predictions.values():
+        for i in np.flatnonzero(rng.random(num_matches) < recalculated_rate):
+            picks[i] = away_teams[i] if picks[i] == home_teams[i] else home_teams[i]
+    write_predictions(os.path.join(base_path, "The Calculated Gambles"), predictions)
+    return base_path
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic league in the repo's folder layout.")
+    parser.add_argument("base_path")
+    parser.add_argument("--participants", type=int, default=11)
+    parser.add_argument("--matches", type=int, default=74)
+    parser.add_argument("--completed", type=int, default=None, help="matches with a result (default: all)")
+    parser.add_argument("--nr-rate", type=float, default=0.04)
+    parser.add_argument("--bonus-rate", type=float, default=0.4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    write_league(args.base_path, args.participants, args.matches, args.completed, args.nr_rate, args.bonus_rate, seed=args.seed)
+
+if __name__ == "__main__":
+    main()
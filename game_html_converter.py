@@ -1,33 +1,103 @@
+import argparse
 import csv
+import html
+import os
+import string
+import LeagueRegistry
 
-def csv_to_html(csv_filename, html_filename):
-    html_content = '''<div class="container">
-    <div class="match">
-        <span class="date">Date</span>
-        <div class="teams">Home Team vs Away Team</div>
-        <span class="winner">Winner</span>
-    </div>\n'''
-    with open(csv_filename, newline='', encoding='utf-8') as csvfile:
+TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bracket_template.html")
+MATCHES_MARKER = "<!-- matches -->\n"
+
+MATCH_TEMPLATE = '''        <div class="match" data-match="{number}" data-home="{home}" data-away="{away}">
+          <span class="date">{date}</span>
+          <div class="teams">
+            <span class="team home" onclick="setWinner(this)">{home}</span> vs
+            <span class="team away" onclick="setWinner(this)">{away}</span>
+          </div>
+          <div class="winner"></div>
+        </div>
+'''
+
+def compile_template(template):
+    """Split a str.format template once into (literal, field) pieces, so rendering a row is one join."""
+    pieces = [(literal, field) for literal, field, _, _ in string.Formatter().parse(template)]
+    def render(values):
+        return "".join(literal + (values[field] if field is not None else "") for literal, field in pieces)
+    return render
+
+render_match = compile_template(MATCH_TEMPLATE)
+
+def read_page_template(template_path=TEMPLATE_PATH):
+    """The page around the match rows, as the templates before and after them."""
+    with open(template_path, encoding="utf-8") as f:
+        head, tail = f.read().split(MATCHES_MARKER)
+    return string.Template(head), string.Template(tail)
+
+def schedule_rows(schedule_path):
+    """Stream (number, date, home, away) from a schedule CSV, whatever padding its header carries."""
+    with open(schedule_path, newline="", encoding="utf-8") as csvfile:
         reader = csv.reader(csvfile)
+        next(reader, None)
         for row in reader:
-            match_id, date, team1, team2 = row
-            html_content += f'''
-    <div class="match">
-        <span class="date">{date}</span>
-        <div class="teams">
-            <span class="team home" onclick="setWinner(this)">{team1}</span> vs 
-            <span class="team away" onclick="setWinner(this)">{team2}</span>
-        </div>
-        <div class="winner"></div>
-    </div>
-            '''
-    
-    html_content += '\n</div>'
+            if len(row) >= 4:
+                yield tuple(value.strip() for value in row[:4])
+
+def count_rows(schedule_path):
+    return sum(1 for _ in schedule_rows(schedule_path))
+
+def write_bracket(schedule_path, html_path, title, page_template=None, chunk_rows=512):
+    """Write the pick-the-winners page for one schedule.
+
+    Rows are rendered as they are read and written `chunk_rows` at a time, so time and memory grow
+    linearly with the schedule. The page saves picks as the one-line-per-match gamble file the dashboard
+    loads. The file is written under a temporary name and moved into place when complete.
+    """
+    head, tail = page_template or read_page_template()
+    values = {"title": html.escape(title), "num_matches": count_rows(schedule_path)}
+    temporary_path = html_path + ".tmp"
+    with open(temporary_path, "w", encoding="utf-8") as htmlfile:
+        htmlfile.write(head.substitute(values))
+        chunk = []
+        for number, date, home, away in schedule_rows(schedule_path):
+            chunk.append(render_match({"number": html.escape(number), "date": html.escape(date),
+                                       "home": html.escape(home), "away": html.escape(away)}))
+            if len(chunk) == chunk_rows:
+                htmlfile.write("".join(chunk))
+                chunk = []
+        htmlfile.write("".join(chunk))
+        htmlfile.write(tail.substitute(values))
+    os.replace(temporary_path, html_path)
+    return values["num_matches"]
+
+def bracket_path_for(schedule_path):
+    """The page is written next to its schedule: `ipl_2025_schedule.csv` -> `ipl_2025_schedule bracket.html`."""
+    return os.path.splitext(schedule_path)[0] + " bracket.html"
+
+def league_schedules(root_paths):
+    """{schedule path: [league names]} for every league under the roots; leagues sharing a season share a page."""
+    schedules = {}
+    for league in LeagueRegistry.discover_leagues(root_paths).values():
+        schedules.setdefault(os.path.abspath(league.schedule_path), []).append(league.name)
+    return schedules
 
-    with open(html_filename, 'w', encoding='utf-8') as htmlfile:
-        htmlfile.write(html_content)
+def main():
+    parser = argparse.ArgumentParser(description="Generate the pick-the-winners page for one or more schedules.")
+    parser.add_argument("schedules", nargs="*", help="schedule CSVs (default: every league's schedule under --leagues-root)")
+    parser.add_argument("--leagues-root", nargs="+", default=[os.path.dirname(os.path.abspath(__file__))])
+    parser.add_argument("--output", help="output file, when a single schedule is given")
+    parser.add_argument("--title", help="page title (default: derived from the schedule's file name)")
+    args = parser.parse_args()
 
-    print(f"HTML file '{html_filename}' generated successfully!")
+    schedules = {schedule_path: [] for schedule_path in args.schedules} or league_schedules(args.leagues_root)
+    if args.output and len(schedules) != 1:
+        parser.error("--output needs exactly one schedule")
+    page_template = read_page_template()
+    for schedule_path, leagues in schedules.items():
+        html_path = args.output or bracket_path_for(schedule_path)
+        title = args.title or os.path.splitext(os.path.basename(schedule_path))[0].replace("_", " ")
+        num_matches = write_bracket(schedule_path, html_path, title, page_template)
+        used_by = f" for {len(leagues)} league(s)" if leagues else ""
+        print(f"HTML file '{html_path}' generated with {num_matches} matches{used_by}")
 
-# Example usage
-csv_to_html('ipl_2025_schedule.csv', 'game_html_format.html')
+if __name__ == "__main__":
+    main()
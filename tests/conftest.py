@@ -0,0 +1,24 @@
+import os
+import sys
+import pytest
+
+REPO_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_PATH)
+
+import ExtractAndTransform
+from benchmarks import synthetic
+
+@pytest.fixture
+def bundled_results():
+    return ExtractAndTransform.load_results(os.path.join(REPO_PATH, "The Results"))
+
+@pytest.fixture(params=["The Gambles", "The Calculated Gambles"])
+def bundled_predictions(request):
+    return ExtractAndTransform.load_predictions(os.path.join(REPO_PATH, request.param))
+
+@pytest.fixture
+def small_league(tmp_path):
+    """(results_df, predictions) of six participants with eight matches left, few enough to enumerate."""
+    synthetic.write_league(str(tmp_path), num_participants=6, num_matches=74, num_completed=66, seed=1)
+    return (ExtractAndTransform.load_results(os.path.join(tmp_path, "The Results")),
+            ExtractAndTransform.load_predictions(os.path.join(tmp_path, "The Calculated Gambles")))
@@ -0,0 +1,59 @@
+import asyncio
+import json
+import ApiServer
+from conftest import REPO_PATH
+
+async def read_response(reader):
+    """(status, headers, body) of one response."""
+    status_line = await reader.readline()
+    headers = {}
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    body = await reader.readexactly(int(headers["content-length"]))
+    return int(status_line.split()[1]), headers, body
+
+def exchange(*requests):
+    """Send raw requests on one connection to a fresh server and read a response to each."""
+    async def run():
+        api = ApiServer.ApiServer([REPO_PATH])
+        server = await asyncio.start_server(api.handle_connection, "127.0.0.1", 0)
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.sockets[0].getsockname()[1])
+        responses = []
+        for request in requests:
+            writer.write(request)
+            await writer.drain()
+            responses.append(await read_response(reader))
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return responses
+    return asyncio.run(run())
+
+def test_leaderboard_page_and_etag():
+    (status, headers, body), = exchange(b"GET /leaderboard?per_page=5 HTTP/1.1\r\n\r\n")
+    assert status == 200
+    payload = json.loads(body)
+    assert len(payload["items"]) == 5 and payload["items"][0]["Rank"] == 1
+    (status, _, body), = exchange(f"GET /leaderboard?per_page=5 HTTP/1.1\r\nIf-None-Match: {headers['etag']}\r\n\r\n".encode())
+    assert status == 304 and body == b""
+
+def test_keep_alive_serves_requests_in_turn():
+    responses = exchange(b"GET /leagues HTTP/1.1\r\n\r\n", b"POST /leagues HTTP/1.1\r\nContent-Length: 2\r\n\r\n{}",
+                         b"GET /leaderboard?page=0 HTTP/1.1\r\n\r\n")
+    assert [status for status, _, _ in responses] == [200, 405, 400]
+    assert all(headers["connection"] == "keep-alive" for _, headers, _ in responses)
+
+def test_unreadable_requests_get_400_and_close():
+    for request in [b"garbage\r\n\r\n", b"GET /leagues HTTP/1.1\r\nContent-Length: abc\r\n\r\n",
+                    b"GET /leagues HTTP/1.1\r\nContent-Length: -1\r\n\r\n"]:
+        (status, headers, body), = exchange(request)
+        assert status == 400, request
+        assert headers["connection"] == "close"
+    assert json.loads(body) == {"error": "bad Content-Length"}
+
+def test_failing_handler_gets_500(monkeypatch):
+    monkeypatch.setitem(ApiServer.DATASETS, "/broken", lambda cache, league: 1 / 0)
+    (status, _, body), = exchange(b"GET /broken HTTP/1.1\r\n\r\n")
+    assert status == 500
+    assert json.loads(body)["error"].startswith("ZeroDivisionError")
@@ -0,0 +1,44 @@
+import os
+import DataCache
+
+def write(path, content):
+    with open(path, "w") as f:
+        f.write(content)
+
+def read_through(cache, path):
+    def read():
+        with open(path) as f:
+            return f.read()
+    return cache.get("read", [path], read)
+
+def test_evicted_slots_take_their_locks_with_them(tmp_path):
+    cache = DataCache.FingerprintCache(max_entries=3)
+    for i in range(10):
+        write(os.path.join(tmp_path, f"{i}.txt"), str(i))
+        assert read_through(cache, os.path.join(tmp_path, f"{i}.txt")) == str(i)
+    assert len(cache.entries) == 3
+    assert set(cache.slot_locks) <= set(cache.entries)
+
+def test_watched_fingerprints_last_until_expired(tmp_path):
+    watched, unwatched = os.path.join(tmp_path, "watched"), os.path.join(tmp_path, "unwatched")
+    os.makedirs(watched)
+    os.makedirs(unwatched)
+    cache = DataCache.FingerprintCache()
+    cache.watch([watched])
+    watched_file, unwatched_file = os.path.join(watched, "Results.csv"), os.path.join(unwatched, "Results.csv")
+    for path in [watched_file, unwatched_file]:
+        write(path, "before")
+        assert read_through(cache, path) == "before"
+        write(path, "after, and longer")
+    # Only the unwatched file is checked again on lookup; the watched one waits for its watcher
+    assert read_through(cache, unwatched_file) == "after, and longer"
+    assert read_through(cache, watched_file) == "before"
+    cache.expire_fingerprints([watched])
+    assert read_through(cache, watched_file) == "after, and longer"
+
+def test_cache_size_grows_with_the_leagues():
+    assert DataCache.cache_size(0) == DataCache.cache_size(1) == DataCache.SLOTS_PER_LEAGUE
+    assert DataCache.cache_size(5) == 5 * DataCache.SLOTS_PER_LEAGUE
+    cache = DataCache.FingerprintCache(DataCache.cache_size(1))
+    cache.resize(DataCache.cache_size(5))
+    assert cache.max_entries == 5 * DataCache.SLOTS_PER_LEAGUE
@@ -0,0 +1,48 @@
+import os
+import numpy as np
+import ExtractAndTransform
+import IncrementalScoring
+import ScoringEngine
+
+def mismatches(results_df, predictions, state_path):
+    return ScoringEngine.compare_scores(IncrementalScoring.update_scores(results_df, predictions, state_path),
+                                        ExtractAndTransform.calculate_scores(results_df, predictions))
+
+def test_appended_matches_match_full_recompute(tmp_path, bundled_results, bundled_predictions):
+    state_path = os.path.join(tmp_path, "state")
+    for num_completed in [0, 1, 20, 27, 50, len(bundled_results)]:
+        results_df = bundled_results.astype({"Bonus Points": float})
+        results_df.loc[num_completed:, ["Winner", "Bonus Points"]] = np.nan
+        assert mismatches(results_df, bundled_predictions, state_path) == [], num_completed
+
+def test_edited_match_matches_full_recompute(tmp_path, bundled_results, bundled_predictions):
+    state_path = os.path.join(tmp_path, "state")
+    assert mismatches(bundled_results, bundled_predictions, state_path) == []
+    results_df = bundled_results.copy()
+    # A corrected winner early in the season and a corrected bonus later on
+    home, away, winner = results_df.loc[3, ["Home Team", "Away Team", "Winner"]]
+    results_df.loc[3, "Winner"] = away if winner == home else home
+    decided = results_df.index[results_df["Winner"].isin(results_df["Away Team"])]
+    results_df.loc[decided[-5], "Bonus Points"] += 3
+    assert mismatches(results_df, bundled_predictions, state_path) == []
+    # and back, which rewinds to the first of the two edits
+    assert mismatches(bundled_results, bundled_predictions, state_path) == []
+
+def test_changed_predictions_rescore_from_scratch(tmp_path, bundled_results, bundled_predictions):
+    state_path = os.path.join(tmp_path, "state")
+    assert mismatches(bundled_results, bundled_predictions, state_path) == []
+    predictions = {participant: picks[::-1] for participant, picks in bundled_predictions.items()}
+    assert mismatches(bundled_results, predictions, state_path) == []
+
+def test_appending_keeps_one_generation_on_disk(tmp_path, bundled_results, bundled_predictions):
+    state_path = os.path.join(tmp_path, "state")
+    results_df = bundled_results.astype({"Bonus Points": float})
+    partial_df = results_df.copy()
+    partial_df.loc[30:, ["Winner", "Bonus Points"]] = np.nan
+    IncrementalScoring.update_scores(partial_df, bundled_predictions, state_path)
+    files = sorted(os.listdir(state_path))
+    # Appending writes into the mapped matrices, so the generation (and its files) stays the same
+    IncrementalScoring.update_scores(results_df, bundled_predictions, state_path)
+    assert sorted(os.listdir(state_path)) == files
+    assert not [name for name in files if name.endswith(".tmp")]
+    assert len([name for name in files if name.endswith(".npy")]) == len(IncrementalScoring.MATRIX_FIELDS)
@@ -0,0 +1,49 @@
+import numpy as np
+import ExtractAndTransform
+import Leverage
+import Standings
+
+def fixture_points(results_df, predictions):
+    leaderboard_df, _ = ExtractAndTransform.calculate_scores(results_df, predictions)
+    return Leverage.fixture_points(results_df, predictions, leaderboard_df, Standings.build_standings(results_df))
+
+def test_fixture_points_use_the_shared_bonus_model(small_league):
+    results_df, predictions = small_league
+    points = fixture_points(results_df, predictions)
+    bonuses = Standings.fixture_bonuses(results_df)
+    assert len(points.fixtures_df) == len(bonuses.rows)
+    picked_home = points.home_points > 0
+    assert (points.home_points == np.where(picked_home, 10 + bonuses.home[None, :], 0)).all()
+    assert (points.away_points[points.away_points > 0] == (10 + np.broadcast_to(bonuses.away, points.away_points.shape))[points.away_points > 0]).all()
+    # A playoff win is worth its assumed bonus until one is entered
+    assert (bonuses.home[bonuses.rows >= 70] == Standings.PLAYOFF_BONUS).all()
+
+def test_ranks_after_one_fixture(small_league):
+    results_df, predictions = small_league
+    points = fixture_points(results_df, predictions)
+    ranks = Leverage.ranks_after(points.base_scores, points.home_points)
+    for fixture in range(points.home_points.shape[1]):
+        totals = points.base_scores + points.home_points[:, fixture]
+        assert ranks[fixture].tolist() == [1 + int((totals > total).sum()) for total in totals]
+
+def test_expected_ranks_are_exact_with_one_fixture_left(small_league):
+    results_df, predictions = small_league
+    points = fixture_points(results_df, predictions)
+    last = points.home_points.shape[1] - 1
+    rows = np.arange(len(points.participants))
+    if_home, if_away = Leverage.expected_ranks(points.base_scores, points.home_points[:, last:], points.away_points[:, last:], rows)
+    assert if_home[0].tolist() == Leverage.ranks_after(points.base_scores, points.home_points[:, last:])[0].tolist()
+    assert if_away[0].tolist() == Leverage.ranks_after(points.base_scores, points.away_points[:, last:])[0].tolist()
+
+def test_participant_leverage_points_the_right_way(small_league):
+    results_df, predictions = small_league
+    points = fixture_points(results_df, predictions)
+    leverage_df = Leverage.participant_leverage(points, points.participants[0])
+    assert len(leverage_df) == len(points.fixtures_df)
+    helps_home = leverage_df["Expected Rank If Home"] < leverage_df["Expected Rank If Away"]
+    assert (leverage_df.loc[helps_home, "Root For"] == leverage_df.loc[helps_home, "Fixture"].str.split(" v ").str[0]).all()
+
+def test_matches_to_watch_is_empty_once_everything_is_played(bundled_results, bundled_predictions):
+    leaderboard_df, _ = ExtractAndTransform.calculate_scores(bundled_results, bundled_predictions)
+    points = Leverage.fixture_points(bundled_results, bundled_predictions, leaderboard_df)
+    assert Leverage.matches_to_watch(points).empty
@@ -0,0 +1,28 @@
+import time
+import DataCache
+import LeagueRegistry
+import LiveUpdates
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+def test_watcher_records_a_failed_check_and_keeps_polling():
+    league = LeagueRegistry.League("League", *[None] * 5)
+    watcher = LiveUpdates.LeagueWatcher(DataCache.FingerprintCache(), league, interval=0.01)
+    checks = []
+
+    def check():
+        checks.append(time.time())
+        if len(checks) < 3:
+            raise RuntimeError("scoring failed")
+
+    watcher.check = check
+    watcher.start()
+    try:
+        assert wait_for(lambda: watcher.error == "RuntimeError: scoring failed")
+        assert wait_for(lambda: len(checks) >= 3 and watcher.error is None)
+    finally:
+        watcher.stop()
@@ -0,0 +1,11 @@
+import ExtractAndTransform
+import RankHistory
+
+def test_time_at_position_counts_every_played_match(bundled_results, bundled_predictions):
+    _, points_progression = ExtractAndTransform.calculate_scores(bundled_results, bundled_predictions)
+    history = RankHistory.build_rank_history(points_progression)
+    played_df = RankHistory.long_form(history).query("Match > 0")
+    expected_df = played_df.groupby(["Participant", "Rank"]).size().reset_index(name="Count")
+    time_spent_df = RankHistory.time_at_position(history)
+    assert time_spent_df.to_dict("list") == expected_df.to_dict("list")
+    assert (time_spent_df.groupby("Participant")["Count"].sum() == len(bundled_results)).all()
@@ -0,0 +1,114 @@
+import copy
+import itertools
+import numpy as np
+import ScoringEngine
+import RankSolver
+import Standings
+
+OUTCOMES = ["home", "away", "NR"]
+
+def match_points(season, row, outcome, bonus):
+    """Points every participant earns on one results row for one outcome."""
+    if outcome == "NR":
+        return np.full(len(season.participants), 5.0)
+    winner = season.home_codes[row] if outcome == "home" else season.away_codes[row]
+    return np.where(season.pick_codes[:, row] == winner, 10.0 + bonus, 0.0)
+
+def enumerate_totals(results_df, predictions, playoff_bonuses, outcomes=OUTCOMES):
+    """Final points of every participant under every outcome of the unplayed rows: outcomes x participants.
+
+    League bonuses are replayed through the standings as the results come in; every playoff row is won
+    with each bonus in `playoff_bonuses` (None uses the one entered on the row).
+    """
+    season = ScoringEngine.encode_season(results_df, predictions)
+    base_scores = ScoringEngine.played_scores(season)
+    rows = np.flatnonzero(results_df["Winner"].isna().to_numpy())
+    league_rows, playoff_rows = rows[rows < ScoringEngine.LEAGUE_MATCHES], rows[rows >= ScoringEngine.LEAGUE_MATCHES]
+    standings = Standings.build_standings(results_df)
+    league_totals = []
+    for league_outcomes in itertools.product(outcomes, repeat=len(league_rows)):
+        replay = copy.deepcopy(standings)
+        points = np.zeros(len(base_scores))
+        for row, outcome in zip(league_rows, league_outcomes):
+            home_team, away_team = results_df["Home Team"].iloc[row], results_df["Away Team"].iloc[row]
+            winner = {"home": home_team, "away": away_team, "NR": "NR"}[outcome]
+            points += match_points(season, row, outcome, replay.apply(home_team, away_team, winner))
+        league_totals.append(points)
+    playoff_totals = []
+    choices = [[results_df["Bonus Points"].iloc[row]] if playoff_bonuses is None else playoff_bonuses for row in playoff_rows]
+    for playoff_outcomes in itertools.product(outcomes, repeat=len(playoff_rows)):
+        for bonuses in itertools.product(*choices):
+            playoff_totals.append(sum((match_points(season, row, outcome, bonus) for row, outcome, bonus in
+                                       zip(playoff_rows, playoff_outcomes, bonuses)), np.zeros(len(base_scores))))
+    totals = base_scores + np.array(league_totals)[:, None, :] + np.array(playoff_totals)[None, :, :]
+    return totals.reshape(-1, len(base_scores))
+
+def ranks_of(totals):
+    return 1 + (totals[:, None, :] > totals[:, :, None]).sum(axis=2)
+
+def settled_league(results_df):
+    """The league finished with home wins and every playoff bonus entered ahead of its result (40 to 90)."""
+    results_df = results_df.copy()
+    league = results_df.index[:ScoringEngine.LEAGUE_MATCHES]
+    results_df.loc[league, "Winner"] = results_df.loc[league, "Winner"].fillna(results_df.loc[league, "Home Team"])
+    results_df = Standings.fill_bonus_points(results_df)
+    results_df.loc[results_df.index[ScoringEngine.LEAGUE_MATCHES:], "Bonus Points"] = [40, 65, 65, 90]
+    return results_df
+
+def test_rank_bounds_hold_for_every_outcome_and_bonus(small_league):
+    results_df, predictions = small_league
+    totals = enumerate_totals(results_df, predictions, playoff_bonuses=[0, 40, 90])
+    ranks = ranks_of(totals)
+    bounds_df = RankSolver.rank_bounds(results_df, predictions).set_index("Participant").reindex(list(predictions))
+    assert (bounds_df["Best Rank"].to_numpy() <= ranks.min(axis=0)).all()
+    assert (bounds_df["Worst Rank"].to_numpy() >= ranks.max(axis=0)).all()
+    assert (bounds_df["Max Points"].to_numpy() >= totals.max(axis=0)).all()
+    assert bounds_df["Min Points"].tolist() == totals.min(axis=0).tolist()
+
+def test_rank_bounds_are_exact_once_bonuses_are_settled(small_league):
+    results_df, predictions = small_league
+    results_df = settled_league(results_df)
+    for no_result, outcomes in [(True, OUTCOMES), (False, OUTCOMES[:2])]:
+        totals = enumerate_totals(results_df, predictions, playoff_bonuses=None, outcomes=outcomes)
+        ranks = ranks_of(totals)
+        bounds_df = RankSolver.rank_bounds(results_df, predictions, no_result=no_result).set_index("Participant").reindex(list(predictions))
+        assert bounds_df["Best Rank"].tolist() == ranks.min(axis=0).tolist()
+        assert bounds_df["Worst Rank"].tolist() == ranks.max(axis=0).tolist()
+        assert bounds_df["Max Points"].tolist() == totals.max(axis=0).tolist()
+        assert bounds_df["Min Points"].tolist() == totals.min(axis=0).tolist()
+
+def test_unentered_playoff_bonus_leaves_max_points_open(small_league):
+    results_df, predictions = small_league
+    bounds_df = RankSolver.rank_bounds(results_df, predictions)
+    season = ScoringEngine.encode_season(results_df, predictions)
+    playoff = np.arange(ScoringEngine.LEAGUE_MATCHES, len(results_df))
+    picked = (season.pick_codes[:, playoff] >= 0).any(axis=1)
+    assert np.isinf(bounds_df["Max Points"].to_numpy()).tolist() == picked.tolist()
+
+def test_pairwise_probabilities_match_enumeration(small_league):
+    results_df, predictions = small_league
+    home_win_probability, nr_probability = 0.6, 0.2
+    season = ScoringEngine.encode_season(results_df, predictions)
+    bonuses = Standings.fixture_bonuses(results_df)
+    totals, weights = [], []
+    for outcomes in itertools.product(OUTCOMES, repeat=len(bonuses.rows)):
+        points = ScoringEngine.played_scores(season).astype(float)
+        weight = 1.0
+        for i, (row, outcome) in enumerate(zip(bonuses.rows, outcomes)):
+            points += match_points(season, row, outcome, bonuses.home[i] if outcome == "home" else bonuses.away[i])
+            weight *= {"home": (1 - nr_probability) * home_win_probability, "away": (1 - nr_probability) * (1 - home_win_probability),
+                       "NR": nr_probability}[outcome]
+        totals.append(points)
+        weights.append(weight)
+    totals, weights = np.array(totals), np.array(weights)
+    above = np.einsum("o,oab->ab", weights, (totals[:, :, None] > totals[:, None, :]).astype(float))
+    np.fill_diagonal(above, np.nan)
+    pairwise_df = RankSolver.pairwise_above_probabilities(results_df, predictions, home_win_probability, nr_probability)
+    np.testing.assert_allclose(pairwise_df.loc[list(predictions), list(predictions)].to_numpy(), above, atol=1e-9)
+
+def test_pairwise_probabilities_for_some_participants(small_league):
+    results_df, predictions = small_league
+    participants = list(predictions)[:3]
+    full_df = RankSolver.pairwise_above_probabilities(results_df, predictions)
+    some_df = RankSolver.pairwise_above_probabilities(results_df, predictions, participants=participants)
+    np.testing.assert_allclose(some_df.to_numpy(), full_df.loc[participants, participants].to_numpy())
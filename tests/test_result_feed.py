@@ -0,0 +1,20 @@
+import os
+import shutil
+import pandas as pd
+import ResultFeed
+from conftest import REPO_PATH
+
+def test_results_are_rewritten_in_place(tmp_path):
+    results_file = os.path.join(tmp_path, "Results.csv")
+    shutil.copy(os.path.join(REPO_PATH, "The Results", "Results.csv"), results_file)
+    os.chmod(results_file, 0o644)
+    results_df = pd.read_csv(results_file)
+    results_df.loc[results_df.index[-1], ["Winner", "Bonus Points"]] = None
+    results_df.to_csv(results_file, index=False)
+    row = results_df.iloc[-1]
+    fixtures = {int(row["Match #"]): (row["Date"], row["Home Team"], row["Away Team"])}
+    ResultFeed.apply_results(results_file, fixtures, [{"match": int(row["Match #"]), "winner": row["Away Team"], "bonus": 90}])
+    updated_df = pd.read_csv(results_file)
+    assert updated_df.iloc[-1]["Winner"] == row["Away Team"] and updated_df.iloc[-1]["Bonus Points"] == 90
+    assert os.listdir(tmp_path) == ["Results.csv"]
+    assert os.stat(results_file).st_mode & 0o777 == 0o644
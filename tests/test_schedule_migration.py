@@ -0,0 +1,96 @@
+import os
+import shutil
+import pandas as pd
+import pytest
+import ScheduleMigration
+from conftest import REPO_PATH
+
+SEASON_FOLDERS = ["The Schedule", "The Results", "The Gambles", "The Calculated Gambles"]
+
+@pytest.fixture
+def league(tmp_path):
+    """A copy of the bundled league with results only as far as match 40."""
+    for folder in SEASON_FOLDERS:
+        shutil.copytree(os.path.join(REPO_PATH, folder), os.path.join(tmp_path, folder))
+    results_file = os.path.join(tmp_path, "The Results", "Results.csv")
+    with open(results_file, newline="") as f:
+        lines = f.read().split("\n")
+    with open(results_file, "w", newline="") as f:
+        f.write("\n".join(lines[:41]) + "\n")
+    return str(tmp_path)
+
+def season_files(base_path):
+    """{relative path: content} of every file in the season folders."""
+    contents = {}
+    for folder in SEASON_FOLDERS:
+        for root, _, names in os.walk(os.path.join(base_path, folder)):
+            for name in names:
+                with open(os.path.join(root, name), newline="") as f:
+                    contents[os.path.relpath(os.path.join(root, name), base_path)] = f.read()
+    return contents
+
+def rescheduled(base_path, swaps):
+    """A new schedule with the fixtures of each (match, match) pair swapped and the dates left in place."""
+    schedule_path = os.path.join(base_path, "The Schedule", "ipl_2025_schedule.csv")
+    schedule_df = pd.read_csv(schedule_path)
+    order = list(range(len(schedule_df)))
+    for first, second in swaps:
+        order[first - 1], order[second - 1] = order[second - 1], order[first - 1]
+    new_df = schedule_df.iloc[order].copy()
+    new_df.iloc[:, 0] = range(1, len(new_df) + 1)
+    new_df.iloc[:, 1] = schedule_df.iloc[:, 1].to_numpy()
+    new_schedule_path = os.path.join(base_path, "new schedule.csv")
+    new_df.to_csv(new_schedule_path, index=False)
+    return new_schedule_path
+
+def test_partial_results_move_and_roll_back(league):
+    before = season_files(league)
+    old_results_df = pd.read_csv(os.path.join(league, "The Results", "Results.csv"))
+    plan = ScheduleMigration.plan_migration(league, rescheduled(league, [(10, 60), (5, 6)]))
+    assert {(old, new) for old, new, _, _ in plan.moves} == {(10, 60), (60, 10), (5, 6), (6, 5)}
+    migration_id = ScheduleMigration.apply_migration(plan, league)
+
+    results_df = pd.read_csv(os.path.join(league, "The Results", "Results.csv"))
+    # Match 10 was played and now comes 60th, so the table runs to 60 with no winners between
+    assert len(results_df) == 60
+    assert results_df.loc[59, "Winner"] == old_results_df.loc[9, "Winner"]
+    assert results_df.loc[4, "Winner"] == old_results_df.loc[5, "Winner"]
+    assert results_df.loc[40:58, "Winner"].isna().all()
+    assert results_df["Match #"].tolist() == list(range(1, 61))
+    gamble = next(path for path in before if path.startswith("The Gambles"))
+    old_picks, new_picks = before[gamble].splitlines(), season_files(league)[gamble].splitlines()
+    assert new_picks[59] == old_picks[9] and new_picks[9] == old_picks[59]
+    assert not [name for name in os.listdir(os.path.join(league, "The Results")) if name.endswith(".tmp")]
+
+    assert ScheduleMigration.migrations(league) == [migration_id]
+    ScheduleMigration.rollback(league)
+    assert season_files(league) == before
+    assert ScheduleMigration.migrations(league) == []
+
+def test_edited_files_are_not_rolled_back(league):
+    ScheduleMigration.apply_migration(ScheduleMigration.plan_migration(league, rescheduled(league, [(5, 6)])), league)
+    results_file = os.path.join(league, "The Results", "Results.csv")
+    with open(results_file, "a") as f:
+        f.write("edited\n")
+    with pytest.raises(ValueError, match="edited since the migration"):
+        ScheduleMigration.rollback(league)
+    ScheduleMigration.rollback(league, force=True)
+    assert ScheduleMigration.migrations(league) == []
+
+def test_results_longer_than_the_schedule_are_refused(league):
+    results_file = os.path.join(league, "The Results", "Results.csv")
+    shutil.copy(os.path.join(REPO_PATH, "The Results", "Results.csv"), results_file)
+    with open(results_file, "a") as f:
+        f.write("\n75,\"May 31, 2025\",Punjab Kings,Mumbai Indians,Punjab Kings,0")
+    before = season_files(league)
+    with pytest.raises(ValueError, match="rows but the schedule only"):
+        ScheduleMigration.apply_migration(ScheduleMigration.plan_migration(league, rescheduled(league, [(5, 6)])), league)
+    assert season_files(league) == before
+    assert ScheduleMigration.migrations(league) == []
+
+def test_migration_ids_are_unique_and_ordered():
+    ids = [ScheduleMigration.new_migration_id() for _ in range(200)]
+    assert len(set(ids)) == len(ids)
+    # Ids made within one microsecond differ only in their random suffix
+    times = [migration_id.rsplit("-", 1)[0] for migration_id in ids]
+    assert times == sorted(times)
@@ -0,0 +1,10 @@
+import numpy as np
+import ExtractAndTransform
+
+def test_vectorized_scores_match_iterrows(bundled_results, bundled_predictions):
+    assert ExtractAndTransform.check_scores_parity(bundled_results, bundled_predictions) == []
+
+def test_vectorized_scores_match_iterrows_mid_season(bundled_results, bundled_predictions):
+    results_df = bundled_results.astype({"Bonus Points": float})
+    results_df.loc[40:, ["Winner", "Bonus Points"]] = np.nan
+    assert ExtractAndTransform.check_scores_parity(results_df, bundled_predictions) == []
@@ -0,0 +1,22 @@
+import numpy as np
+import ScoringEngine
+import Simulation
+import Standings
+
+def test_certain_outcomes_use_the_shared_bonus_model(small_league):
+    results_df, predictions = small_league
+    rank_probabilities = Simulation.simulate_rank_probabilities(results_df, predictions, num_simulations=10, seed=0,
+                                                                home_win_probability=1.0)
+    season = ScoringEngine.encode_season(results_df, predictions)
+    bonuses = Standings.fixture_bonuses(results_df)
+    _, home_points, _ = ScoringEngine.remaining_fixture_points(season, bonuses.away, bonuses.home)
+    totals = ScoringEngine.played_scores(season) + home_points.sum(axis=1)
+    ranks = ScoringEngine.dense_ranks(totals[None, :])[0]
+    for participant, rank in zip(season.participants, ranks):
+        assert rank_probabilities.loc[participant, rank] == 1.0
+
+def test_batches_and_workers_give_the_same_numbers(small_league):
+    results_df, predictions = small_league
+    in_process = Simulation.simulate_rank_probabilities(results_df, predictions, num_simulations=2000, batch_size=500, seed=3)
+    pooled = Simulation.simulate_rank_probabilities(results_df, predictions, num_simulations=2000, batch_size=500, seed=3, workers=2)
+    np.testing.assert_array_equal(in_process.to_numpy(), pooled.to_numpy())
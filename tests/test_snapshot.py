@@ -0,0 +1,55 @@
+import os
+import pandas as pd
+import pytest
+import ExtractAndTransform
+import Snapshot
+from conftest import REPO_PATH
+
+pytestmark = pytest.mark.skipif(Snapshot.pq is None, reason="snapshots are only written with pyarrow")
+
+SCHEDULE_PATH = os.path.join(REPO_PATH, "The Schedule", "ipl_2025_schedule.csv")
+
+@pytest.fixture
+def tables(bundled_results, bundled_predictions):
+    scores = ExtractAndTransform.calculate_scores(bundled_results, bundled_predictions)
+    matchwise_df = ExtractAndTransform.matchwise_predictions(pd.read_csv(SCHEDULE_PATH), bundled_predictions)
+    return Snapshot.build_tables(scores, matchwise_df), scores
+
+def table_folders(snapshot_path):
+    return sorted(name for name in os.listdir(snapshot_path) if name.startswith("tables-"))
+
+def test_tables_read_back(tmp_path, tables):
+    tables, (_, points_progression) = tables
+    snapshot = Snapshot.write_snapshot(str(tmp_path), tables, {"results": "a"})
+    for name, table in tables.items():
+        assert snapshot.read(name).astype(str).equals(table.reset_index(drop=True).astype(str)), name
+    assert snapshot.read("leaderboard", ["Participant"])["Participant"].tolist() == tables["leaderboard"]["Participant"].tolist()
+    assert snapshot.points_progression() == points_progression
+
+def test_unchanged_inputs_reuse_the_snapshot(tmp_path, tables):
+    tables, _ = tables
+    paths = (os.path.join(REPO_PATH, "The Results"), os.path.join(REPO_PATH, "The Gambles"), SCHEDULE_PATH)
+    written = Snapshot.load_snapshot(*paths, lambda: tables, snapshot_path=str(tmp_path))
+    reopened = Snapshot.load_snapshot(*paths, lambda: pytest.fail("rebuilt an unchanged snapshot"), snapshot_path=str(tmp_path))
+    assert reopened.path == written.path
+
+def test_swap_keeps_only_the_previous_tables(tmp_path, tables):
+    tables, _ = tables
+    first = Snapshot.write_snapshot(str(tmp_path), tables, {"results": "a"})
+    second = Snapshot.write_snapshot(str(tmp_path), tables, {"results": "b"})
+    # A reader still holding the first manifest can finish reading it
+    assert table_folders(tmp_path) == sorted(os.path.basename(snapshot.path) for snapshot in [first, second])
+    assert first.read("leaderboard", ["Participant"]).equals(second.read("leaderboard", ["Participant"]))
+    third = Snapshot.write_snapshot(str(tmp_path), tables, {"results": "c"})
+    assert table_folders(tmp_path) == sorted(os.path.basename(snapshot.path) for snapshot in [second, third])
+    assert Snapshot.read_manifest(str(tmp_path))["inputs"] == {"results": "c"}
+
+def test_older_layouts_are_cleaned_up(tmp_path, tables):
+    tables, _ = tables
+    with open(os.path.join(tmp_path, "leaderboard.parquet"), "w") as f:
+        f.write("left by an older version")
+    with open(os.path.join(tmp_path, "manifest.json"), "w") as f:
+        f.write('{"version": 2}')
+    assert Snapshot.read_manifest(str(tmp_path)) is None
+    snapshot = Snapshot.write_snapshot(str(tmp_path), tables, {"results": "a"})
+    assert sorted(os.listdir(tmp_path)) == sorted(["lock", "manifest.json", os.path.basename(snapshot.path)])
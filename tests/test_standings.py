@@ -0,0 +1,87 @@
+import numpy as np
+import ScoringEngine
+import Standings
+
+def test_derived_bonuses_follow_the_entered_ones(bundled_results):
+    entered = bundled_results["Bonus Points"].iloc[:ScoringEngine.LEAGUE_MATCHES].to_numpy()
+    derived = Standings.derived_bonus_points(bundled_results).iloc[:ScoringEngine.LEAGUE_MATCHES].to_numpy()
+    # Until every team has played a few matches only the away bonus counts
+    early = np.arange(len(entered)) < 17
+    assert (derived[early] == entered[early]).all()
+    # Later on, level teams are separated by net run rate, which Results.csv does not carry, so a few are a place out
+    assert (derived == entered).sum() >= 56
+    assert np.abs(derived - entered).max() <= 3
+
+def test_derived_bonuses_are_blank_for_playoffs_and_unplayed_rows(bundled_results):
+    results_df = bundled_results.astype({"Bonus Points": float})
+    results_df.loc[60:, ["Winner", "Bonus Points"]] = np.nan
+    derived = Standings.derived_bonus_points(results_df)
+    assert derived.iloc[:60].notna().all()
+    assert derived.iloc[60:].isna().all()
+
+def test_appended_results_extend_the_table(bundled_results):
+    partial_df = bundled_results.astype({"Bonus Points": float})
+    partial_df.loc[40:, ["Winner", "Bonus Points"]] = np.nan
+    standings = Standings.build_standings(partial_df)
+    extended = Standings.build_standings(bundled_results, standings)
+    assert extended is standings
+    assert extended.bonus_points == Standings.build_standings(bundled_results).bonus_points
+    assert extended.table().equals(Standings.build_standings(bundled_results).table())
+
+def test_edited_result_rebuilds_the_table(bundled_results):
+    standings = Standings.build_standings(bundled_results)
+    edited_df = bundled_results.copy()
+    edited_df.loc[5, "Winner"] = edited_df.loc[5, "Home Team"]
+    rebuilt = Standings.build_standings(edited_df, standings)
+    assert rebuilt is not standings
+    assert rebuilt.applied[5][2] == edited_df.loc[5, "Home Team"]
+
+def test_projected_bonus_is_what_the_next_result_earns(bundled_results):
+    results_df = bundled_results.astype({"Bonus Points": float})
+    results_df.loc[40:, ["Winner", "Bonus Points"]] = np.nan
+    standings = Standings.build_standings(results_df)
+    home_team, away_team = results_df.loc[40, ["Home Team", "Away Team"]]
+    home_bonus, away_bonus = standings.projected_bonuses([home_team], [away_team])
+    assert standings.apply(home_team, away_team, away_team) == away_bonus[0]
+    standings = Standings.build_standings(results_df)
+    assert standings.apply(home_team, away_team, home_team) == home_bonus[0]
+
+def test_fill_bonus_points_keeps_entered_bonuses(bundled_results):
+    results_df = bundled_results.astype({"Bonus Points": float})
+    results_df.loc[[20, 45], "Bonus Points"] = np.nan
+    filled_df = Standings.fill_bonus_points(results_df)
+    derived = Standings.derived_bonus_points(results_df)
+    assert filled_df.loc[[20, 45], "Bonus Points"].tolist() == derived.loc[[20, 45]].tolist()
+    kept = results_df["Bonus Points"].notna()
+    assert filled_df.loc[kept, "Bonus Points"].equals(results_df.loc[kept, "Bonus Points"])
+
+def test_fixture_bonus_ranges_hold_every_replayed_bonus(bundled_results):
+    results_df = bundled_results.astype({"Bonus Points": float})
+    results_df.loc[50:, ["Winner", "Bonus Points"]] = np.nan
+    bonuses = Standings.fixture_bonuses(results_df)
+    league = bonuses.rows < ScoringEngine.LEAGUE_MATCHES
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        standings = Standings.build_standings(results_df)
+        for i in np.flatnonzero(league):
+            home_team, away_team = results_df.iloc[bonuses.rows[i]][["Home Team", "Away Team"]]
+            winner = rng.choice([home_team, away_team, "NR"])
+            bonus = standings.apply(home_team, away_team, winner)
+            if winner == home_team:
+                assert bonuses.home_low[i] <= bonus <= bonuses.home_high[i]
+            elif winner == away_team:
+                assert bonuses.away_low[i] <= bonus <= bonuses.away_high[i]
+    # The next fixture is played against today's table, so its bonus is known exactly
+    assert bonuses.home_low[0] == bonuses.home[0] == bonuses.home_high[0]
+    assert bonuses.away_low[0] == bonuses.away[0] == bonuses.away_high[0]
+
+def test_playoff_bonuses_are_open_until_entered(bundled_results):
+    results_df = bundled_results.astype({"Bonus Points": float})
+    results_df.loc[70:, "Winner"] = np.nan
+    results_df.loc[72:, "Bonus Points"] = np.nan
+    bonuses = Standings.fixture_bonuses(results_df)
+    assert bonuses.rows.tolist() == [70, 71, 72, 73]
+    # Rows 71 and 72 carry their bonus ahead of the result; it goes to either winner
+    assert bonuses.home_low[:2].tolist() == bonuses.away_high[:2].tolist() == results_df["Bonus Points"].iloc[70:72].tolist()
+    assert (bonuses.home[2:] == Standings.PLAYOFF_BONUS).all()
+    assert (bonuses.away_low[2:] == 0).all() and np.isinf(bonuses.away_high[2:]).all()
@@ -0,0 +1,64 @@
+import os
+import sys
+import threading
+import ScoringEngine
+import IncrementalScoring
+import Standings
+import WhatIf
+
+def overlay_scorer(results_df, predictions, tmp_path):
+    state = IncrementalScoring.updated_state(results_df, predictions, os.path.join(tmp_path, "state"))
+    return WhatIf.OverlayScorer(results_df, predictions, state, Standings.build_standings(results_df))
+
+def full_recompute(results_df, predictions, overlay):
+    """calculate_scores of the results with the overlay played, bonuses derived or assumed as the overlay does."""
+    results_df = results_df.copy()
+    for label, winner in overlay.items():
+        results_df.loc[label, "Winner"] = winner
+    playoffs = results_df.index[ScoringEngine.LEAGUE_MATCHES:]
+    results_df.loc[playoffs, "Bonus Points"] = results_df.loc[playoffs, "Bonus Points"].fillna(Standings.PLAYOFF_BONUS)
+    return ScoringEngine.calculate_scores(Standings.fill_bonus_points(results_df), predictions)
+
+def overlays(results_df, fixtures):
+    """Overlays over the leading fixtures, mixing home wins, away wins and washouts in league and playoff rows."""
+    home, away = results_df["Home Team"], results_df["Away Team"]
+    return [
+        {fixtures[0]: away[fixtures[0]]},
+        {fixtures[0]: away[fixtures[0]], fixtures[1]: "NR", fixtures[2]: home[fixtures[2]]},
+        {label: home[label] for label in fixtures},
+        {label: away[label] if i % 3 == 0 else "NR" if i % 3 == 1 else home[label] for i, label in enumerate(fixtures)},
+        {fixtures[0]: home[fixtures[0]]},
+    ]
+
+def test_overlays_match_full_recompute(small_league, tmp_path):
+    results_df, predictions = small_league
+    scorer = overlay_scorer(results_df, predictions, tmp_path)
+    # One scorer in turn, so later overlays reuse (and drop) the steps remembered from earlier ones
+    for overlay in overlays(results_df, scorer.fixtures):
+        assert ScoringEngine.compare_scores(scorer.rescore(overlay), full_recompute(results_df, predictions, overlay)) == [], overlay
+    assert ScoringEngine.compare_scores(scorer.rescore({}), ScoringEngine.calculate_scores(results_df, predictions)) == []
+
+def test_concurrent_sessions_get_their_own_overlay(small_league, tmp_path):
+    results_df, predictions = small_league
+    scorer = overlay_scorer(results_df, predictions, tmp_path)
+    cases = overlays(results_df, scorer.fixtures)
+    expected = [full_recompute(results_df, predictions, overlay) for overlay in cases]
+    failures = []
+
+    def session(case):
+        for _ in range(20):
+            if ScoringEngine.compare_scores(scorer.rescore(cases[case]), expected[case]):
+                failures.append(case)
+
+    threads = [threading.Thread(target=session, args=(case,)) for case in range(len(cases))]
+    # Switch threads often, so sessions interleave between folding an overlay and scoring it
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+    assert failures == []